@@ -8,7 +8,7 @@ from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from app.tasks.stock_data_tasks import get_task_status, get_all_tasks, clear_completed_tasks
+from app.tasks.stock_data_tasks import get_task_status, get_all_tasks
 from app.services.stock.stock_atomic_service import stock_atomic_service
 from app.api.dependencies import verify_token
 from app.core.logging import logger
@@ -8,6 +8,7 @@ from app.core.config import (
 )
 from app.core.logging import logger
 import json
+import threading
 from typing import Optional, Any
 import asyncio
 
@@ -16,6 +17,35 @@ import asyncio
 
 logger.info("数据存储架构: 完全基于Redis，无关系数据库依赖")
 
+# 进程内共享的Redis连接池（所有RedisCache实例复用，避免各自建立连接）
+_pool: Optional[redis.ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_redis() -> redis.Redis:
+    """
+    获取基于共享连接池的同步Redis客户端
+    
+    客户端对象很轻量，多次调用返回的客户端共用同一个连接池。
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = redis.ConnectionPool(
+                    host=REDIS_HOST,
+                    port=REDIS_PORT,
+                    db=REDIS_DB,
+                    password=REDIS_PASSWORD,
+                    decode_responses=True,
+                    socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT,
+                    retry_on_timeout=True,
+                    max_connections=REDIS_MAX_CONNECTIONS
+                )
+    return redis.Redis(connection_pool=_pool)
+
+
 # Redis缓存客户端
 class RedisCache:
     """Redis缓存管理器"""
@@ -29,17 +59,7 @@ class RedisCache:
         """获取同步Redis客户端"""
         if self.redis_client is None:
             try:
-                self.redis_client = redis.Redis(
-                    host=REDIS_HOST,
-                    port=REDIS_PORT,
-                    db=REDIS_DB,
-                    password=REDIS_PASSWORD,
-                    decode_responses=True,
-                    socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
-                    socket_timeout=REDIS_SOCKET_TIMEOUT,
-                    retry_on_timeout=True,
-                    max_connections=REDIS_MAX_CONNECTIONS
-                )
+                self.redis_client = get_redis()
                 # 测试连接
                 self.redis_client.ping()
                 logger.info("Redis客户端连接成功")
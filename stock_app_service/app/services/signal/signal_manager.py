@@ -623,20 +623,21 @@ class SignalManager:
             # 如果是追加模式，先复制现有信号到临时键
             if not clear_existing:
                 logger.info(f"追加模式：复制现有信号到临时键")
-                old_signals_count = sync_redis.hlen(self.buy_signals_key)
+                old_signals = sync_redis.hgetall(self.buy_signals_key)
+                old_signals_count = len(old_signals)
                 if old_signals_count > 0:
-                    # 复制现有信号
-                    for field in sync_redis.hkeys(self.buy_signals_key):
-                        value = sync_redis.hget(self.buy_signals_key, field)
-                        sync_redis.hset(temp_signals_key, field, value)
+                    # 复制现有信号（一次读取、一次写入）
+                    sync_redis.hset(temp_signals_key, mapping=old_signals)
                     logger.info(f"已复制 {old_signals_count} 个现有信号到临时键")
             else:
-                # 清空临时键（如果存在）
-                if sync_redis.exists(temp_signals_key):
-                    sync_redis.delete(temp_signals_key)
+                # 清空临时键（如果存在），与统计旧信号数量合并为一次往返
+                pipe = sync_redis.pipeline(transaction=False)
+                pipe.delete(temp_signals_key)
+                pipe.hlen(self.buy_signals_key)
+                deleted, old_signals_count = pipe.execute()
+                if deleted:
                     logger.info("已清空临时键，准备计算新信号")
                 
-                old_signals_count = sync_redis.hlen(self.buy_signals_key)
                 logger.info(f"当前有 {old_signals_count} 个旧信号，计算完成后将原子性替换")
             
             # 获取异步Redis客户端用于后续操作（不保存为实例变量）
@@ -771,11 +772,8 @@ class SignalManager:
                 logger.info("开始原子性替换信号数据...")
                 try:
                     # 使用RENAME命令原子性替换（如果临时键存在）
+                    # RENAME会直接覆盖旧的正式键，无需先删除（避免出现信号为空的窗口）
                     if sync_redis.exists(temp_signals_key):
-                        # 先删除旧的正式键（如果存在）
-                        if sync_redis.exists(self.buy_signals_key):
-                            sync_redis.delete(self.buy_signals_key)
-                        # 重命名临时键为正式键
                         sync_redis.rename(temp_signals_key, self.buy_signals_key)
                         logger.info(f"✓ 原子性替换完成，新信号已生效（{total_signals} 个）")
                     else:
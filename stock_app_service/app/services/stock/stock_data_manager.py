@@ -28,6 +28,9 @@ import threading
 
 logger = logging.getLogger(__name__)
 
+# 批量获取走势数据时的最大并发请求数（实际调用频率仍受 TushareRateLimiter 限制）
+FETCH_CONCURRENCY = 64
+
 class TushareRateLimiter:
     """Tushare API频率限制器 - 纯异步IO模式"""
     
@@ -60,8 +63,13 @@ class TushareRateLimiter:
             # 检查是否超过限制
             return len(self.call_times) >= self.max_calls_per_minute
     
-    async def wait_for_rate_limit(self):
-        """等待频率限制解除 - 纯异步模式，支持并发安全"""
+    async def wait_for_rate_limit(self, record: bool = False):
+        """
+        等待频率限制解除 - 纯异步模式，支持并发安全
+        
+        Args:
+            record: 是否在锁内同时记录本次调用（并发调用时避免多个协程同时通过检查）
+        """
         # 在当前事件循环中创建新的Lock，避免事件循环冲突
         # 使用threading.Lock来保护Lock的创建过程
         with self.lock:
@@ -110,6 +118,9 @@ class TushareRateLimiter:
                         logger.info(f"清理过期API记录: {old_count} → {new_count}")
                 
                 logger.info("频率限制解除，继续数据获取...")
+            
+            if record:
+                self._record_call()
     
     def handle_daily_limit_error(self, ts_code: str, days: int):
         """处理每日限制错误"""
@@ -184,10 +195,8 @@ class StockDataManager:
         return self.redis_client is not None
 
     async def close(self):
-        """关闭连接"""
-        if self.redis_client:
-            await self.redis_client.close()
-            self.redis_client = None
+        """释放连接（客户端为全局共享实例，只解除引用，不关闭连接池）"""
+        self.redis_client = None
             
     async def update_processing_parameters(self, batch_size=None, small_batch_size=None, max_calls_per_minute=None):
         """
@@ -531,7 +540,7 @@ class StockDataManager:
             return 0
     
     async def initialize_all_stock_trend_data(self) -> bool:
-        """初始化所有股票走势数据 - 简化为单线程串行处理"""
+        """初始化所有股票走势数据 - 有界并发处理，调用频率由频率限制器控制"""
         try:
             logger.info("=" * 70)
             logger.info("🚀 开始初始化所有股票走势数据...")
@@ -550,29 +559,23 @@ class StockDataManager:
             logger.info(f"📊 共需要初始化 {total_count} 只股票的走势数据")
             logger.info(f"📈 每只股票获取180天K线数据（满足EMA169需求）")
             logger.info(f"⚡ API配置: 单Token, 每分钟{self.rate_limiter.max_calls_per_minute}次调用")
-            logger.info(f"🔄 处理模式: 单线程串行（简单可靠）")
+            logger.info(f"🔄 处理模式: 异步并发（最多 {FETCH_CONCURRENCY} 个请求同时进行）")
             
             start_time = datetime.now()
             success_count = 0
             failed_count = 0
+            completed = 0
+            semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
             
-            # 串行处理所有股票
-            for i, stock in enumerate(stock_list, 1):
+            async def fetch_one(i: int, stock: Dict):
+                nonlocal success_count, failed_count, completed
                 ts_code = stock.get('ts_code')
                 stock_name = stock.get('name', ts_code)
                 
                 try:
-                    # 每100只股票显示一次进度
-                    if i % 100 == 0 or i == 1:
-                        elapsed = (datetime.now() - start_time).total_seconds()
-                        speed = i / elapsed * 60 if elapsed > 0 else 0
-                        remaining = (total_count - i) / speed if speed > 0 else 0
-                        logger.info(f"📍 进度: {i}/{total_count} ({i/total_count*100:.1f}%) | "
-                                  f"成功: {success_count} | 失败: {failed_count} | "
-                                  f"速度: {speed:.1f}只/分钟 | 预计剩余: {remaining:.1f}分钟")
-                    
                     # 获取180天数据
-                    success = await self._fetch_with_tushare(ts_code, 180)
+                    async with semaphore:
+                        success = await self._fetch_with_tushare(ts_code, 180)
                     
                     if success:
                         success_count += 1
@@ -585,6 +588,19 @@ class StockDataManager:
                 except Exception as e:
                     failed_count += 1
                     logger.error(f"❌ [{i}/{total_count}] {stock_name}({ts_code}) - 异常: {e}")
+                
+                # 每完成100只股票显示一次进度
+                completed += 1
+                if completed % 100 == 0 or completed == 1:
+                    elapsed = (datetime.now() - start_time).total_seconds()
+                    speed = completed / elapsed * 60 if elapsed > 0 else 0
+                    remaining = (total_count - completed) / speed if speed > 0 else 0
+                    logger.info(f"📍 进度: {completed}/{total_count} ({completed/total_count*100:.1f}%) | "
+                              f"成功: {success_count} | 失败: {failed_count} | "
+                              f"速度: {speed:.1f}只/分钟 | 预计剩余: {remaining:.1f}分钟")
+            
+            # 并发处理所有股票（并发数由信号量限制，调用频率由频率限制器限制）
+            await asyncio.gather(*(fetch_one(i, stock) for i, stock in enumerate(stock_list, 1)))
             
             # 最终统计
             total_elapsed = (datetime.now() - start_time).total_seconds()
@@ -642,8 +658,6 @@ class StockDataManager:
                 pass
             return False
     
-    # 已删除复杂的并行处理函数，采用简单的串行处理
-    
     async def _is_etf(self, ts_code: str) -> bool:
         """判断是否为 ETF"""
         try:
@@ -665,11 +679,8 @@ class StockDataManager:
         - ETF：使用 fund_daily 接口
         """
         try:
-            # 检查并等待API调用限制
-            await self.rate_limiter.wait_for_rate_limit()
-            
-            # 记录API调用
-            self.rate_limiter._record_call()
+            # 检查并等待API调用限制，同时记录API调用
+            await self.rate_limiter.wait_for_rate_limit(record=True)
             
             # 计算日期范围
             end_date = datetime.now().strftime('%Y%m%d')
@@ -678,14 +689,19 @@ class StockDataManager:
             # 判断是否为 ETF
             is_etf = await self._is_etf(ts_code)
             
-            # 使用对应的 Tushare API
+            # 使用对应的 Tushare API（同步HTTP调用，放到线程池执行，避免阻塞事件循环）
             if is_etf:
                 # ETF 使用 fund_daily 接口
                 logger.debug(f"使用 fund_daily 接口获取 ETF {ts_code} 数据")
-                df = self.pro.fund_daily(ts_code=ts_code, start_date=start_date, end_date=end_date)
+                api = self.pro.fund_daily
             else:
                 # 股票使用 daily 接口
-                df = self.pro.daily(ts_code=ts_code, start_date=start_date, end_date=end_date)
+                api = self.pro.daily
+            loop = asyncio.get_running_loop()
+            df = await loop.run_in_executor(
+                None,
+                lambda: api(ts_code=ts_code, start_date=start_date, end_date=end_date)
+            )
             
             if not df.empty:
                 df = df.sort_values('trade_date').tail(days)
@@ -9,7 +9,7 @@ WebSocket连接管理器
 4. 处理连接断开和清理
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketState
 from datetime import datetime
@@ -180,6 +180,55 @@ class ConnectionManager:
             await self.disconnect(client_id, f"发送失败: {e}")
             return False
     
+    async def send_text_many(self, client_ids: Iterable[str], payload: str) -> int:
+        """
+        向多个客户端并发发送同一条已序列化的消息
+        
+        消息只序列化一次，各客户端的发送并发执行，
+        发送失败的客户端会被断开。
+        
+        Args:
+            client_ids: 客户端ID列表
+            payload: 已序列化的消息文本（JSON字符串）
+            
+        Returns:
+            int: 成功发送的数量
+        """
+        targets = []
+        for client_id in client_ids:
+            websocket = self._connections.get(client_id)
+            if websocket is None:
+                continue
+            
+            # 检查连接状态
+            if websocket.client_state != WebSocketState.CONNECTED:
+                logger.warning(f"客户端 {client_id} 连接已断开")
+                await self.disconnect(client_id, "连接已断开")
+                continue
+            
+            targets.append((client_id, websocket))
+        
+        if not targets:
+            return 0
+        
+        results = await asyncio.gather(
+            *(websocket.send_text(payload) for _, websocket in targets),
+            return_exceptions=True
+        )
+        
+        success_count = 0
+        for (client_id, _), result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.error(f"发送消息失败: {client_id}, 错误: {result}")
+                await self.disconnect(client_id, f"发送失败: {result}")
+            else:
+                success_count += 1
+        
+        # 更新统计
+        self._stats.messages_sent += success_count
+        
+        return success_count
+    
     async def broadcast(self, message: dict, exclude: Optional[List[str]] = None) -> int:
         """
         广播消息到所有连接的客户端
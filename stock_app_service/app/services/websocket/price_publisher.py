@@ -8,6 +8,7 @@
 3. 根据订阅关系推送给相应客户端
 """
 
+import logging
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -65,16 +66,14 @@ class PricePublisher:
                 count=len(price_updates)
             )
             
-            # 调试：打印前3个价格更新
-            if len(price_updates) > 0:
+            # 调试：打印前3个价格更新（仅DEBUG级别时才构建示例，避免每次推送都序列化）
+            if logger.isEnabledFor(logging.DEBUG):
                 sample_updates = [p.model_dump() for p in price_updates[:3]]
-                logger.info(f"推送消息示例（前3个）: {sample_updates}")
+                logger.debug("推送消息示例（前3个）: %s", sample_updates)
             
-            # 4. 推送给所有订阅者
-            success_count = 0
-            for client_id in subscribers:
-                if await connection_manager.send_message(client_id, message.model_dump()):
-                    success_count += 1
+            # 4. 推送给所有订阅者（消息只序列化一次）
+            payload = message.model_dump_json()
+            success_count = await connection_manager.send_text_many(subscribers, payload)
             
             logger.info(
                 f"推送策略 {strategy} 价格更新: "
@@ -163,11 +162,9 @@ class PricePublisher:
                 count=len(price_updates)
             )
             
-            # 推送给所有订阅者
-            success_count = 0
-            for client_id in all_subscribers:
-                if await connection_manager.send_message(client_id, message.model_dump()):
-                    success_count += 1
+            # 推送给所有订阅者（消息只序列化一次）
+            payload = message.model_dump_json()
+            success_count = await connection_manager.send_text_many(all_subscribers, payload)
             
             logger.debug(
                 f"推送股票价格更新: {len(price_updates)}个股票, "
@@ -3,10 +3,10 @@
 
 import os
 import glob
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
+from typing import Optional
 from app.core.config import STATIC_DIR
 
 logger = logging.getLogger(__name__)
@@ -15,27 +15,28 @@ class TaskScheduler:
     """定时任务调度器"""
     
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
-        self._setup_jobs()
+        self._task: Optional[asyncio.Task] = None
+        self._next_cleanup: Optional[datetime] = None
     
-    def _setup_jobs(self):
-        """设置定时任务"""
-        # 每天00:00清理图表文件
-        self.scheduler.add_job(
-            func=self.cleanup_chart_files,
-            trigger=CronTrigger(hour=0, minute=0),
-            id='cleanup_charts',
-            name='清理图表文件',
-            replace_existing=True
-        )
-        
-        # 可以添加更多定时任务
-        # self.scheduler.add_job(
-        #     func=self.other_task,
-        #     trigger=CronTrigger(hour=6, minute=0),
-        #     id='other_task',
-        #     name='其他任务'
-        # )
+    @staticmethod
+    def _next_midnight(now: datetime) -> datetime:
+        """计算下一个00:00"""
+        return (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    async def _midnight_loop(self):
+        """每天00:00清理图表文件（只有一个每日任务，无需完整的调度框架）"""
+        target = self._next_midnight(datetime.now())
+        while True:
+            self._next_cleanup = target
+            # sleep 可能比预期略早返回（如23:59:59.9），未到目标时间时继续等待，
+            # 不能重新计算“下一个00:00”，否则会对同一个00:00执行两次清理
+            remaining = (target - datetime.now()).total_seconds()
+            while remaining > 0:
+                await asyncio.sleep(remaining)
+                remaining = (target - datetime.now()).total_seconds()
+            await self.cleanup_chart_files()
+            # 此时已过目标时间，下一个00:00一定是之后的一天
+            target = self._next_midnight(datetime.now())
     
     async def cleanup_chart_files(self):
         """清理图表文件"""
@@ -94,31 +95,31 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"清理过期图表文件时发生错误: {e}")
     
+    @property
+    def running(self) -> bool:
+        """调度器是否运行中"""
+        return self._task is not None and not self._task.done()
+    
     def start(self):
-        """启动调度器"""
-        if not self.scheduler.running:
-            self.scheduler.start()
+        """启动调度器（需在事件循环中调用）"""
+        if not self.running:
+            self._next_cleanup = self._next_midnight(datetime.now())
+            self._task = asyncio.get_running_loop().create_task(self._midnight_loop())
             logger.info("定时任务调度器已启动")
-            
-            # 显示图表清理任务信息
-            next_cleanup = self.get_next_cleanup_time()
-            if next_cleanup:
-                logger.info(f"图表文件自动清理任务已设置，下次执行时间: {next_cleanup}")
-            else:
-                logger.warning("图表清理任务未正确设置")
+            logger.info(f"图表文件自动清理任务已设置，下次执行时间: {self.get_next_cleanup_time()}")
     
     def shutdown(self):
         """关闭调度器"""
-        if self.scheduler.running:
-            self.scheduler.shutdown()
+        if self.running:
+            self._task.cancel()
+            self._task = None
+            self._next_cleanup = None
             logger.info("定时任务调度器已关闭")
     
     def get_next_cleanup_time(self):
         """获取下次清理时间"""
-        jobs = self.scheduler.get_jobs()
-        cleanup_job = next((job for job in jobs if job.id == 'cleanup_charts'), None)
-        if cleanup_job and cleanup_job.next_run_time:
-            return cleanup_job.next_run_time.isoformat()
+        if self.running and self._next_cleanup:
+            return self._next_cleanup.isoformat()
         return None
 
 # 全局调度器实例
@@ -4,199 +4,356 @@
 实现股票数据相关的异步任务
 """
 import asyncio
+import itertools
+import json
 import threading
+import time
 import logging
-from datetime import datetime
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 
 from app.services.stock.stock_data_manager import stock_data_manager, create_stock_data_manager
 from app.services.signal.signal_manager import signal_manager
-from app.db.session import RedisCache
+from app.db.session import cache as redis_cache
+from app.utils.json_helper import dumps_bytes
 
 logger = logging.getLogger(__name__)
 
-# 任务状态存储
-_tasks = {}
-redis_cache = RedisCache()
+# 本进程任务的实时状态（有界，按插入顺序淘汰最旧的任务）。
+# Redis快照只是跨worker共享的副本：进度按间隔节流写入、Redis也可能不可用，本地状态始终是最新的
+_tasks: "OrderedDict[str, TaskResult]" = OrderedDict()
+_MAX_TASKS = 256
+# 已结束任务的保留时间
+_FINISHED_TASK_TTL = timedelta(minutes=10)
+_PRUNE_INTERVAL_SECONDS = 60
+
+# 任务状态快照存储在Redis中，多个worker进程之间共享
+_TASK_KEY_PREFIX = "task:"
+_TASK_SNAPSHOT_TTL = 3600
+# Redis不可用时暂停访问的时间，避免每次调用都重连、ping并记录日志
+_REDIS_RETRY_SECONDS = 30.0
+_redis_retry_at = 0.0
+
+# 快照写入使用单线程执行器：不阻塞调用方（包括事件循环），且按提交顺序写入
+_persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-persist")
+
+# 任务ID序号（与单调时钟组合，保证同一秒内创建的任务ID也不重复）
+_task_counter = itertools.count()
+
+# 后台任务共享事件循环（所有任务复用，避免每个任务都新建线程和事件循环）
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+# 后台任务中的阻塞调用（run_in_executor）使用有界线程池，限制并发线程数并复用线程
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stock-task")
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """获取后台事件循环，首次调用时在守护线程中启动"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop.set_default_executor(_executor)
+            threading.Thread(target=_loop.run_forever, name="stock-task-loop", daemon=True).start()
+            asyncio.run_coroutine_threadsafe(_prune_finished_tasks(), _loop)
+    return _loop
+
+
+async def _prune_finished_tasks():
+    """定期清理结束超过保留时间的任务"""
+    while True:
+        await asyncio.sleep(_PRUNE_INTERVAL_SECONDS)
+        cutoff = datetime.now() - _FINISHED_TASK_TTL
+        expired = [
+            task_id for task_id, result in list(_tasks.items())
+            if result.status in ("completed", "failed") and result.end_time and result.end_time < cutoff
+        ]
+        for task_id in expired:
+            _tasks.pop(task_id, None)
+        if expired:
+            logger.debug(f"清理了 {len(expired)} 个已结束的任务")
+
+def _snapshot_client():
+    """获取用于任务快照的Redis客户端，最近失败过时直接返回None"""
+    global _redis_retry_at
+    if time.monotonic() < _redis_retry_at:
+        return None
+    client = redis_cache.get_redis_client()
+    if client is None:
+        _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+    return client
+
+
+def _snapshot_failed(action: str, error: Exception):
+    """记录Redis访问失败并进入退避期"""
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+    logger.warning(f"{action}失败，{_REDIS_RETRY_SECONDS:.0f}秒内不再访问Redis: {error}")
+
+
+def _write_snapshot(task_id: str, payload: bytes):
+    """将任务状态快照写入Redis（在快照执行器线程中运行）"""
+    client = _snapshot_client()
+    if client is None:
+        return
+    try:
+        client.setex(f"{_TASK_KEY_PREFIX}{task_id}", _TASK_SNAPSHOT_TTL, payload)
+    except Exception as e:
+        _snapshot_failed(f"保存任务 {task_id} 状态到Redis", e)
+
+@asynccontextmanager
+async def _task_sdm():
+    """
+    为单次任务运行创建独立的股票数据管理器
+    
+    每个任务使用自己的限流器和批处理参数，避免并发任务共享状态；
+    Redis客户端是进程内全局共享的，initialize/close 只获取/解除引用，不会重新建立连接。
+    """
+    sdm = create_stock_data_manager()
+    await sdm.initialize()
+    try:
+        yield sdm
+    finally:
+        await sdm.close()
 
 class TaskResult:
     """任务结果"""
     def __init__(self, task_id: str, task_type: str):
+        self._start_time = self._end_time = None
+        self._start_iso = self._end_iso = None
+        self._elapsed = None
+        self._progress = self._total = 0
+        self._percentage = 0
+        self._cached_json = None
         self.id = task_id
         self.type = task_type
         self.status = "pending"  # pending, running, completed, failed
-        self.start_time = None
-        self.end_time = None
         self.result = None
         self.error = None
-        self.progress = 0
-        self.total = 0
+        
+    def __setattr__(self, name: str, value: Any):
+        # 任务状态字段变化时标记缓存失效
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_dirty', True)
+    
+    # 时间和进度字段在赋值时预先计算展示值，序列化时无需再做格式化和除法
+    
+    @property
+    def start_time(self) -> Optional[datetime]:
+        return self._start_time
+    
+    @start_time.setter
+    def start_time(self, value: Optional[datetime]):
+        self._start_time = value
+        self._start_iso = value.isoformat() if value else None
+        self._update_elapsed()
+    
+    @property
+    def end_time(self) -> Optional[datetime]:
+        return self._end_time
+    
+    @end_time.setter
+    def end_time(self, value: Optional[datetime]):
+        self._end_time = value
+        self._end_iso = value.isoformat() if value else None
+        self._update_elapsed()
+    
+    @property
+    def progress(self) -> int:
+        return self._progress
+    
+    @progress.setter
+    def progress(self, value: int):
+        self._progress = value
+        self._update_percentage()
+    
+    @property
+    def total(self) -> int:
+        return self._total
+    
+    @total.setter
+    def total(self, value: int):
+        self._total = value
+        self._update_percentage()
+    
+    def _update_elapsed(self):
+        if self._end_time and self._start_time:
+            self._elapsed = (self._end_time - self._start_time).total_seconds()
+        else:
+            self._elapsed = None
+    
+    def _update_percentage(self):
+        self._percentage = round(self._progress / self._total * 100, 2) if self._total > 0 else 0
         
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
+        """转换为字典（每次返回新字典，调用方可以自由修改）"""
         return {
             "id": self.id,
             "type": self.type,
             "status": self.status,
-            "start_time": self.start_time.isoformat() if self.start_time else None,
-            "end_time": self.end_time.isoformat() if self.end_time else None,
+            "start_time": self._start_iso,
+            "end_time": self._end_iso,
             "result": self.result,
             "error": self.error,
-            "progress": self.progress,
-            "total": self.total,
-            "progress_percentage": round(self.progress / self.total * 100, 2) if self.total > 0 else 0,
-            "elapsed_seconds": (self.end_time - self.start_time).total_seconds() if self.end_time and self.start_time else None
+            "progress": self._progress,
+            "total": self._total,
+            "progress_percentage": self._percentage,
+            "elapsed_seconds": self._elapsed
         }
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        转换为JSON字节串
+        
+        只缓存已结束任务的结果：运行中的任务可能原地修改 result，每次重新序列化；
+        结束后任务不再写入，字段被重新赋值时缓存失效。
+        """
+        if not self._dirty and self._cached_json is not None:
+            return self._cached_json
+        self._dirty = False
+        data = dumps_bytes(self.to_dict())
+        self._cached_json = data if self.status in ("completed", "failed") else None
+        return data
 
 class Task:
-    """异步任务基类"""
-    def __init__(self, task_id: str, task_type: str):
-        self.id = task_id
+    """
+    异步任务基类
+    
+    任务实例是模块级单例，每次 delay() 都会生成新的任务ID和 TaskResult，
+    同一任务多次执行时各自的状态互不覆盖。
+    """
+    def __init__(self, task_type: str):
         self.type = task_type
-        self.result = TaskResult(task_id, task_type)
         
     def delay(self) -> TaskResult:
         """异步执行任务"""
-        self.result.status = "pending"
-        self.result.start_time = datetime.now()
+        task_id = f"{self.type}_{next(_task_counter)}_{time.monotonic_ns()}"
+        result = TaskResult(task_id, self.type)
+        result.start_time = datetime.now()
         
-        # 存储任务
-        _tasks[self.id] = self.result
+        # 存储任务（超出上限时淘汰最旧的任务）
+        _tasks[task_id] = result
+        while len(_tasks) > _MAX_TASKS:
+            _tasks.popitem(last=False)
+        self._persist(result)
         
-        # 在新线程中执行
-        thread = threading.Thread(target=self._run_in_thread, daemon=True)
-        thread.start()
+        # 提交到后台共享事件循环执行，不阻塞主应用
+        future = asyncio.run_coroutine_threadsafe(self._execute_wrapper(result), _get_background_loop())
+        future.add_done_callback(lambda f: self._on_done(result, f))
         
-        return self.result
+        return result
+    
+    async def _execute_wrapper(self, result: TaskResult):
+        """标记运行状态并执行任务"""
+        result.status = "running"
+        self._persist(result)
+        await self._execute(result)
     
-    def _run_in_thread(self):
-        """在后台线程中运行异步任务，避免阻塞主应用"""
+    def _on_done(self, result: TaskResult, future):
+        """任务结束回调，更新任务结果"""
+        result.end_time = datetime.now()
+        error = future.exception() if not future.cancelled() else asyncio.CancelledError()
+        if error is None:
+            result.status = "completed"
+            logger.info(f"后台任务 {result.id} 执行成功")
+        else:
+            logger.error(f"后台任务 {result.id} 执行失败: {error}")
+            result.status = "failed"
+            result.error = str(error)
+        self._persist(result)
+    
+    def _persist(self, result: TaskResult):
+        """在调用线程中序列化快照，交给快照执行器异步写入Redis"""
         try:
-            self.result.status = "running"
-            
-            # 在后台线程中创建独立的事件循环
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                # 执行异步任务
-                loop.run_until_complete(self._execute())
-                self.result.status = "completed"
-                self.result.end_time = datetime.now()
-                logger.info(f"后台任务 {self.id} 执行成功")
-            finally:
-                loop.close()
-                
-        except Exception as e:
-            logger.error(f"后台任务 {self.id} 执行失败: {e}")
-            self.result.status = "failed"
-            self.result.error = str(e)
-            self.result.end_time = datetime.now()
-    
-    async def _execute(self):
-        """执行任务（子类实现）"""
+            _persist_executor.submit(_write_snapshot, result.id, result.to_json_bytes())
+        except RuntimeError:
+            # 进程退出时执行器已关闭
+            pass
+    
+    async def _execute(self, result: TaskResult):
+        """执行任务（子类实现），结果写入 result.result"""
         raise NotImplementedError("子类必须实现此方法")
 
 class StockDataStartupCheckTask(Task):
     """股票数据启动检查任务"""
     def __init__(self):
-        super().__init__(f"startup_check_{datetime.now().strftime('%Y%m%d%H%M%S')}", "startup_check")
+        super().__init__("startup_check")
         
-    async def _execute(self):
+    async def _execute(self, result: TaskResult):
         """执行任务"""
         # 创建独立的实例，避免共享状态
-        sdm = create_stock_data_manager()
-        await sdm.initialize()
-        
-        try:
+        async with _task_sdm() as sdm:
             # 执行启动检查
-            self.result.result = await sdm.startup_check()
-        finally:
-            # 关闭连接
-            await sdm.close()
+            result.result = await sdm.startup_check()
 
 class StockListMaintenanceTask(Task):
     """股票清单维护任务"""
     def __init__(self):
-        super().__init__(f"stock_list_{datetime.now().strftime('%Y%m%d%H%M%S')}", "stock_list")
+        super().__init__("stock_list")
         
-    async def _execute(self):
+    async def _execute(self, result: TaskResult):
         """执行任务"""
         # 创建独立的实例，避免共享状态
-        sdm = create_stock_data_manager()
-        await sdm.initialize()
-        
-        try:
+        async with _task_sdm() as sdm:
             # 初始化股票清单
             success = await sdm.initialize_stock_list()
-            self.result.result = {
+            result.result = {
                 "success": success,
                 "count": await sdm.get_stock_list_count() if success else 0
             }
-        finally:
-            # 关闭连接
-            await sdm.close()
 
 class DailyStockTrendUpdateTask(Task):
     """每日股票走势数据更新任务"""
     def __init__(self):
-        super().__init__(f"daily_update_{datetime.now().strftime('%Y%m%d%H%M%S')}", "daily_update")
+        super().__init__("daily_update")
         
-    async def _execute(self):
+    async def _execute(self, result: TaskResult):
         """执行任务"""
         # 创建独立的实例，避免共享状态
-        sdm = create_stock_data_manager()
-        await sdm.initialize()
-        
-        try:
+        async with _task_sdm() as sdm:
             # 智能更新股票走势数据
             success_count, failed_count = await sdm.smart_update_trend_data()
-            self.result.result = {
+            result.result = {
                 "success_count": success_count,
                 "failed_count": failed_count,
                 "total_count": success_count + failed_count
             }
-        finally:
-            # 关闭连接
-            await sdm.close()
 
 class WeeklyForceStockTrendUpdateTask(Task):
     """每周强制更新所有股票走势数据任务"""
     def __init__(self):
-        super().__init__(f"weekly_update_{datetime.now().strftime('%Y%m%d%H%M%S')}", "weekly_update")
+        super().__init__("weekly_update")
         
-    async def _execute(self):
+    async def _execute(self, result: TaskResult):
         """执行任务"""
         # 创建独立的实例，避免共享状态
-        sdm = create_stock_data_manager()
-        await sdm.initialize()
-        
-        try:
+        async with _task_sdm() as sdm:
             # 初始化所有股票走势数据
             success = await sdm.initialize_all_stock_trend_data()
-            self.result.result = {
+            result.result = {
                 "success": success,
                 "count": await sdm.get_stock_trend_data_count() if success else 0
             }
-        finally:
-            # 关闭连接
-            await sdm.close()
 
 class CalculateSignalsTask(Task):
     """计算买入信号任务"""
     def __init__(self, force_recalculate: bool = True):
-        super().__init__(f"signals_{datetime.now().strftime('%Y%m%d%H%M%S')}", "signals")
+        super().__init__("signals")
         self.force_recalculate = force_recalculate
         
-    async def _execute(self):
+    async def _execute(self, result: TaskResult):
         """执行任务"""
         # 初始化信号管理器
         await signal_manager.initialize()
         
         try:
             # 计算买入信号
-            result = await signal_manager.calculate_buy_signals(force_recalculate=self.force_recalculate)
-            self.result.result = result
+            result.result = await signal_manager.calculate_buy_signals(force_recalculate=self.force_recalculate)
         finally:
             # 关闭连接
             await signal_manager.close()
@@ -209,16 +366,36 @@ weekly_force_stock_trend_update = WeeklyForceStockTrendUpdateTask()
 calculate_signals = CalculateSignalsTask()
 
 def get_task_status(task_id: str) -> Optional[Dict[str, Any]]:
-    """获取任务状态"""
-    if task_id in _tasks:
-        return _tasks[task_id].to_dict()
-    return None
+    """获取任务状态（优先使用本进程的实时状态，其他worker创建的任务从Redis快照读取）"""
+    result = _tasks.get(task_id)
+    if result is not None:
+        return result.to_dict()
+    client = _snapshot_client()
+    if client is None:
+        return None
+    try:
+        value = client.get(f"{_TASK_KEY_PREFIX}{task_id}")
+    except Exception as e:
+        _snapshot_failed("从Redis读取任务状态", e)
+        return None
+    return json.loads(value) if value else None
 
 def get_all_tasks() -> List[Dict[str, Any]]:
-    """获取所有任务"""
-    return [task.to_dict() for task in _tasks.values()]
-
-def clear_completed_tasks():
-    """清理已完成的任务"""
-    global _tasks
-    _tasks = {k: v for k, v in _tasks.items() if v.status not in ["completed", "failed"]}
+    """获取所有任务（本进程的实时状态，加上Redis中其他worker的任务快照）"""
+    tasks = [result.to_dict() for result in list(_tasks.values())]
+    client = _snapshot_client()
+    if client is None:
+        return tasks
+    try:
+        keys = list(client.scan_iter(match=f"{_TASK_KEY_PREFIX}*", count=500))
+        values = client.mget(keys) if keys else []
+    except Exception as e:
+        _snapshot_failed("从Redis读取任务列表", e)
+        return tasks
+    local_ids = {task["id"] for task in tasks}
+    for value in values:
+        if value:
+            snapshot = json.loads(value)
+            if snapshot.get("id") not in local_ids:
+                tasks.append(snapshot)
+    return tasks
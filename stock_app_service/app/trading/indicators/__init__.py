@@ -4,18 +4,10 @@
 
 此模块仅包含技术指标（用于图表显示面板），不包含策略。
 策略相关内容请参考 app.trading.strategies 模块。
-"""
 
-# 导入所有TradingView指标模块，以触发@register_indicator装饰器
-from app.trading.indicators.tradingview import (
-    divergence_detector,
-    mirror_candle,
-    support_resistance_channels,  # 支撑阻力通道
-    volume_profile_pivot_anchored,
-    smart_money_concepts,  # 聪明钱概念
-    zigzag,  # 价格轨迹
-    harmonic_patterns,  # 谐波形态识别（新）
-)
+TradingView指标模块（tradingview/）由指标注册表在首次访问时自动发现并注册，
+无需在此处导入。
+"""
 
 # 指标相关内容会从indicator_registry导出
 # 此文件主要用于模块组织
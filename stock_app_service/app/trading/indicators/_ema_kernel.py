@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""EMA计算内核 - 一次遍历收盘价同时计算多个周期的EMA"""
+
+import weakref
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.utils.numba_helper import njit, NUMBA_AVAILABLE
+from app.trading.indicators._price_arrays import OHLCV, last_row_hash, price_arrays
+
+# 注册表中所有EMA指标的周期，计算任一EMA时一并算出
+EMA_PERIODS = (6, 12, 18, 144, 169)
+
+
+@njit(cache=True, nogil=True)
+def _emas_multi(close, alphas, out):
+    """
+    多周期EMA递推（与 pandas ewm(adjust=False) 结果一致，含NaN处理）
+    
+    out 形状为 (len(close), len(alphas))
+    """
+    n = close.shape[0]
+    for j in range(alphas.shape[0]):
+        alpha = alphas[j]
+        old_wt_factor = 1.0 - alpha
+        weighted = np.nan
+        old_wt = 1.0
+        for i in range(n):
+            cur = close[i]
+            is_observation = cur == cur
+            if weighted != weighted:
+                if is_observation:
+                    weighted = cur
+            else:
+                old_wt *= old_wt_factor
+                if is_observation:
+                    if weighted != cur:
+                        weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                    old_wt = 1.0
+            out[i, j] = weighted
+
+
+def emas_multi(close: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """
+    计算多个周期的EMA
+    
+    Args:
+        close: 收盘价数组
+        periods: EMA周期列表
+        
+    Returns:
+        形状为 (len(close), len(periods)) 的EMA矩阵
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    alphas = 2.0 / (np.asarray(periods, dtype=np.float64) + 1.0)
+    out = np.empty((close.shape[0], alphas.shape[0]), dtype=np.float64)
+    
+    if NUMBA_AVAILABLE:
+        _emas_multi(close, alphas, out)
+    else:
+        # 未安装numba时逐列使用pandas的C实现，避免纯Python循环
+        series = pd.Series(close)
+        for j, alpha in enumerate(alphas):
+            out[:, j] = series.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+
+# 最近一次计算的EMA矩阵（同一DataFrame上依次计算各EMA指标时复用）：
+# (DataFrame弱引用, 行数, 最后一行哈希, 只读矩阵)
+_last_matrix = None
+
+
+def _ema_matrix(df: pd.DataFrame, close: Optional[np.ndarray] = None) -> np.ndarray:
+    """计算 EMA_PERIODS 所有周期的EMA矩阵，同一DataFrame连续调用时返回缓存（行数或最后一行变化时重算）"""
+    global _last_matrix
+    last_row = last_row_hash(df)
+    cached = _last_matrix
+    if cached is not None and cached[0]() is df and cached[1] == len(df) and cached[2] == last_row:
+        return cached[3]
+    
+    if close is None:
+        close = price_arrays(df)['close']
+    matrix = emas_multi(close, EMA_PERIODS)
+    matrix.flags.writeable = False
+    _last_matrix = (weakref.ref(df), len(df), last_row, matrix)
+    return matrix
+
+
+def ema_bundle(df: pd.DataFrame, close: Optional[np.ndarray] = None) -> Dict[int, pd.Series]:
+    """
+    一次性计算 EMA_PERIODS 中所有周期的EMA，按周期返回Series
+    
+    同一个DataFrame连续调用时复用缓存的EMA矩阵，每次返回新的Series，调用方可以自由修改。
+    
+    Args:
+        df: 股票数据DataFrame
+        close: 已提取的收盘价数组（不传时从df提取）
+    """
+    matrix = _ema_matrix(df, close)
+    return {
+        period: pd.Series(matrix[:, j].copy(), index=df.index, name='close')
+        for j, period in enumerate(EMA_PERIODS)
+    }
+
+
+def calculate_ema(df: pd.DataFrame, period: int, bars: Optional[OHLCV] = None) -> pd.Series:
+    """计算单个周期的EMA（注册表中的周期走合并计算，其他周期单独走同一内核）"""
+    close = bars.close if bars is not None else price_arrays(df)['close']
+    if period in EMA_PERIODS:
+        values = _ema_matrix(df, close)[:, EMA_PERIODS.index(period)].copy()
+    else:
+        values = emas_multi(close, (period,))[:, 0]
+    return pd.Series(values, index=df.index, name='close')
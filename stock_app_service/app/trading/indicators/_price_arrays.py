@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""价格列NumPy数组缓存 - 同一DataFrame上的多个指标共享一次列提取"""
+
+import weakref
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+# 指标内核常用的价格列
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+
+class OHLCV(NamedTuple):
+    """价格数组集合（缺失的列为None）"""
+    open: Optional[np.ndarray]
+    high: Optional[np.ndarray]
+    low: Optional[np.ndarray]
+    close: Optional[np.ndarray]
+    volume: Optional[np.ndarray]
+
+
+# 最近一次提取结果：(DataFrame弱引用, 行数, 最后一行哈希, {列名: 数组}, OHLCV)
+_last_arrays = None
+
+
+def last_row_hash(df: pd.DataFrame) -> bytes:
+    """
+    DataFrame最后一行（含索引）的哈希
+    
+    按DataFrame对象复用的缓存用它和行数一起校验，原地更新最新K线时缓存失效。
+    """
+    if len(df) == 0:
+        return b''
+    return pd.util.hash_pandas_object(df.iloc[-1:], index=True).to_numpy().tobytes()
+
+
+def price_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    将价格列一次性提取为连续的 float64 数组
+
+    同一个DataFrame连续调用时直接返回缓存结果，避免各指标重复做列查找和类型转换
+    （行数或最后一行变化时重新提取）。
+    缺失的列不会出现在结果中。返回的数组为只读，调用方不应修改。
+
+    Args:
+        df: 股票数据DataFrame
+
+    Returns:
+        {列名: np.ndarray}
+    """
+    return _extract(df)[0]
+
+
+def price_bars(df: pd.DataFrame) -> OHLCV:
+    """
+    获取价格数组的 OHLCV 命名元组（与 price_arrays 共用缓存）
+
+    Args:
+        df: 股票数据DataFrame
+
+    Returns:
+        OHLCV
+    """
+    return _extract(df)[1]
+
+
+def _extract(df: pd.DataFrame):
+    """提取价格列，同一DataFrame连续调用时返回缓存"""
+    global _last_arrays
+    last_row = last_row_hash(df)
+    cached = _last_arrays
+    if cached is not None and cached[0]() is df and cached[1] == len(df) and cached[2] == last_row:
+        return cached[3], cached[4]
+
+    arrays = {}
+    for column in PRICE_COLUMNS:
+        if column in df.columns:
+            # 复制一份再设为只读，避免与DataFrame共享内存被意外改写
+            values = df[column].to_numpy(dtype=np.float64, copy=True)
+            values.flags.writeable = False
+            arrays[column] = values
+
+    bars = OHLCV(*(arrays.get(column) for column in PRICE_COLUMNS))
+    _last_arrays = (weakref.ref(df), len(df), last_row, arrays, bars)
+    return arrays, bars
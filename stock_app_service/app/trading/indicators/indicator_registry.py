@@ -1,27 +1,81 @@
 # -*- coding: utf-8 -*-
 """指标注册表 - 统一管理所有技术指标"""
 
-from typing import Dict, List, Callable, Any, Optional
+from typing import Dict, List, Callable, Any, Mapping, Optional, Tuple
 from dataclasses import dataclass, field
+from collections import ChainMap, OrderedDict
+from types import MappingProxyType
+import copy
+import hashlib
+import inspect
+import os
+import threading
+import time
+import weakref
+import numpy as np
 import pandas as pd
 from app.core.logging import logger
+from app.trading.indicators._ema_kernel import calculate_ema
+from app.trading.indicators._price_arrays import last_row_hash, price_bars
 
 
-@dataclass
+# 指标计算结果缓存TTL（秒），按分类区分数据新鲜度
+_CACHE_TTL_BY_CATEGORY = {
+    'trend': 300,
+    'volume': 120,
+    'support_resistance': 600,
+    'oscillator': 120,
+}
+_DEFAULT_CACHE_TTL = 120
+_CACHE_MAX_SIZE = 256
+
+
+def _copy_result(result: Any) -> Any:
+    """复制计算结果（缓存中的结果与返回给调用方的结果互不共享，调用方可以自由修改）"""
+    if isinstance(result, (pd.Series, pd.DataFrame, np.ndarray)):
+        return result.copy()
+    if isinstance(result, (list, dict)):
+        return copy.deepcopy(result)
+    return result
+
+
+# 已输出过注册日志的指标ID（每个进程只记录一次）
+_logged_ids: set = set()
+
+# 导入失败的指标模块（再次自动发现时跳过，不重复导入和记录日志）
+_failed_modules: set = set()
+
+
+@dataclass(frozen=True, slots=True)
 class IndicatorDefinition:
-    """指标定义"""
+    """指标定义（不可变，注册后不允许修改）"""
     id: str                          # 唯一标识
     name: str                        # 显示名称
     category: str                    # 分类：trend/volume/support_resistance/oscillator
     description: str                 # 描述
     calculate_func: Callable         # 计算函数
-    default_params: Dict[str, Any]   # 默认参数
+    default_params: Mapping[str, Any]   # 默认参数（只读）
     render_type: str                 # 渲染类型：line/overlay/histogram/box
     color: Optional[str] = None      # 默认颜色
     enabled_by_default: bool = False # 是否默认启用
     is_composite: bool = False       # 是否复合指标（如Vegas隧道）
-    sub_indicators: List[str] = field(default_factory=list) # 子指标ID列表（复合指标用）
-    render_config: Optional[Dict[str, Any]] = None  # 渲染配置（自描述渲染）
+    sub_indicators: Tuple[str, ...] = () # 子指标ID列表（复合指标用）
+    render_config: Optional[Mapping[str, Any]] = None  # 渲染配置（自描述渲染，只读）
+    compute_side: str = 'backend'    # 计算位置：backend（服务端计算）/frontend（仅注册元数据，前端计算）
+    # 计算函数是否声明了 bars 参数（声明时由注册表传入预提取的价格数组）
+    accepts_bars: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # 将可变容器转换为只读版本
+        object.__setattr__(self, 'default_params', MappingProxyType(dict(self.default_params)))
+        object.__setattr__(self, 'sub_indicators', tuple(self.sub_indicators))
+        if self.render_config is not None:
+            object.__setattr__(self, 'render_config', MappingProxyType(dict(self.render_config)))
+        try:
+            accepts_bars = 'bars' in inspect.signature(self.calculate_func).parameters
+        except (TypeError, ValueError):
+            accepts_bars = False
+        object.__setattr__(self, 'accepts_bars', accepts_bars)
 
 
 def register_indicator(
@@ -35,7 +89,8 @@ def register_indicator(
     enabled_by_default: bool = False,
     is_composite: bool = False,
     sub_indicators: Optional[List[str]] = None,
-    render_config: Optional[Dict[str, Any]] = None
+    render_config: Optional[Dict[str, Any]] = None,
+    compute_side: str = 'backend'
 ):
     """
     装饰器：自动注册指标计算函数
@@ -63,11 +118,17 @@ def register_indicator(
         is_composite: 是否复合指标
         sub_indicators: 子指标ID列表
         render_config: 渲染配置（自描述渲染，包含series定义、渲染逻辑等）
+        compute_side: 计算位置，frontend 表示服务端只注册元数据，由前端JS计算
         
     Returns:
         装饰后的函数（不修改原函数）
     """
     def decorator(func: Callable):
+        # 同一函数已注册（模块被重复导入）时无需重新构建定义
+        existing = registry._indicators.get(id)
+        if existing is not None and existing.calculate_func is func:
+            return func
+        
         indicator_def = IndicatorDefinition(
             id=id,
             name=name,
@@ -79,60 +140,233 @@ def register_indicator(
             color=color,
             enabled_by_default=enabled_by_default,
             is_composite=is_composite,
-            sub_indicators=sub_indicators or [],
-            render_config=render_config
+            sub_indicators=sub_indicators or (),
+            render_config=render_config,
+            compute_side=compute_side
         )
-        # 直接注册到IndicatorRegistry
-        IndicatorRegistry._indicators[id] = indicator_def
-        logger.info(f"✅ 装饰器自动注册指标: {name} ({id})")
+        # 自动发现期间先按模块收集，全部导入后按确定顺序统一注册；否则直接注册
+        collected = registry._collected
+        if collected is not None:
+            collected.setdefault(func.__module__, []).append(indicator_def)
+        else:
+            registry._store(indicator_def)
+        if id not in _logged_ids:
+            _logged_ids.add(id)
+            logger.debug(f"装饰器自动注册指标: {name} ({id})")
         return func
     
     return decorator
 
 
-class IndicatorRegistry:
-    """指标注册表"""
+class _Registry:
+    """指标注册表实现（模块级单例 registry，通过模块函数或 IndicatorRegistry 访问）"""
+    
+    __slots__ = (
+        '_indicators', '_readonly', '_by_category', '_by_kind', '_version',
+        '_result_cache', '_cache_lock', '_last_fingerprint',
+        '_discovered', '_discovering', '_discover_lock', '_collected', '_builtins_registered',
+    )
     
-    _indicators: Dict[str, IndicatorDefinition] = {}
+    def __init__(self):
+        self._indicators: Dict[str, IndicatorDefinition] = {}
+        # 只读视图（随注册自动更新，调用方无需拷贝）
+        self._readonly: Mapping[str, IndicatorDefinition] = MappingProxyType(self._indicators)
+        # 分类缓存（注册时失效）
+        self._by_category: Optional[Dict[str, List[IndicatorDefinition]]] = None
+        # 普通指标/复合指标拆分缓存（注册时失效）
+        self._by_kind: Optional[Tuple[Tuple[IndicatorDefinition, ...], Tuple[IndicatorDefinition, ...]]] = None
+        # 注册表版本号（指标定义变化时递增，供外部缓存判断失效）
+        self._version = 0
+        # 计算结果缓存：{(指标ID, 参数, 数据指纹): (过期时间, 结果)}
+        self._result_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # 最近一次计算的数据指纹：(DataFrame弱引用, 行数, 最后一行哈希, 指纹)
+        # 同一DataFrame上计算多个指标时复用
+        self._last_fingerprint: Optional[tuple] = None
+        # 指标模块是否已自动发现（首次访问注册表时执行，全部注册完成后才置位）
+        self._discovered = False
+        # 当前线程是否正在执行自动发现（防止发现过程中访问注册表时重入）
+        self._discovering = False
+        self._discover_lock = threading.RLock()
+        # 自动发现期间装饰器收集的指标定义：{模块名: [指标定义]}
+        self._collected: Optional[Dict[str, List[IndicatorDefinition]]] = None
+        self._builtins_registered = False
     
-    @classmethod
-    def register(cls, indicator: IndicatorDefinition):
+    def _ensure_discovered(self):
+        """
+        首次访问时自动发现 tradingview 指标模块并注册内置指标
+        
+        其他线程在发现完成前会阻塞在锁上，不会看到注册了一半的注册表；
+        发现失败（严格导入模式抛出异常）时不置位，下次访问重试。
+        """
+        if self._discovered:
+            return
+        with self._discover_lock:
+            if self._discovered or self._discovering:
+                return
+            self._discovering = True
+            try:
+                _auto_discover_indicators()
+                _register_builtins()
+                self._discovered = True
+            finally:
+                self._discovering = False
+    
+    def _store(self, indicator: IndicatorDefinition):
+        """写入指标定义并使缓存失效"""
+        self._indicators[indicator.id] = indicator
+        self._by_category = None
+        self._by_kind = None
+        self._version += 1
+        self.clear_cache()
+    
+    def clear_cache(self):
+        """清空指标计算结果缓存"""
+        with self._cache_lock:
+            self._result_cache.clear()
+    
+    def get_version(self) -> int:
+        """获取注册表版本号（注册或重排指标后变化）"""
+        self._ensure_discovered()
+        return self._version
+    
+    def fingerprint(self, df: pd.DataFrame) -> str:
+        """获取DataFrame内容指纹（与计算结果缓存使用同一指纹，同一DataFrame只计算一次）"""
+        return self._fingerprint(df)
+    
+    def _fingerprint(self, df: pd.DataFrame) -> str:
+        """
+        计算DataFrame内容指纹（不同股票、不同K线数据不会命中同一缓存）
+        
+        同一DataFrame连续调用时复用上次指纹，但会校验行数和最后一行的哈希，
+        原地更新最新K线（对象和行数都不变）时重新计算。
+        """
+        last_row = last_row_hash(df)
+        cached = self._last_fingerprint
+        if cached is not None and cached[0]() is df and cached[1] == len(df) and cached[2] == last_row:
+            return cached[3]
+        
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        fingerprint = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+        self._last_fingerprint = (weakref.ref(df), len(df), last_row, fingerprint)
+        return fingerprint
+    
+    def register(self, indicator: IndicatorDefinition):
         """注册指标"""
-        if indicator.id in cls._indicators:
+        if indicator.id in self._indicators:
             logger.warning(f"指标 {indicator.id} 已存在，将被覆盖")
-        cls._indicators[indicator.id] = indicator
-        logger.info(f"注册指标: {indicator.name} ({indicator.id})")
+        self._store(indicator)
+        logger.debug(f"注册指标: {indicator.name} ({indicator.id})")
     
-    @classmethod
-    def get(cls, indicator_id: str) -> Optional[IndicatorDefinition]:
+    def get(self, indicator_id: str) -> Optional[IndicatorDefinition]:
         """获取指标定义"""
-        return cls._indicators.get(indicator_id)
+        self._ensure_discovered()
+        return self._indicators.get(indicator_id)
     
-    @classmethod
-    def get_all(cls) -> Dict[str, IndicatorDefinition]:
-        """获取所有指标"""
-        return cls._indicators.copy()
+    def get_all(self) -> Mapping[str, IndicatorDefinition]:
+        """获取所有指标（只读视图）"""
+        self._ensure_discovered()
+        return self._readonly
     
-    @classmethod
-    def get_by_category(cls, category: str) -> List[IndicatorDefinition]:
+    def get_by_category(self, category: str) -> List[IndicatorDefinition]:
         """按分类获取指标"""
-        return [ind for ind in cls._indicators.values() if ind.category == category]
+        self._ensure_discovered()
+        if self._by_category is None:
+            by_category: Dict[str, List[IndicatorDefinition]] = {}
+            for ind in self._indicators.values():
+                by_category.setdefault(ind.category, []).append(ind)
+            self._by_category = by_category
+        return list(self._by_category.get(category, []))
+    
+    def _split_by_kind(self) -> Tuple[Tuple[IndicatorDefinition, ...], Tuple[IndicatorDefinition, ...]]:
+        """按注册顺序拆分为 (普通指标, 复合指标)"""
+        self._ensure_discovered()
+        if self._by_kind is None:
+            indicators = self._indicators.values()
+            self._by_kind = (
+                tuple(ind for ind in indicators if not ind.is_composite),
+                tuple(ind for ind in indicators if ind.is_composite),
+            )
+        return self._by_kind
     
-    @classmethod
-    def calculate(cls, indicator_id: str, df: pd.DataFrame, **params) -> Any:
-        """计算指标"""
-        indicator = cls.get(indicator_id)
+    def get_simple(self) -> Tuple[IndicatorDefinition, ...]:
+        """获取所有普通（非复合）指标，按注册顺序"""
+        return self._split_by_kind()[0]
+    
+    def get_composite(self) -> Tuple[IndicatorDefinition, ...]:
+        """获取所有复合指标，按注册顺序"""
+        return self._split_by_kind()[1]
+    
+    def calculate(self, indicator_id: str, df: pd.DataFrame, **params) -> Any:
+        """计算指标（命中缓存时返回缓存结果的副本）"""
+        indicator = self.get(indicator_id)
         if not indicator:
             raise ValueError(f"指标 {indicator_id} 不存在")
         
-        # 合并默认参数和用户参数
-        final_params = {**indicator.default_params, **params}
+        # 合并默认参数和用户参数（ChainMap避免复制默认参数）
+        final_params = ChainMap(params, indicator.default_params)
+        
+        # 查询缓存（相同指标、参数和数据直接返回上次结果）
+        key = (indicator_id, repr(sorted(final_params.items())), self._fingerprint(df))
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._result_cache[key]
+                entry = None
+            elif entry is not None:
+                self._result_cache.move_to_end(key)
+        if entry is not None:
+            return _copy_result(entry[1])
         
         try:
-            return indicator.calculate_func(df, **final_params)
+            if indicator.accepts_bars:
+                result = indicator.calculate_func(df, bars=price_bars(df), **final_params)
+            else:
+                result = indicator.calculate_func(df, **final_params)
         except Exception as e:
             logger.error(f"计算指标 {indicator_id} 失败: {e}")
             raise
+        
+        ttl = _CACHE_TTL_BY_CATEGORY.get(indicator.category, _DEFAULT_CACHE_TTL)
+        cached_result = _copy_result(result)
+        with self._cache_lock:
+            self._result_cache[key] = (now + ttl, cached_result)
+            while len(self._result_cache) > _CACHE_MAX_SIZE:
+                self._result_cache.popitem(last=False)
+        
+        return result
+
+
+# 全局注册表单例
+registry = _Registry()
+
+# 模块级公共接口
+register = registry.register
+get = registry.get
+get_all = registry.get_all
+get_by_category = registry.get_by_category
+get_simple = registry.get_simple
+get_composite = registry.get_composite
+get_version = registry.get_version
+fingerprint = registry.fingerprint
+calculate = registry.calculate
+clear_cache = registry.clear_cache
+
+
+class IndicatorRegistry:
+    """指标注册表（兼容旧接口，委托给模块级单例 registry）"""
+    
+    register = staticmethod(register)
+    get = staticmethod(get)
+    get_all = staticmethod(get_all)
+    get_by_category = staticmethod(get_by_category)
+    get_simple = staticmethod(get_simple)
+    get_composite = staticmethod(get_composite)
+    get_version = staticmethod(get_version)
+    fingerprint = staticmethod(fingerprint)
+    calculate = staticmethod(calculate)
+    clear_cache = staticmethod(clear_cache)
 
 
 # ============================================================================
@@ -144,12 +378,18 @@ def _auto_discover_indicators():
     自动发现并导入所有指标模块
     
     扫描 app/trading/indicators/tradingview/ 目录下的所有 .py 文件，
-    自动导入它们，从而触发 @register_indicator 装饰器的自动注册。
+    并行导入它们，从而触发 @register_indicator 装饰器的自动注册。
+    
+    注册顺序（即前端指标池的展示顺序）：按模块文件名排序，模块内按声明顺序；
+    内置的EMA和复合指标在发现完成后注册，排在最后。
     
-    性能：仅在应用启动时执行一次，不影响运行时性能。
+    性能：在首次访问注册表时执行一次，不占用应用启动时间。
+    
+    设置环境变量 INDICATOR_STRICT_IMPORT=1 时，任一模块导入失败都会抛出 ImportError，
+    便于开发和CI环境尽早暴露问题（下次访问注册表时会重试）；否则仅记录警告，之后跳过该模块。
     """
-    import os
     import importlib
+    from concurrent.futures import ThreadPoolExecutor
     from pathlib import Path
     
     # 获取 tradingview 目录路径
@@ -160,145 +400,163 @@ def _auto_discover_indicators():
         return
     
     # 扫描所有 .py 文件（排除 __init__.py 和私有文件）
-    indicator_files = [
+    indicator_files = sorted(
         f.stem for f in indicators_dir.glob('*.py')
-        if f.is_file() and not f.name.startswith('_')
-    ]
+        if f.is_file() and not f.name.startswith('_') and f.stem not in _failed_modules
+    )
+    if not indicator_files:
+        return
     
     logger.info(f"开始自动扫描指标目录: {indicators_dir}")
     logger.debug(f"发现 {len(indicator_files)} 个指标模块: {indicator_files}")
     
-    # 动态导入所有指标模块（导入时会自动触发装饰器注册）
-    imported_count = 0
-    for module_name in indicator_files:
+    module_paths = [f'app.trading.indicators.tradingview.{name}' for name in indicator_files]
+    
+    def _import(module_path: str) -> Optional[Exception]:
         try:
-            module_path = f'app.trading.indicators.tradingview.{module_name}'
             importlib.import_module(module_path)
-            imported_count += 1
-            logger.debug(f"✓ 已导入指标模块: {module_name}")
+            logger.debug(f"✓ 已导入指标模块: {module_path}")
+            return None
         except Exception as e:
-            logger.warning(f"导入指标模块失败 {module_name}: {e}")
+            return e
+    
+    # 并行导入所有指标模块；装饰器在导入期间只收集定义，不直接写入注册表
+    registry._collected = {}
+    try:
+        with ThreadPoolExecutor(max_workers=min(8, len(module_paths))) as executor:
+            errors = list(executor.map(_import, module_paths))
+        collected = registry._collected
+    finally:
+        registry._collected = None
+    
+    # 按模块文件名顺序、模块内按声明顺序依次注册，注册顺序与导入完成的先后无关
+    # （发现期间其他模块注册的指标排在 tradingview 模块之后）
+    other_modules = sorted(set(collected) - set(module_paths))
+    for module_path in module_paths + other_modules:
+        for indicator_def in collected.get(module_path, ()):
+            registry._store(indicator_def)
+    
+    strict = os.getenv("INDICATOR_STRICT_IMPORT") == "1"
+    failed = []
+    for module_name, error in zip(indicator_files, errors):
+        if error is not None:
+            logger.warning(f"导入指标模块失败 {module_name}: {error}")
+            if not strict:
+                _failed_modules.add(module_name)
+            failed.append((module_name, error))
     
+    if failed and strict:
+        names = ', '.join(name for name, _ in failed)
+        raise ImportError(f"指标模块导入失败: {names}") from failed[0][1]
+    
+    imported_count = sum(1 for error in errors if error is None)
     logger.info(f"✅ 自动发现完成: 成功导入 {imported_count}/{len(indicator_files)} 个指标模块")
 
 
-# 执行自动发现（仅在模块首次导入时执行一次）
-_auto_discover_indicators()
-
 # ============================================================================
 # 手动注册的基础指标（EMA系列和复合指标）
 # 注：EMA使用lambda定义，无法使用装饰器，需手动注册
+# EMA由 _ema_kernel 一次遍历合并计算所有周期，各EMA指标共享结果
 # ============================================================================
 
-# EMA6
-IndicatorRegistry.register(IndicatorDefinition(
-    id='ema6',
-    name='EMA6',
-    category='trend',
-    description='超短期趋势线',
-    calculate_func=lambda df, period=6: df['close'].ewm(span=period, adjust=False).mean(),
-    default_params={'period': 6},
-    render_type='line',
-    color='#00BCD4',
-    enabled_by_default=False
-))
-
-# EMA12
-IndicatorRegistry.register(IndicatorDefinition(
-    id='ema12',
-    name='EMA12',
-    category='trend',
-    description='短期趋势线（重要）',
-    calculate_func=lambda df, period=12: df['close'].ewm(span=period, adjust=False).mean(),
-    default_params={'period': 12},
-    render_type='line',
-    color='#FFD700',
-    enabled_by_default=False  # 默认不显示，用户可选择启用
-))
-
-# EMA18
-IndicatorRegistry.register(IndicatorDefinition(
-    id='ema18',
-    name='EMA18',
-    category='trend',
-    description='中期趋势线（重要）',
-    calculate_func=lambda df, period=18: df['close'].ewm(span=period, adjust=False).mean(),
-    default_params={'period': 18},
-    render_type='line',
-    color='#2962FF',
-    enabled_by_default=False  # 默认不显示，用户可选择启用
-))
-
-# EMA144
-IndicatorRegistry.register(IndicatorDefinition(
-    id='ema144',
-    name='EMA144',
-    category='trend',
-    description='Vegas隧道下轨',
-    calculate_func=lambda df, period=144: df['close'].ewm(span=period, adjust=False).mean(),
-    default_params={'period': 144},
-    render_type='line',
-    color='#00897B',
-    enabled_by_default=False
-))
+def _register_builtins():
+    """注册内置基础指标（自动发现完成后执行一次，排在所有 tradingview 指标之后）"""
+    if registry._builtins_registered:
+        return
+    registry._builtins_registered = True
+    
+    # EMA6
+    registry.register(IndicatorDefinition(
+        id='ema6',
+        name='EMA6',
+        category='trend',
+        description='超短期趋势线',
+        calculate_func=lambda df, period=6, bars=None: calculate_ema(df, period, bars),
+        default_params={'period': 6},
+        render_type='line',
+        color='#00BCD4',
+        enabled_by_default=False
+    ))
 
-# EMA169
-IndicatorRegistry.register(IndicatorDefinition(
-    id='ema169',
-    name='EMA169',
-    category='trend',
-    description='Vegas隧道上轨',
-    calculate_func=lambda df, period=169: df['close'].ewm(span=period, adjust=False).mean(),
-    default_params={'period': 169},
-    render_type='line',
-    color='#D32F2F',
-    enabled_by_default=False
-))
+    # EMA12
+    registry.register(IndicatorDefinition(
+        id='ema12',
+        name='EMA12',
+        category='trend',
+        description='短期趋势线（重要）',
+        calculate_func=lambda df, period=12, bars=None: calculate_ema(df, period, bars),
+        default_params={'period': 12},
+        render_type='line',
+        color='#FFD700',
+        enabled_by_default=False  # 默认不显示，用户可选择启用
+    ))
 
-# 移动均线组合（复合指标）
-IndicatorRegistry.register(IndicatorDefinition(
-    id='ma_combo',
-    name='移动均线组合',
-    category='trend',
-    description='',
-    calculate_func=lambda df: None,  # 复合指标不需要计算函数
-    default_params={},
-    render_type='line',
-    enabled_by_default=True,  # 默认启用
-    is_composite=True,
-    sub_indicators=['ema6', 'ema18']
-))
+    # EMA18
+    registry.register(IndicatorDefinition(
+        id='ema18',
+        name='EMA18',
+        category='trend',
+        description='中期趋势线（重要）',
+        calculate_func=lambda df, period=18, bars=None: calculate_ema(df, period, bars),
+        default_params={'period': 18},
+        render_type='line',
+        color='#2962FF',
+        enabled_by_default=False  # 默认不显示，用户可选择启用
+    ))
 
-# Vegas隧道（复合指标）
-# Vegas隧道由EMA12（信号线）、EMA144（下轨）、EMA169（上轨）组成
-IndicatorRegistry.register(IndicatorDefinition(
-    id='vegas_tunnel',
-    name='Vegas隧道',
-    category='trend',
-    description='Vegas隧道交易系统：EMA12信号线 + EMA144/EMA169隧道',
-    calculate_func=lambda df: None,  # 复合指标不需要计算函数
-    default_params={},
-    render_type='line',
-    enabled_by_default=False,
-    is_composite=True,
-    sub_indicators=['ema12', 'ema144', 'ema169']  # 完整的Vegas隧道系统
-))
+    # EMA144
+    registry.register(IndicatorDefinition(
+        id='ema144',
+        name='EMA144',
+        category='trend',
+        description='Vegas隧道下轨',
+        calculate_func=lambda df, period=144, bars=None: calculate_ema(df, period, bars),
+        default_params={'period': 144},
+        render_type='line',
+        color='#00897B',
+        enabled_by_default=False
+    ))
 
-logger.info(f"指标注册表初始化完成（基础指标），共注册 {len(IndicatorRegistry.get_all())} 个指标")
+    # EMA169
+    registry.register(IndicatorDefinition(
+        id='ema169',
+        name='EMA169',
+        category='trend',
+        description='Vegas隧道上轨',
+        calculate_func=lambda df, period=169, bars=None: calculate_ema(df, period, bars),
+        default_params={'period': 169},
+        render_type='line',
+        color='#D32F2F',
+        enabled_by_default=False
+    ))
 
-# 导入所有TradingView指标模块，以触发@register_indicator装饰器的执行
-# 这些指标使用装饰器注册，必须被导入才能完成注册
-try:
-    from app.trading.indicators.tradingview import (
-        divergence_detector,
-        mirror_candle,
-        support_resistance_channels,  # 支撑阻力通道
-        volume_profile_pivot_anchored,
-        smart_money_concepts,  # 聪明钱概念
-        zigzag,  # 价格轨迹
-        harmonic_patterns,  # 谐波形态识别（新）
-    )
-    logger.info(f"TradingView指标模块加载完成，总指标数: {len(IndicatorRegistry.get_all())}")
-except ImportError as e:
-    logger.warning(f"TradingView指标模块导入失败: {e}")
+    # 移动均线组合（复合指标）
+    registry.register(IndicatorDefinition(
+        id='ma_combo',
+        name='移动均线组合',
+        category='trend',
+        description='',
+        calculate_func=lambda df: None,  # 复合指标不需要计算函数
+        default_params={},
+        render_type='line',
+        enabled_by_default=True,  # 默认启用
+        is_composite=True,
+        sub_indicators=['ema6', 'ema18']
+    ))
 
+    # Vegas隧道（复合指标）
+    # Vegas隧道由EMA12（信号线）、EMA144（下轨）、EMA169（上轨）组成
+    registry.register(IndicatorDefinition(
+        id='vegas_tunnel',
+        name='Vegas隧道',
+        category='trend',
+        description='Vegas隧道交易系统：EMA12信号线 + EMA144/EMA169隧道',
+        calculate_func=lambda df: None,  # 复合指标不需要计算函数
+        default_params={},
+        render_type='line',
+        enabled_by_default=False,
+        is_composite=True,
+        sub_indicators=['ema12', 'ema144', 'ema169']  # 完整的Vegas隧道系统
+    ))
+    
+    logger.info(f"指标注册表初始化完成（基础指标），共注册 {len(registry._indicators)} 个指标")
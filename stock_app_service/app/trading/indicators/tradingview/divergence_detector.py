@@ -28,9 +28,14 @@ from app.trading.indicators.indicator_registry import register_indicator
         'check_rsi': True, 
         'check_stoch': True, 
         'check_cci': True, 
-        'check_momentum': True
+        'check_momentum': True, 
+        'check_obv': True, 
+        'check_vwmacd': True, 
+        'check_cmf': True, 
+        'check_mfi': True
     },
-    render_config={'render_function': 'renderDivergence'}
+    render_config={'render_function': 'renderDivergence'},
+    compute_side='frontend'
 )
 def calculate_divergence_detector(df: pd.DataFrame, **params) -> List[Dict[str, Any]]:
     """
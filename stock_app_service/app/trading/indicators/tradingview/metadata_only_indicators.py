@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+仅注册元数据的指标 - 计算全部在前端完成
+
+⚡ 性能优化：实际计算在前端完成
+- JavaScript实现：indicator_calculator.js
+- 本文件仅用于：注册指标元数据（名称、参数、配置等），合并为一个模块以减少导入开销
+
+包含指标：
+- harmonic_patterns: 谐波形态识别（移植自 TradingView Pine Script by HeWhoMustNotBeNamed）
+- mirror_candle: 对手盘视角（K线镜像翻转）
+- smart_money_concepts: 聪明钱概念（移植自 TradingView Pine Script by LuxAlgo）
+"""
+
+import pandas as pd
+from typing import List, Dict, Any
+from app.trading.indicators.indicator_registry import register_indicator
+
+
+# ============================================================================
+# 谐波形态识别 - Multi Level ZigZag Harmonic Patterns
+# 多层级ZigZag识别价格波动结构，通过斐波那契比率匹配13种经典谐波形态
+# ============================================================================
+
+@register_indicator(
+    id='harmonic_patterns',
+    name='谐波形态识别',
+    category='pattern',
+    description='自动识别13种经典谐波形态。基于ZigZag算法和斐波那契比率识别Gartley、Bat、Butterfly、Crab、Shark、Cypher等形态。提供XABCD点标注。前端实时计算。',
+    render_type='overlay',
+    enabled_by_default=False,
+    default_params={
+        # ZigZag层级参数
+        'zigzag_length': 10,        # 主ZigZag周期（检测pivot的K线数，越小越敏感）
+        'show_zigzag': True,        # 显示ZigZag基础线条
+        'zigzag_color': '#2196F3',  # ZigZag颜色（蓝色）
+        'zigzag_width': 1,          # ZigZag线条粗细
+        
+        # 谐波形态开关 - 5点形态（XABCD）
+        'show_gartley': True,       # Gartley（加特利）- 最经典
+        'show_bat': True,           # Bat（蝙蝠）- 精确反转
+        'show_butterfly': True,     # Butterfly（蝴蝶）- 极端回撤
+        'show_crab': True,          # Crab（螃蟹）- 深度回撤
+        'show_deep_crab': True,     # Deep Crab（深螃蟹）- 88.6%回撤
+        'show_shark': True,         # Shark（鲨鱼）- 独特形态
+        'show_cypher': True,        # Cypher（密码）- 复杂结构
+        
+        # ABCD形态开关
+        'show_abcd': True,          # ABCD Classic（经典）
+        'show_ab_eq_cd': True,      # AB=CD（时间价格对称）
+        'show_abcd_ext': True,      # ABCD Extension（扩展）
+        
+        # 高级形态开关
+        'show_three_drives': True,  # 3 Drives（三驱动）
+        'show_five_zero': True,     # 5-0（五零）
+        'show_double_pattern': True, # Double Top/Bottom（双顶双底）
+        
+        # 识别参数
+        'error_percent': 20,        # 容错率（%）：允许的比率偏差范围（建议15-25）
+        'wait_confirmation': False, # 等待确认：false为实时显示（推荐），true为确认后显示
+        'max_risk_reward': 30,      # 最大风险回报比（%）：用于双顶双底过滤
+        
+        # 显示参数
+        'show_labels': True,        # 显示XABCD点标签
+        'show_point_labels': True,  # 显示X、A、B、C点标签
+        'pattern_line_width': 2,    # 形态主线粗细
+        
+        # 颜色参数（每种形态使用不同颜色，更易区分）🎨
+        'zigzag_color': '#78909C',          # ZigZag基础线（灰蓝色）
+        'gartley_color': '#2196F3',         # Gartley（蓝色）
+        'bat_color': '#9C27B0',             # Bat（紫色）
+        'butterfly_color': '#FF9800',       # Butterfly（橙色）
+        'crab_color': '#F44336',            # Crab（红色）
+        'deep_crab_color': '#C62828',       # Deep Crab（深红色）
+        'shark_color': '#00BCD4',           # Shark（青色）
+        'cypher_color': '#E91E63',          # Cypher（粉色）
+        'three_drives_color': '#4CAF50',    # 3 Drives（绿色）
+        'five_zero_color': '#FFC107',       # 5-0（黄色）
+        'abcd_color': '#3F51B5',            # ABCD（靛蓝）
+        'ab_eq_cd_color': '#009688',        # AB=CD（青绿色）
+        'abcd_ext_color': '#FF5722',        # ABCD Ext（深橙色）
+        'double_pattern_color': '#607D8B',  # Double Top/Bottom（灰色）
+        'label_text_color': '#FFFFFF'       # 标签文字（白色）
+    },
+    color='#9C27B0',
+    render_config={'render_function': 'renderHarmonicPatterns'},
+    compute_side='frontend'
+)
+def calculate_harmonic_patterns(df: pd.DataFrame, **params) -> Dict[str, Any]:
+    """
+    谐波形态识别 - 元数据注册函数
+    
+    ⚠️ 实际计算在 indicator_calculator.js 中完成
+    
+    算法流程：
+    1. 构建多层级ZigZag识别价格波动结构
+    2. 提取关键转折点（X、A、B、C、D）
+    3. 计算斐波那契比率（XAB、ABC、BCD、XAD等）
+    4. 与13种谐波形态模板匹配
+    5. 绘制形态结构线条和标签
+    
+    谐波形态简介：
+    
+    5点形态（需要XABCD）：
+    - Gartley（加特利）: 最经典，XAB=0.618, BCD=1.272-1.618
+    - Bat（蝙蝠）: 精确反转，XAB=0.382-0.5, XAD=0.886
+    - Butterfly（蝴蝶）: 极端回撤，XAB=0.786, XAD=1.272-1.618
+    - Crab（螃蟹）: 深度回撤，BCD=2.24-3.618, XAD=1.618
+    - Deep Crab（深螃蟹）: 特殊螃蟹，XAB=0.886
+    - Shark（鲨鱼）: 独特88.6%回撤
+    - Cypher（密码）: 复杂结构，ABC>1.0
+    
+    4点形态（需要ABCD）：
+    - ABCD Classic: ABC=0.618-0.786, BCD=1.272-1.618
+    - AB=CD: 时间和价格完美对称
+    - ABCD Ext: 扩展版，价格比率>1.272
+    
+    高级形态：
+    - 3 Drives: 三个推进波，每波都有特定比率
+    - 5-0: 特殊形态，BCD=0.5
+    - 双顶/双底: B点和D点价格接近
+    
+    Args:
+        df: K线数据（接口兼容，实际不使用）
+        **params: 指标参数
+        
+    Returns:
+        空数据，前端会自动计算
+    """
+    return {}
+
+
+# ============================================================================
+# K线镜像翻转（对手盘视角）
+# 以第一根K线收盘价为起点，将每根K线的涨跌幅取反得到镜像走势
+# ============================================================================
+
+@register_indicator(
+    id='mirror_candle',
+    name='对手盘视角',
+    category='subchart',
+    description='将K线走势进行镜像反转，涨跌完全相反，用于观察不同视角的市场结构。前端实时计算。',
+    render_type='subchart',
+    enabled_by_default=False,
+    default_params={},
+    render_config={'render_function': 'renderMirrorSubchart'},
+    compute_side='frontend'
+)
+def calculate_mirror_candle(df: pd.DataFrame, **params) -> List[Dict]:
+    """
+    K线镜像翻转 - 元数据注册函数
+    
+    ⚠️ 注意：此函数仅用于注册指标元数据
+    实际计算逻辑在前端 JavaScript 中实现（indicator_calculator.js）
+    
+    算法逻辑（TradingView Pine Script移植）：
+    1. 使用第一根K线的收盘价作为起点
+    2. 计算每根K线相对于前一根的涨跌幅
+    3. 将涨跌幅取反应用到镜像价格
+    4. 高低互换：镜像的高点用原始的低点百分比计算，反之亦然
+    
+    Args:
+        df: K线数据（接口兼容，实际不使用）
+        **params: 指标参数
+        
+    Returns:
+        空数据，前端会自动计算
+    """
+    return []
+
+
+# ============================================================================
+# Smart Money Concepts - 聪明钱概念
+# 内部/摆动市场结构（BOS/CHoCH）、订单块、等高等低点
+# ============================================================================
+
+@register_indicator(
+    id='smart_money_concepts',
+    name='聪明钱概念',
+    category='support_resistance',
+    description='识别市场结构变化、订单块和等高等低点。包含BOS/CHoCH信号和关键支撑阻力区域。前端实时计算。',
+    render_type='overlay',
+    enabled_by_default=False,
+    default_params={
+        # Structure参数
+        'swing_length': 50,              # 摆动周期（检测Swing结构）
+        'internal_length': 5,            # 内部周期（检测Internal结构）
+        'show_internals': True,          # 显示内部结构
+        'show_structure': True,          # 显示摆动结构
+        'show_swing_points': False,      # 显示摆动点标签
+        
+        # Order Blocks参数
+        'show_internal_ob': True,        # 显示内部订单块
+        'internal_ob_count': 5,          # 内部订单块数量
+        'show_swing_ob': True,           # 显示摆动订单块
+        'swing_ob_count': 5,             # 摆动订单块数量
+        'ob_filter': 'Atr',              # 订单块过滤方式（Atr/Range）
+        'ob_mitigation': 'High/Low',     # 订单块突破方式（Close/High/Low）
+        
+        # Equal Highs/Lows参数
+        'show_equal_hl': True,           # 显示等高等低
+        'equal_hl_length': 3,            # 等高等低确认周期
+        'equal_hl_threshold': 0.1,       # 等高等低敏感度（0-0.5）
+        
+        # Fair Value Gaps参数
+        'show_fvg': False,               # 显示公平价值缺口（FVG）- 默认关闭
+        'fvg_extend': 20,                # FVG延伸K线数
+        'fvg_threshold': 0.5,            # FVG阈值（相对ATR，过滤小缺口）
+        
+        # 样式参数
+        'style': 'Colored',              # 样式（Colored/Monochrome）
+        'mode': 'Historical'             # 模式（Historical/Present）
+    },
+    color='#F23645',  # 默认红色（A股习惯：红涨）
+    render_config={'render_function': 'renderSmartMoneyConcepts'},
+    compute_side='frontend'
+)
+def calculate_smart_money_concepts(df: pd.DataFrame, **params) -> List[Dict[str, Any]]:
+    """
+    Smart Money Concepts - 元数据注册函数
+
+    ⚠️ 实际计算在 indicator_calculator.js 中完成
+
+    算法流程：
+    1. Leg检测：根据摆动高低点判断当前市场腿部方向
+    2. Pivot识别：检测关键的摆动高点和低点
+    3. Structure突破：价格突破pivot时判断BOS或CHoCH
+    4. Order Block创建：突破发生时记录订单块区域
+    5. Equal HL检测：识别多次触及的相同价格水平
+
+    Args:
+        df: K线数据（接口兼容，实际不使用）
+        **params: 指标参数
+
+    Returns:
+        空数据，前端会自动计算
+    """
+    return []
@@ -1,91 +0,0 @@
-# -*- coding: utf-8 -*-
-"""
-Smart Money Concepts - 聪明钱概念
-移植自 TradingView Pine Script by LuxAlgo
-
-核心功能（优先实现）：
-1. Internal Structure - 内部市场结构（BOS/CHoCH）
-2. Swing Structure - 摆动市场结构（BOS/CHoCH）
-3. Order Blocks - 订单块（内部 + 摆动）
-4. Equal Highs/Lows - 等高/等低点检测
-
-算法说明：
-- Leg检测：基于摆动高低点判断市场腿部（牛市腿/熊市腿）
-- Pivot Points：识别关键的摆动高点和低点
-- BOS（Break of Structure）：结构突破，趋势延续信号
-- CHoCH（Change of Character）：趋势转变信号
-- Order Blocks：价格突破结构后形成的支撑/阻力区域
-- Equal Highs/Lows：价格多次触及相同水平形成的关键区域
-
-⚡ 性能优化：实际计算在前端完成
-- JavaScript实现：indicator_calculator.js
-- 本文件仅用于：注册指标元数据
-"""
-
-import pandas as pd
-from typing import List, Dict, Any
-from app.trading.indicators.indicator_registry import register_indicator
-
-
-@register_indicator(
-    id='smart_money_concepts',
-    name='聪明钱概念',
-    category='support_resistance',
-    description='识别市场结构变化、订单块和等高等低点。包含BOS/CHoCH信号和关键支撑阻力区域。前端实时计算。',
-    render_type='overlay',
-    enabled_by_default=False,
-    default_params={
-        # Structure参数
-        'swing_length': 50,              # 摆动周期（检测Swing结构）
-        'internal_length': 5,            # 内部周期（检测Internal结构）
-        'show_internals': True,          # 显示内部结构
-        'show_structure': True,          # 显示摆动结构
-        'show_swing_points': False,      # 显示摆动点标签
-        
-        # Order Blocks参数
-        'show_internal_ob': True,        # 显示内部订单块
-        'internal_ob_count': 5,          # 内部订单块数量
-        'show_swing_ob': True,           # 显示摆动订单块
-        'swing_ob_count': 5,             # 摆动订单块数量
-        'ob_filter': 'Atr',              # 订单块过滤方式（Atr/Range）
-        'ob_mitigation': 'High/Low',     # 订单块突破方式（Close/High/Low）
-        
-        # Equal Highs/Lows参数
-        'show_equal_hl': True,           # 显示等高等低
-        'equal_hl_length': 3,            # 等高等低确认周期
-        'equal_hl_threshold': 0.1,       # 等高等低敏感度（0-0.5）
-        
-        # Fair Value Gaps参数
-        'show_fvg': False,               # 显示公平价值缺口（FVG）- 默认关闭
-        'fvg_extend': 20,                # FVG延伸K线数
-        'fvg_threshold': 0.5,            # FVG阈值（相对ATR，过滤小缺口）
-        
-        # 样式参数
-        'style': 'Colored',              # 样式（Colored/Monochrome）
-        'mode': 'Historical'             # 模式（Historical/Present）
-    },
-    color='#F23645',  # 默认红色（A股习惯：红涨）
-    render_config={'render_function': 'renderSmartMoneyConcepts'}
-)
-def calculate_smart_money_concepts(df: pd.DataFrame, **params) -> List[Dict[str, Any]]:
-    """
-    Smart Money Concepts - 元数据注册函数
-
-    ⚠️ 实际计算在 indicator_calculator.js 中完成
-
-    算法流程：
-    1. Leg检测：根据摆动高低点判断当前市场腿部方向
-    2. Pivot识别：检测关键的摆动高点和低点
-    3. Structure突破：价格突破pivot时判断BOS或CHoCH
-    4. Order Block创建：突破发生时记录订单块区域
-    5. Equal HL检测：识别多次触及的相同价格水平
-
-    Args:
-        df: K线数据（接口兼容，实际不使用）
-        **params: 指标参数
-
-    Returns:
-        空数据，前端会自动计算
-    """
-    return []
-
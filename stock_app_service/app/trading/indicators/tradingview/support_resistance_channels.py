@@ -54,7 +54,8 @@ from app.trading.indicators.indicator_registry import register_indicator
         'in_channel_color': 'rgba(158, 158, 158, 0.6)'   # 在通道内：中性灰
     },
     color='#2962FF',
-    render_config={'render_function': 'renderSupportResistanceChannels'}
+    render_config={'render_function': 'renderSupportResistanceChannels'},
+    compute_side='frontend'
 )
 def calculate_support_resistance_channels(df: pd.DataFrame, **params) -> List[Dict[str, Any]]:
     """
@@ -33,7 +33,8 @@ from app.trading.indicators.indicator_registry import register_indicator
         'value_area_percent': 68.0, 
         'profile_width': 0.30
     },
-    render_config={'render_function': 'renderVolumeProfilePivot'}
+    render_config={'render_function': 'renderVolumeProfilePivot'},
+    compute_side='frontend'
 )
 def calculate_volume_profile_pivot_anchored(df: pd.DataFrame, **params) -> Optional[List[Dict]]:
     """
@@ -58,7 +58,8 @@ from app.trading.indicators.indicator_registry import register_indicator
         'background_transparency': 85                 # 背景透明度（0-100）
     },
     color='#FF5252',
-    render_config={'render_function': 'renderZigZag'}
+    render_config={'render_function': 'renderZigZag'},
+    compute_side='frontend'
 )
 def calculate_zigzag(df: pd.DataFrame, **params) -> Dict[str, Any]:
     """
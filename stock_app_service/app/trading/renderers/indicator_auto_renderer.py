@@ -6,49 +6,162 @@
 实现"一次编写，到处可用"的设计理念
 """
 
-from typing import Dict, List, Any, Optional
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Mapping, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 from app.core.logging import logger
 from app.trading.indicators.indicator_registry import IndicatorRegistry, IndicatorDefinition
+from app.utils.json_helper import dumps_str
+
+
+# 重量级指标（耗时 > 100ms），懒加载模式下不预计算，由前端按需请求
+_HEAVY_INDICATORS = frozenset({
+    'divergence_detector',      # 背离检测（~500ms）
+    'volume_profile_pivot',     # 成交量分布（~300ms）
+    'pivot_order_blocks',       # 支撑阻力（~200ms）
+    'mirror_candle',            # 镜像K线（~100ms）
+})
+
+# Pivot Order Blocks 转换后的数据列
+_ORDER_BLOCK_COLUMNS = ('type', 'price_high', 'price_low', 'start_time', 'end_time', 'strength')
+
+# 需要专门转换数据格式的叠加类型指标：{indicator_id: 转换方法名}
+_OVERLAY_HANDLERS = {
+    'pivot_order_blocks': '_prepare_pivot_order_blocks_data',
+    'divergence_detector': '_prepare_divergence_data',
+}
+
+# 待计算指标少于该数量时串行计算，省去线程启动开销
+_PARALLEL_MIN_INDICATORS = 4
+
+# 指标池配置缓存：{(数据指纹, 数据形状, 是否懒加载, 注册表版本): 指标池配置}
+_POOL_CACHE_SIZE = 16
+_pool_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_pool_cache_lock = threading.Lock()
+
+
+def _copy_pool(value: Any) -> Any:
+    """
+    复制指标池配置（缓存中的配置不交给调用方）
+    
+    字典和包含容器的列表递归复制，只含标量的列表（指标数据列）直接浅拷贝。
+    """
+    if isinstance(value, dict):
+        return {key: _copy_pool(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if any(isinstance(item, (dict, list)) for item in value):
+            return [_copy_pool(item) for item in value]
+        return value.copy()
+    return value
+
+
+# 指标池JavaScript代码模板的前后缀
+_POOL_JS_PREFIX = """
+        // 指标池配置（自动生成）
+        const INDICATOR_POOL = """
+_POOL_JS_SUFFIX = """;
+        """
+
+# 最近一次生成的时间索引：(DataFrame弱引用, 行数, 最后一个日期, (是否分钟级数据, 时间值列表))
+_last_time_index = None
+
+# 最近一次格式化的日期字符串列：(DataFrame弱引用, 行数, 最后一个日期, 日期字符串数组)
+_last_date_strings = None
 
 
 class IndicatorAutoRenderer:
     """指标自动渲染器"""
     
     @classmethod
-    def calculate_all_indicators(cls, df: pd.DataFrame) -> Dict[str, Any]:
+    def calculate_all_indicators(
+        cls,
+        df: pd.DataFrame,
+        all_indicators: Optional[Mapping[str, IndicatorDefinition]] = None
+    ) -> Dict[str, Any]:
         """
         计算所有已注册指标的数据
         
         Args:
             df: 股票数据DataFrame
+            all_indicators: 已获取的指标定义（不传时从注册表获取）
             
         Returns:
             指标数据字典 {indicator_id: calculated_data}
         """
         indicator_data = {}
-        all_indicators = IndicatorRegistry.get_all()
+        # 跳过复合指标（由子指标组成）
+        if all_indicators is None:
+            simple_indicators = IndicatorRegistry.get_simple()
+        else:
+            simple_indicators = [ind for ind in all_indicators.values() if not ind.is_composite]
         
-        for indicator_id, indicator_def in all_indicators.items():
+        # 前端计算的指标服务端只注册元数据，数据置为None
+        to_calculate = []
+        for indicator_def in simple_indicators:
+            if indicator_def.compute_side == 'frontend':
+                indicator_data[indicator_def.id] = None
+                continue
+            to_calculate.append((indicator_def.id, indicator_def))
+        indicator_data.update(cls._calculate_indicators(df, to_calculate))
+        return indicator_data
+    
+    @classmethod
+    def _calculate_indicators(
+        cls,
+        df: pd.DataFrame,
+        to_calculate: List[Tuple[str, IndicatorDefinition]]
+    ) -> Dict[str, Any]:
+        """
+        计算一组相互独立的指标，单个指标失败时记录警告并置为None
+        
+        指标数量较多时用线程池并行计算（NumPy/pandas内部计算会释放GIL），
+        数量较少时串行计算，省去线程启动开销。
+        
+        Args:
+            df: 股票数据DataFrame
+            to_calculate: [(indicator_id, indicator_def)]
+            
+        Returns:
+            指标数据字典 {indicator_id: calculated_data}，顺序与 to_calculate 一致
+        """
+        def _calculate(indicator_id: str, indicator_def: IndicatorDefinition) -> Any:
             try:
-                # 跳过复合指标（由子指标组成）
-                if indicator_def.is_composite:
-                    continue
-                
-                # 计算指标数据
                 data = IndicatorRegistry.calculate(indicator_id, df)
-                indicator_data[indicator_id] = data
-                
-                logger.debug(f"✅ 计算指标: {indicator_def.name} ({indicator_id})")
-                
+                logger.debug("✅ 计算指标: %s (%s)", indicator_def.name, indicator_id)
+                return data
             except Exception as e:
-                logger.warning(f"计算指标 {indicator_def.name} ({indicator_id}) 失败: {e}")
-                indicator_data[indicator_id] = None
+                logger.warning("计算指标 %s (%s) 失败: %s", indicator_def.name, indicator_id, e)
+                return None
+        
+        if len(to_calculate) < _PARALLEL_MIN_INDICATORS:
+            return {
+                indicator_id: _calculate(indicator_id, indicator_def)
+                for indicator_id, indicator_def in to_calculate
+            }
         
+        indicator_data = {}
+        max_workers = min(8, os.cpu_count() or 1, len(to_calculate))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda item: _calculate(*item), to_calculate)
+            for (indicator_id, _), data in zip(to_calculate, results):
+                indicator_data[indicator_id] = data
         return indicator_data
     
     @classmethod
-    def prepare_indicator_data_for_js(cls, indicator_id: str, data: Any, df: pd.DataFrame) -> Optional[List[Dict]]:
+    def prepare_indicator_data_for_js(
+        cls,
+        indicator_id: str,
+        data: Any,
+        df: pd.DataFrame,
+        indicator_def: Optional[IndicatorDefinition] = None,
+        time_index: Optional[List[Any]] = None
+    ) -> Optional[Union[List[Any], Dict[str, Any]]]:
         """
         将指标数据转换为JavaScript可用的格式
         
@@ -56,39 +169,86 @@ class IndicatorAutoRenderer:
             indicator_id: 指标ID
             data: 计算后的指标数据
             df: 原始DataFrame（用于获取时间索引）
+            indicator_def: 已获取的指标定义（不传时从注册表查找）
+            time_index: 已生成的时间值列表（不传时按需由df生成）
             
         Returns:
-            JavaScript格式的数据列表，或None
+            JavaScript格式的数据（列表，或按列存储的字典），或None
         """
         if data is None:
             return None
         
-        indicator_def = IndicatorRegistry.get(indicator_id)
+        if indicator_def is None:
+            indicator_def = IndicatorRegistry.get(indicator_id)
         if not indicator_def:
             return None
         
         # 根据渲染类型处理数据
-        if indicator_def.render_type == 'line':
-            # 线条类型：转换为 [{time, value}] 格式
+        render_type = indicator_def.render_type
+        if render_type == 'line':
+            # 线条类型：转换为 {time: [...], value: [...]} 格式
             return cls._prepare_line_data(data, df)
         
-        elif indicator_def.render_type == 'overlay':
-            # 叠加类型：根据指标ID特殊处理
-            if indicator_id == 'pivot_order_blocks':
-                return cls._prepare_pivot_order_blocks_data(data, df)
-            elif indicator_id == 'divergence_detector':
-                return cls._prepare_divergence_data(data, df)
-            else:
-                # 其他叠加类型：保持原始格式
-                return data if isinstance(data, (list, dict)) else None
+        if render_type == 'overlay':
+            # 叠加类型：有专门转换方法的按指标ID分发，其他保持原始格式
+            handler = _OVERLAY_HANDLERS.get(indicator_id)
+            if handler is not None:
+                return getattr(cls, handler)(data, df, time_index)
+        elif render_type != 'subchart':
+            logger.warning("未知的渲染类型: %s", render_type)
+            return None
         
-        elif indicator_def.render_type == 'subchart':
-            # 副图类型：保持原始格式
-            return data if isinstance(data, (list, dict)) else None
+        # 叠加类型和副图类型：列表/字典保持原始格式（先按精确类型判断，子类再走isinstance）
+        data_type = type(data)
+        if data_type is list or data_type is dict or isinstance(data, (list, dict)):
+            return data
+        return None
+    
+    @classmethod
+    def _is_minute_data(cls, df: pd.DataFrame) -> bool:
+        """检测是否为分钟级数据（前两根K线同一天且时间不同）"""
+        if len(df) > 1 and 'date' in df.columns:
+            try:
+                date_col = df['date']
+                first_date = date_col.iat[0]
+                second_date = date_col.iat[1]
+                if hasattr(first_date, 'date') and hasattr(second_date, 'date'):
+                    if first_date.date() == second_date.date() and first_date != second_date:
+                        return True
+                elif isinstance(first_date, str) and ' ' in first_date:
+                    return True
+            except Exception:
+                pass
+        return False
+    
+    @classmethod
+    def _format_time_value(cls, date_value: Any, is_minute_data: bool, idx: int):
+        """将单个日期值转换为图表时间（分钟级数据返回时间戳，日线返回字符串）"""
+        if pd.notna(date_value):
+            if is_minute_data:
+                # 分钟级数据返回时间戳
+                if hasattr(date_value, 'timestamp'):
+                    return int(date_value.timestamp())
+                elif isinstance(date_value, str):
+                    try:
+                        dt = datetime.strptime(date_value, '%Y-%m-%d %H:%M:%S')
+                    except ValueError:
+                        try:
+                            dt = datetime.strptime(date_value, '%Y-%m-%d %H:%M')
+                        except ValueError:
+                            return str(idx)
+                    return int(dt.timestamp())
+            else:
+                # 日线返回字符串（date/datetime/Timestamp 用 isoformat 截取，无需解析格式串）
+                if isinstance(date_value, date):
+                    return date_value.isoformat()[:10]
+                elif hasattr(date_value, 'strftime'):
+                    return date_value.strftime('%Y-%m-%d')
+                else:
+                    return str(date_value).partition(' ')[0]
         
-        else:
-            logger.warning(f"未知的渲染类型: {indicator_def.render_type}")
-            return None
+        # 降级：使用索引
+        return str(idx)
     
     @classmethod
     def _get_time_string(cls, df: pd.DataFrame, idx: int):
@@ -102,95 +262,162 @@ class IndicatorAutoRenderer:
         Returns:
             时间值（字符串或时间戳）
         """
-        from datetime import datetime
-        
         try:
-            # 检测是否为分钟级数据
-            is_minute_data = False
-            if len(df) > 1 and 'date' in df.columns:
-                try:
-                    first_date = df.iloc[0]['date']
-                    second_date = df.iloc[1]['date']
-                    if hasattr(first_date, 'date') and hasattr(second_date, 'date'):
-                        if first_date.date() == second_date.date() and first_date != second_date:
-                            is_minute_data = True
-                    elif isinstance(first_date, str) and ' ' in first_date:
-                        is_minute_data = True
-                except Exception:
-                    pass
-            
             if 'date' in df.columns:
-                date_value = df.iloc[idx]['date']
-                if pd.notna(date_value):
-                    if is_minute_data:
-                        # 分钟级数据返回时间戳
-                        if hasattr(date_value, 'timestamp'):
-                            return int(date_value.timestamp())
-                        elif isinstance(date_value, str):
-                            try:
-                                dt = datetime.strptime(date_value, '%Y-%m-%d %H:%M:%S')
-                            except ValueError:
-                                try:
-                                    dt = datetime.strptime(date_value, '%Y-%m-%d %H:%M')
-                                except ValueError:
-                                    return str(idx)
-                            return int(dt.timestamp())
-                    else:
-                        # 日线返回字符串
-                        if hasattr(date_value, 'strftime'):
-                            return date_value.strftime('%Y-%m-%d')
-                        else:
-                            return str(date_value).split(' ')[0]
+                # 同一DataFrame的时间值整列生成一次，之后按下标直接取
+                _, times = cls._build_time_index(df)
+                if 0 <= idx < len(times):
+                    return times[idx]
+                return cls._format_time_value(df['date'].iat[idx], cls._is_minute_data(df), idx)
             
             # 降级：使用索引
             return str(idx)
         except Exception as e:
-            logger.warning(f"获取时间值失败 (idx={idx}): {e}")
+            logger.warning("获取时间值失败 (idx=%s): %s", idx, e)
             return str(idx)
     
     @classmethod
-    def _prepare_pivot_order_blocks_data(cls, data: Optional[List[Dict]], df: pd.DataFrame) -> List[Dict]:
+    def _build_time_index(cls, df: pd.DataFrame) -> Tuple[bool, Optional[List[Any]]]:
+        """
+        一次性生成所有K线的时间值（与逐个调用 _get_time_string 的结果一致）
+        
+        datetime 类型的日期列整列向量化转换，其他类型逐个转换。
+        同一个DataFrame连续调用时直接返回缓存结果（行数或最后一个日期变化时重新生成），
+        调用方不应修改返回的列表。
+        
+        Args:
+            df: DataFrame
+            
+        Returns:
+            (是否分钟级数据, 时间值列表)，没有日期列时时间值列表为None
+        """
+        global _last_time_index
+        if 'date' not in df.columns:
+            return False, None
+        
+        last_date = df['date'].iat[-1] if len(df) else None
+        cached = _last_time_index
+        if cached is not None and cached[0]() is df and cached[1] == len(df) and cached[2] == last_date:
+            return cached[3]
+        
+        is_minute_data = cls._is_minute_data(df)
+        dates = df['date']
+        
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            missing = dates.isna().to_numpy()
+            if is_minute_data:
+                times = (dates.astype('int64').to_numpy() // 10**9).astype(object)
+            else:
+                times = cls._date_strings(df).copy()
+            if missing.any():
+                for i in np.flatnonzero(missing).tolist():
+                    times[i] = str(i)
+            times = times.tolist()
+        else:
+            times = [
+                cls._format_time_value(date_value, is_minute_data, i)
+                for i, date_value in enumerate(dates.tolist())
+            ]
+        
+        result = (is_minute_data, times)
+        _last_time_index = (weakref.ref(df), len(df), last_date, result)
+        return result
+    
+    @classmethod
+    def _date_strings(cls, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        将 datetime 类型的日期列整列格式化为 'YYYY-MM-DD' 字符串（NaT 为 NaN）
+        
+        同一个DataFrame上的时间索引和各线条指标共用一次格式化结果（行数或最后一个日期变化时重新格式化），
+        调用方不应修改返回的数组。日期列不存在或不是 datetime 类型时返回None。
+        
+        Args:
+            df: DataFrame
+            
+        Returns:
+            日期字符串数组（object类型），或None
+        """
+        global _last_date_strings
+        if 'date' not in df.columns or not pd.api.types.is_datetime64_any_dtype(df['date']):
+            return None
+        
+        last_date = df['date'].iat[-1] if len(df) else None
+        cached = _last_date_strings
+        if cached is not None and cached[0]() is df and cached[1] == len(df) and cached[2] == last_date:
+            return cached[3]
+        
+        date_strs = df['date'].dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+        _last_date_strings = (weakref.ref(df), len(df), last_date, date_strs)
+        return date_strs
+    
+    @classmethod
+    def _prepare_pivot_order_blocks_data(
+        cls,
+        data: Optional[List[Dict]],
+        df: pd.DataFrame,
+        times: Optional[List[Any]] = None
+    ) -> Dict[str, List[Any]]:
         """
         转换 Pivot Order Blocks 数据格式
         
-        将 start_index/end_index 转换为 start_time/end_time
+        将 start_index/end_index 转换为 start_time/end_time，按列输出
+        （{字段名: 各订单块的值列表}），避免为每个订单块重复生成同样的键
         
         Args:
             data: 原始订单块数据
             df: DataFrame
+            times: 已生成的时间值列表（不传时由df生成）
             
         Returns:
-            转换后的数据
+            按列存储的订单块数据，字段见 _ORDER_BLOCK_COLUMNS
         """
         if not data or not isinstance(data, list):
-            return []
+            return {column: [] for column in _ORDER_BLOCK_COLUMNS}
         
-        result = []
+        # 时间值整列生成一次，各订单块直接按下标取
+        if times is None:
+            _, times = cls._build_time_index(df)
+        n = len(df)
+        
+        def _time_at(idx):
+            if times is not None and 0 <= idx < n:
+                return times[idx]
+            return cls._get_time_string(df, idx)
+        
+        result = {column: [] for column in _ORDER_BLOCK_COLUMNS}
         for block in data:
             try:
-                result.append({
-                    'type': block.get('type', 'support'),
-                    'price_high': float(block.get('price_high', 0)),
-                    'price_low': float(block.get('price_low', 0)),
-                    'start_time': cls._get_time_string(df, block.get('start_index', 0)),
-                    'end_time': cls._get_time_string(df, block.get('end_index', len(df) - 1)),
-                    'strength': float(block.get('strength', 0.8))
-                })
+                row = (
+                    block.get('type', 'support'),
+                    float(block.get('price_high', 0)),
+                    float(block.get('price_low', 0)),
+                    _time_at(block.get('start_index', 0)),
+                    _time_at(block.get('end_index', n - 1)),
+                    float(block.get('strength', 0.8)),
+                )
             except Exception as e:
-                logger.warning(f"转换订单块数据失败: {e}")
+                logger.warning("转换订单块数据失败: %s", e)
                 continue
+            for column, value in zip(_ORDER_BLOCK_COLUMNS, row):
+                result[column].append(value)
         
-        logger.debug(f"转换 Pivot Order Blocks: {len(data)} -> {len(result)} 个区域")
+        logger.debug("转换 Pivot Order Blocks: %d -> %d 个区域", len(data), len(result['type']))
         return result
     
     @classmethod
-    def _prepare_divergence_data(cls, data: Optional[List[Dict]], df: pd.DataFrame) -> List[Dict]:
+    def _prepare_divergence_data(
+        cls,
+        data: Optional[List[Dict]],
+        df: pd.DataFrame,
+        times: Optional[List[Any]] = None
+    ) -> List[Dict]:
         """
         转换背离检测数据格式（如果需要的话）
         
         Args:
             data: 原始背离数据
             df: DataFrame
+            times: 已生成的时间值列表（与其他叠加类型转换方法签名一致，暂未使用）
             
         Returns:
             转换后的数据
@@ -201,15 +428,18 @@ class IndicatorAutoRenderer:
         return data
     
     @classmethod
-    def _prepare_line_data(cls, data: Any, df: pd.DataFrame) -> List[Dict]:
-        """准备线条数据"""
-        result = []
+    def _prepare_line_data(cls, data: Any, df: pd.DataFrame) -> Dict[str, List[Any]]:
+        """
+        准备线条数据
         
-        # 如果是Series，转换为列表
-        if hasattr(data, 'values'):
-            values = data.values
+        按列存储为 {time: [...], value: [...]}（两列等长），不再为每个数据点构造字典，
+        前端用 lineSeriesData 一次遍历还原为 [{time, value}]。
+        """
+        # 如果是Series，转换为数组（float64时不复制；可空类型的NA直接转为NaN）
+        if hasattr(data, 'to_numpy'):
+            values = data.to_numpy(dtype=np.float64, copy=False, na_value=np.nan)
         else:
-            values = data
+            values = np.asarray(data, dtype=np.float64)
         
         # 获取日期列
         if 'date' in df.columns:
@@ -218,18 +448,30 @@ class IndicatorAutoRenderer:
             dates = df.index
         else:
             logger.warning("无法获取日期数据")
-            return result
+            return {'time': [], 'value': []}
         
-        # 转换为 [{time, value}] 格式
-        for i, (date, value) in enumerate(zip(dates, values)):
-            if pd.notna(value):
-                time_str = date.strftime('%Y-%m-%d') if hasattr(date, 'strftime') else str(date)
-                result.append({
-                    'time': time_str,
-                    'value': float(value)
-                })
+        n = min(len(dates), len(values))
+        values = values[:n]
+        mask = ~np.isnan(values)
+        if not mask.any():
+            return {'time': [], 'value': []}
         
-        return result
+        # 只取有值的行（指标预热期的NaN不参与），日期整列一次性转换
+        date_strs = cls._date_strings(df)
+        if date_strs is not None:
+            time_strs = date_strs[:n][mask].tolist()
+        elif pd.api.types.is_datetime64_any_dtype(dates):
+            time_strs = pd.DatetimeIndex(dates[:n])[mask].strftime('%Y-%m-%d').tolist()
+        else:
+            time_strs = [
+                d.isoformat()[:10] if isinstance(d, date)
+                else d.strftime('%Y-%m-%d') if hasattr(d, 'strftime')
+                else str(d)
+                for d in np.asarray(dates[:n], dtype=object)[mask].tolist()
+            ]
+        
+        # 按列返回（tolist 批量转换为Python对象，未安装orjson时标准库json也可直接序列化）
+        return {'time': time_strs, 'value': values[mask].tolist()}
     
     @classmethod
     def generate_indicator_pool_config(cls, df: pd.DataFrame, lazy_load: bool = True) -> Dict[str, Any]:
@@ -243,80 +485,72 @@ class IndicatorAutoRenderer:
             lazy_load: 是否懒加载（默认True）。True时只计算默认启用的指标，其他指标前端按需计算
             
         Returns:
-            指标池配置字典
+            指标池配置字典（相同数据重复请求时复用缓存，每次返回副本，调用方可以自由修改）
         """
-        indicator_pool = {}
+        # 相同内容的数据、相同模式、注册表未变化时直接返回上次生成的配置
+        cache_key = (IndicatorRegistry.fingerprint(df), df.shape, lazy_load, IndicatorRegistry.get_version())
+        with _pool_cache_lock:
+            cached = _pool_cache.get(cache_key)
+            if cached is not None:
+                _pool_cache.move_to_end(cache_key)
+                logger.debug("命中指标池配置缓存，共 %d 个指标", len(cached))
+                return _copy_pool(cached)
         
         # 获取所有指标
         all_indicators = IndicatorRegistry.get_all()
         
+        # 按注册顺序预先建好键，循环中只赋值
+        indicator_pool = dict.fromkeys(all_indicators)
+        
+        # 循环中用到的方法绑定为局部变量
+        prepare = cls.prepare_indicator_data_for_js
+        
+        # 分钟级检测和时间值格式化整列只做一次，各指标转换时共用
+        _, time_index = cls._build_time_index(df)
+        
         # 懒加载模式：智能计算策略
         # - 轻量级指标（EMA等）：总是计算（很快，~10ms）
         # - 重量级指标（背离、成交量分布等）：按需计算（慢，~1-2秒）
         if lazy_load:
-            logger.debug(f"⚡ 懒加载模式：轻量级指标预计算，重量级指标按需加载")
-            indicator_data = {}
+            logger.debug("⚡ 懒加载模式：轻量级指标预计算，重量级指标按需加载")
             
-            # 定义重量级指标（耗时 > 100ms）
-            heavy_indicators = {
-                'divergence_detector',      # 背离检测（~500ms）
-                'volume_profile_pivot',     # 成交量分布（~300ms）
-                'pivot_order_blocks',       # 支撑阻力（~200ms）
-                'mirror_candle'             # 镜像K线（~100ms）
-            }
-            
-            # 第一步：收集需要计算的指标ID
+            # 收集需要计算的指标ID
+            # 1. 默认启用的复合指标：其子指标
             indicators_to_calculate = set()
-            
-            for indicator_id, indicator_def in all_indicators.items():
-                # 1. 默认启用的指标
+            for indicator_def in IndicatorRegistry.get_composite():
                 if indicator_def.enabled_by_default:
-                    indicators_to_calculate.add(indicator_id)
-                    
-                    # 如果是复合指标，添加其子指标
-                    if indicator_def.is_composite and indicator_def.sub_indicators:
-                        for sub_id in indicator_def.sub_indicators:
-                            indicators_to_calculate.add(sub_id)
-                
-                # 2. 轻量级指标（非重量级的都预先计算）
-                elif indicator_id not in heavy_indicators:
-                    indicators_to_calculate.add(indicator_id)
+                    indicators_to_calculate.update(indicator_def.sub_indicators)
             
-            logger.debug(f"预计算指标: {indicators_to_calculate}")
-            logger.debug(f"延迟计算指标（重量级）: {heavy_indicators & set(all_indicators.keys())}")
+            # 2. 默认启用的指标和轻量级指标（非重量级的都预先计算）
+            simple_indicators = IndicatorRegistry.get_simple()
+            for indicator_def in simple_indicators:
+                if indicator_def.enabled_by_default or indicator_def.id not in _HEAVY_INDICATORS:
+                    indicators_to_calculate.add(indicator_def.id)
             
-            # 第二步：只计算需要的指标
-            for indicator_id, indicator_def in all_indicators.items():
-                # 跳过复合指标（它们不需要计算函数）
-                if indicator_def.is_composite:
-                    indicator_data[indicator_id] = None
-                    continue
-                
-                # 判断是否需要计算
-                if indicator_id in indicators_to_calculate:
-                    try:
-                        data = IndicatorRegistry.calculate(indicator_id, df)
-                        indicator_data[indicator_id] = data
-                        logger.debug(f"✓ 计算指标: {indicator_def.name} ({indicator_id})")
-                    except Exception as e:
-                        logger.warning(f"计算指标失败 {indicator_def.name}: {e}")
-                        indicator_data[indicator_id] = None
-                else:
-                    # 重量级指标不计算数据（前端按需请求）
-                    indicator_data[indicator_id] = None
-                    logger.debug(f"⊙ 延迟加载: {indicator_def.name} ({indicator_id})")
+            logger.debug("预计算指标: %s", indicators_to_calculate)
+            logger.debug("延迟计算指标（重量级）: %s", _HEAVY_INDICATORS.intersection(all_indicators))
+            
+            # 前端计算的指标服务端不计算
+            indicator_data = cls._calculate_indicators(df, [
+                (indicator_def.id, indicator_def)
+                for indicator_def in simple_indicators
+                if indicator_def.id in indicators_to_calculate
+                and indicator_def.compute_side != 'frontend'
+            ])
         else:
             # 完整模式：计算所有指标数据
-            logger.debug(f"🔄 完整模式：计算所有指标")
+            logger.debug("🔄 完整模式：计算所有指标")
             indicator_data = cls.calculate_all_indicators(df)
         
         # 构建指标池配置
         for indicator_id, indicator_def in all_indicators.items():
-            # 获取计算后的数据
+            # 获取计算后的数据（懒加载模式下重量级指标不计算数据，前端按需请求）
             raw_data = indicator_data.get(indicator_id)
+            if lazy_load and indicator_id not in indicator_data and not indicator_def.is_composite:
+                logger.debug("⊙ 延迟加载: %s (%s)", indicator_def.name, indicator_id)
             
-            # 转换为JavaScript格式
-            js_data = cls.prepare_indicator_data_for_js(indicator_id, raw_data, df)
+            # 转换为JavaScript格式（无数据时无需转换）
+            js_data = None if raw_data is None else prepare(indicator_id, raw_data, df, indicator_def, time_index)
             
             # 构建配置
             config = {
@@ -331,43 +565,39 @@ class IndicatorAutoRenderer:
             # 如果是复合指标
             if indicator_def.is_composite:
                 config['isComposite'] = True
-                config['subIndicators'] = indicator_def.sub_indicators
+                config['subIndicators'] = list(indicator_def.sub_indicators)
             
             # 如果有render_config，添加到配置中
-            if indicator_def.render_config:
-                config['renderConfig'] = indicator_def.render_config
-            
-            # 如果有自定义渲染函数，添加函数名
-            if indicator_def.render_config and 'render_function' in indicator_def.render_config:
-                config['renderFunction'] = indicator_def.render_config['render_function']
+            render_config = indicator_def.render_config
+            if render_config:
+                config['renderConfig'] = dict(render_config)
+                
+                # 如果有自定义渲染函数，添加函数名
+                if 'render_function' in render_config:
+                    config['renderFunction'] = render_config['render_function']
             
             indicator_pool[indicator_id] = config
         
-        logger.info(f"✅ 生成指标池配置，共 {len(indicator_pool)} 个指标")
+        logger.info("✅ 生成指标池配置，共 %d 个指标", len(indicator_pool))
+        
+        with _pool_cache_lock:
+            _pool_cache[cache_key] = indicator_pool
+            while len(_pool_cache) > _POOL_CACHE_SIZE:
+                _pool_cache.popitem(last=False)
         
-        return indicator_pool
+        return _copy_pool(indicator_pool)
     
     @classmethod
-    def generate_indicator_pool_js(cls, indicator_pool: Dict[str, Any]) -> str:
+    def generate_indicator_pool_js(cls, indicator_pool: Dict[str, Any], pretty: bool = False) -> str:
         """
         生成指标池JavaScript代码
         
         Args:
             indicator_pool: 指标池配置
+            pretty: 是否缩进格式化JSON（仅调试时使用，默认输出紧凑JSON减少传输体积）
             
         Returns:
             JavaScript代码字符串
         """
-        import json
-        
-        # 将配置转换为JSON
-        indicator_pool_json = json.dumps(indicator_pool, ensure_ascii=False, indent=2)
-        
-        # 生成JavaScript代码
-        js_code = f"""
-        // 指标池配置（自动生成）
-        const INDICATOR_POOL = {indicator_pool_json};
-        """
-        
-        return js_code
-
+        # 将配置转换为JSON（优先使用orjson），直接拼接模板，不再经f-string格式化
+        return _POOL_JS_PREFIX + dumps_str(indicator_pool, indent=pretty) + _POOL_JS_SUFFIX
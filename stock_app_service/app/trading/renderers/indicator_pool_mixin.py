@@ -2,15 +2,72 @@
 """
 指标池混入类 - 为图表策略添加指标池功能
 """
-import json
+import sys
+import textwrap
+from pathlib import Path
 import pandas as pd
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Tuple
 from app.core.logging import logger
+from app.utils.json_helper import dumps_str
+
+
+# 前端静态文件目录
+_STATIC_DIR = Path(__file__).parent / 'static'
+
+# ✅ 所有指标均已实现JavaScript版本，全部前端计算！
+# 优势：
+# 1. 服务器响应速度极快（不计算指标）
+# 2. 支持任意数量指标（不影响加载速度）
+# 3. 用户体验与TradingView一致
+_LIGHTWEIGHT_INDICATORS = frozenset({
+    'ema6', 'ema12', 'ema18', 'ema144', 'ema169',
+    'mirror_candle',  # 镜像K线：前端计算
+    'divergence_detector',  # 多指标背离：✅ 已实现JS版本，前端计算
+    'volume_profile_pivot',  # 成交量分布：✅ 已实现JS版本，前端计算
+    'support_resistance_channels',  # 支撑阻力通道：前端计算
+    'smart_money_concepts',  # 聪明钱概念：前端计算
+    'zigzag',  # 价格轨迹：前端计算
+    'harmonic_patterns',  # 谐波形态识别：前端计算
+})
+
+# 🗑️ 重量级指标列表已废弃（所有指标都已前端化）
+# Python版本保留用于：
+# - 服务端数据分析和回测
+# - 作为JavaScript实现的验证基准
+# - 批量计算和离线分析
+# 服务端实际执行数值计算的只有EMA系列（_ema_kernel，numba编译、计算时释放GIL）
+_HEAVYWEIGHT_INDICATORS = frozenset()  # 空集合，不再使用后端预计算
+
+# 旧版指标配置：指标ID -> 前端渲染函数名（有数据时才设置）
+_RENDER_FUNCTION_MAP = {
+    'support_resistance_channels': 'renderSupportResistanceChannels',
+    'zigzag': 'renderZigZag',
+    'harmonic_patterns': 'renderHarmonicPatterns',
+    'volume_profile_pivot': 'renderVolumeProfilePivot',
+    'divergence_detector': 'renderDivergence',
+    'smart_money_concepts': 'renderSmartMoneyConcepts',
+    'mirror_candle': 'renderMirrorSubchart',
+}
+
+# 即使数据为空也要设置渲染函数的指标（镜像翻转）
+_ALWAYS_RENDER = frozenset({'mirror_candle'})
 
 
 class IndicatorPoolMixin:
     """指标池混入类，提供指标池相关的HTML和JavaScript生成方法"""
     
+    # 指标计算引擎JS缓存：(文件修改时间, 文本内容)，文件更新后自动重新读取
+    _calculator_js_cache: Optional[Tuple[float, str]] = None
+    
+    # 指标配置JS缓存：(注册表版本, 配置JS, 指标数量)
+    _metadata_js_cache: Optional[Tuple[int, str, int]] = None
+    
+    # 指标池渲染逻辑JS缓存（去除模板缩进后的内容，进程内只生成一次）
+    _logic_js_cache: Optional[str] = None
+    
+    # 旧版指标配置骨架缓存：(注册表版本, {指标ID: 不含数据的配置})
+    _legacy_config_base_cache: Optional[Tuple[int, Dict[str, Dict[str, Any]]]] = None
+    
     @classmethod
     def _generate_indicator_pool_scripts_auto(cls, df: pd.DataFrame, lazy_load: bool = False) -> str:
         """
@@ -28,14 +85,10 @@ class IndicatorPoolMixin:
         Returns:
             完整的JavaScript代码（配置 + 逻辑 + 计算引擎）
         """
-        from app.trading.indicators.indicator_registry import IndicatorRegistry
-        
         try:
             # ⚡ 混合策略：轻量级指标前端计算，重量级指标服务端预计算
-            indicator_pool = cls._generate_indicator_metadata_only(df)
-            
             # 生成配置JavaScript（不包含data字段）
-            indicator_config_js = f"const INDICATOR_POOL = {json.dumps(indicator_pool, ensure_ascii=False)};"
+            indicator_config_js, indicator_count = cls._generate_indicator_config_js_auto(df)
             
             # 获取渲染逻辑JavaScript（保持不变）
             indicator_logic_js = cls._generate_indicator_pool_logic_js()
@@ -43,9 +96,9 @@ class IndicatorPoolMixin:
             # 读取前端指标计算引擎JavaScript文件
             calculator_js = cls._load_indicator_calculator_js()
             
-            logger.info(f"✅ 生成指标池脚本（前端按需计算模式），共 {len(indicator_pool)} 个指标")
+            logger.info(f"✅ 生成指标池脚本（前端按需计算模式），共 {indicator_count} 个指标")
             
-            return f"\n{calculator_js}\n{indicator_config_js}\n{indicator_logic_js}\n"
+            return "\n".join(("", calculator_js, indicator_config_js, indicator_logic_js, ""))
             
         except Exception as e:
             logger.error(f"生成指标池脚本失败: {e}")
@@ -53,50 +106,51 @@ class IndicatorPoolMixin:
             return "\nconst INDICATOR_POOL = {};\n"
     
     @classmethod
-    def _generate_indicator_metadata_only(cls, df: pd.DataFrame = None) -> Dict[str, Any]:
+    def _generate_indicator_config_js_auto(cls, df: pd.DataFrame = None) -> Tuple[str, int]:
         """
-        生成指标池元数据配置（智能混合策略）
+        生成指标池配置JavaScript
         
-        策略：
-        - 轻量级指标（EMA等）：data=None，前端计算
-        - 重量级指标（背离检测等）：data=预计算，服务端计算
+        没有服务端预计算的指标时，配置只由注册表决定，按注册表版本缓存序列化结果。
         
         Args:
-            df: 股票数据DataFrame（可选，用于服务端预计算重量级指标）
+            df: 股票数据DataFrame（有服务端预计算指标时使用）
+            
+        Returns:
+            (配置JavaScript, 指标数量)
+        """
+        from app.trading.indicators.indicator_registry import IndicatorRegistry
+        
+        if _HEAVYWEIGHT_INDICATORS and df is not None:
+            indicator_pool = cls._generate_indicator_metadata_with_precompute(df)
+            return f"const INDICATOR_POOL = {dumps_str(indicator_pool)};", len(indicator_pool)
+        
+        version = IndicatorRegistry.get_version()
+        cached = IndicatorPoolMixin._metadata_js_cache
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        
+        indicator_pool = cls._generate_indicator_metadata_only()
+        config_js = f"const INDICATOR_POOL = {dumps_str(indicator_pool)};"
+        IndicatorPoolMixin._metadata_js_cache = (version, config_js, len(indicator_pool))
+        return config_js, len(indicator_pool)
+    
+    @classmethod
+    def _generate_indicator_metadata_only(cls) -> Dict[str, Any]:
+        """
+        生成指标池元数据配置（所有指标 data=None，由前端计算）
+        
+        结果只由注册表决定，不依赖K线数据。
         
         Returns:
             指标池配置字典
         """
         from app.trading.indicators.indicator_registry import IndicatorRegistry
-        from app.trading.renderers.indicator_auto_renderer import IndicatorAutoRenderer
         
         indicator_pool = {}
-        all_indicators = IndicatorRegistry.get_all()
-        
-        # ✅ 所有指标均已实现JavaScript版本，全部前端计算！
-        # 优势：
-        # 1. 服务器响应速度极快（不计算指标）
-        # 2. 支持任意数量指标（不影响加载速度）
-        # 3. 用户体验与TradingView一致
-        lightweight_indicators = {
-            'ema6', 'ema12', 'ema18', 'ema144', 'ema169',
-            'mirror_candle',  # 镜像K线：前端计算
-            'divergence_detector',  # 多指标背离：✅ 已实现JS版本，前端计算
-            'volume_profile_pivot',  # 成交量分布：✅ 已实现JS版本，前端计算
-            'support_resistance_channels',  # 支撑阻力通道：前端计算
-            'smart_money_concepts',  # 聪明钱概念：前端计算
-            'zigzag',  # 价格轨迹：前端计算
-            'harmonic_patterns',  # 谐波形态识别：前端计算
-        }
+        lightweight_indicators = _LIGHTWEIGHT_INDICATORS
+        lightweight_count = 0
         
-        # 🗑️ 重量级指标列表已废弃（所有指标都已前端化）
-        # Python版本保留用于：
-        # - 服务端数据分析和回测
-        # - 作为JavaScript实现的验证基准
-        # - 批量计算和离线分析
-        heavyweight_indicators = set()  # 空集合，不再使用后端预计算
-        
-        for indicator_id, indicator_def in all_indicators.items():
+        for indicator_id, indicator_def in IndicatorRegistry.get_all().items():
             # 构建基础配置
             config = {
                 'name': indicator_def.name,
@@ -104,56 +158,84 @@ class IndicatorPoolMixin:
                 'renderType': indicator_def.render_type,
                 'enabled': indicator_def.enabled_by_default,
                 'color': indicator_def.color,
-                'params': indicator_def.default_params
+                'params': dict(indicator_def.default_params),
+                'data': None
             }
             
-            # 智能选择计算方式
             if indicator_id in lightweight_indicators:
                 # 轻量级：前端计算
-                config['data'] = None
-                logger.debug(f"📱 {indicator_def.name}: 前端计算")
-            elif indicator_id in heavyweight_indicators and df is not None:
-                # 重量级：服务端预计算
-                try:
-                    logger.debug(f"🖥️  开始计算 {indicator_def.name}...")
-                    calculated_data = IndicatorRegistry.calculate(indicator_id, df)
-                    
-                    # 转换为JS格式
-                    js_data = IndicatorAutoRenderer.prepare_indicator_data_for_js(
-                        indicator_id, calculated_data, df
-                    )
-                    config['data'] = js_data
-                    
-                    data_info = f"{len(js_data)} 项" if isinstance(js_data, list) else "对象"
-                    logger.info(f"✅ {indicator_def.name}: 服务端预计算完成，数据: {data_info}")
-                except Exception as e:
-                    logger.warning(f"⚠️  服务端计算 {indicator_def.name} 失败: {e}")
-                    config['data'] = None
+                lightweight_count += 1
+                logger.debug("📱 %s: 前端计算", indicator_def.name)
             else:
                 # 默认：尝试前端计算
-                config['data'] = None
-                logger.debug(f"⚡ {indicator_def.name}: 尝试前端计算")
+                logger.debug("⚡ %s: 尝试前端计算", indicator_def.name)
             
             # 如果是复合指标
             if indicator_def.is_composite:
                 config['isComposite'] = True
-                config['subIndicators'] = indicator_def.sub_indicators
+                config['subIndicators'] = list(indicator_def.sub_indicators)
             
             # 如果有render_config
-            if indicator_def.render_config:
-                config['renderConfig'] = indicator_def.render_config
-                if 'render_function' in indicator_def.render_config:
-                    config['renderFunction'] = indicator_def.render_config['render_function']
+            render_config = indicator_def.render_config
+            if render_config:
+                config['renderConfig'] = dict(render_config)
+                if 'render_function' in render_config:
+                    config['renderFunction'] = render_config['render_function']
             
             indicator_pool[indicator_id] = config
         
-        # 统计
-        lightweight_count = sum(1 for id in indicator_pool.keys() if id in lightweight_indicators)
-        heavyweight_count = sum(1 for id in indicator_pool.keys() if id in heavyweight_indicators)
+        logger.info("✅ 生成指标配置: 总计 %d 个，轻量级（前端计算）: %d 个", len(indicator_pool), lightweight_count)
+        
+        return indicator_pool
+    
+    @classmethod
+    def _generate_indicator_metadata_with_precompute(cls, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        生成指标池配置（智能混合策略）
+        
+        策略：
+        - 轻量级指标（EMA等）：data=None，前端计算
+        - 重量级指标（背离检测等）：data=预计算，服务端计算
         
-        logger.info(f"✅ 生成指标配置（混合策略）: 总计 {len(indicator_pool)} 个")
-        logger.info(f"   - 轻量级（前端计算）: {lightweight_count} 个")
-        logger.info(f"   - 重量级（服务端计算）: {heavyweight_count} 个")
+        Args:
+            df: 股票数据DataFrame（用于服务端预计算重量级指标）
+        
+        Returns:
+            指标池配置字典
+        """
+        from app.trading.indicators.indicator_registry import IndicatorRegistry
+        from app.trading.renderers.indicator_auto_renderer import IndicatorAutoRenderer
+        
+        indicator_pool = cls._generate_indicator_metadata_only()
+        if df is None:
+            return indicator_pool
+        
+        heavyweight_count = 0
+        for indicator_id in _HEAVYWEIGHT_INDICATORS - _LIGHTWEIGHT_INDICATORS:
+            indicator_def = IndicatorRegistry.get(indicator_id)
+            if indicator_def is None:
+                continue
+            
+            # 重量级：服务端预计算
+            try:
+                logger.debug("🖥️  开始计算 %s...", indicator_def.name)
+                calculated_data = IndicatorRegistry.calculate(indicator_id, df)
+                
+                # 转换为JS格式
+                js_data = IndicatorAutoRenderer.prepare_indicator_data_for_js(
+                    indicator_id, calculated_data, df, indicator_def
+                )
+                indicator_pool[indicator_id]['data'] = js_data
+                heavyweight_count += 1
+                
+                logger.info(
+                    "✅ %s: 服务端预计算完成，数据: %s",
+                    indicator_def.name, f"{len(js_data)} 项" if isinstance(js_data, list) else "对象"
+                )
+            except Exception as e:
+                logger.warning("⚠️  服务端计算 %s 失败: %s", indicator_def.name, e)
+        
+        logger.info("   - 重量级（服务端计算）: %d 个", heavyweight_count)
         
         return indicator_pool
     
@@ -162,28 +244,34 @@ class IndicatorPoolMixin:
         """
         加载前端指标计算引擎JavaScript文件
         
+        按文件修改时间缓存，文件未变化时直接返回内存中的内容；以字节方式读取后解码一次。
+        
         Returns:
-            JavaScript代码字符串
+            JavaScript代码字符串（文件不存在或读取失败时返回占位注释，不缓存）
         """
-        import os
-        from pathlib import Path
-        
         # 获取静态文件路径
-        static_dir = Path(__file__).parent / 'static'
-        calculator_file = static_dir / 'indicator_calculator.js'
+        calculator_file = _STATIC_DIR / 'indicator_calculator.js'
         
-        if not calculator_file.exists():
+        try:
+            mtime = calculator_file.stat().st_mtime
+        except OSError:
             logger.warning(f"指标计算引擎文件不存在: {calculator_file}")
             return "// 指标计算引擎未找到\n"
         
+        # 文件未修改时直接返回内存中的内容
+        cached = IndicatorPoolMixin._calculator_js_cache
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
         try:
-            with open(calculator_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            logger.debug(f"✅ 已加载指标计算引擎: {len(content)} 字符")
-            return content
+            content = calculator_file.read_bytes().decode('utf-8')
         except Exception as e:
             logger.error(f"读取指标计算引擎失败: {e}")
             return "// 指标计算引擎加载失败\n"
+        
+        IndicatorPoolMixin._calculator_js_cache = (mtime, content)
+        logger.debug(f"✅ 已加载指标计算引擎: {len(content)} 字符")
+        return content
     
     @classmethod
     def _generate_indicator_pool_scripts(cls, ema6_data, ema12_data, ema18_data, 
@@ -195,16 +283,14 @@ class IndicatorPoolMixin:
             volume_profile_data, pivot_order_blocks_data, divergence_data, mirror_data
         )
         indicator_logic = cls._generate_indicator_pool_logic_js()
-        return f"\n{indicator_config}\n{indicator_logic}\n"
+        return "\n".join(("", indicator_config, indicator_logic, ""))
     
     @classmethod
     def _generate_indicator_config_js(cls, ema6_data, ema12_data, ema18_data, 
                                       ema144_data, ema169_data, volume_profile_data, 
                                       pivot_order_blocks_data=None, divergence_data=None, mirror_data=None) -> str:
         """生成指标配置JavaScript"""
-        from app.trading.indicators.indicator_registry import IndicatorRegistry
-        
-        all_indicators = IndicatorRegistry.get_all()
+        base_config = cls._legacy_indicator_config_base()
         config = {}
         
         # 数据映射
@@ -220,43 +306,58 @@ class IndicatorPoolMixin:
             'mirror_candle': mirror_data if mirror_data is not None else []
         }
         
-        for ind_id, ind_def in all_indicators.items():
+        for ind_id, base_entry in base_config.items():
             data = data_map.get(ind_id)
             
             # 为特殊指标添加渲染函数代码
             render_function = None
-            if ind_id == 'support_resistance_channels':
-                render_function = 'renderSupportResistanceChannels' if data else None
-            elif ind_id == 'zigzag':
-                render_function = 'renderZigZag' if data else None
-            elif ind_id == 'harmonic_patterns':
-                render_function = 'renderHarmonicPatterns' if data else None
-            elif ind_id == 'volume_profile_pivot':
-                render_function = 'renderVolumeProfilePivot' if data else None
-            elif ind_id == 'divergence_detector':
-                render_function = 'renderDivergence' if data else None
-            elif ind_id == 'smart_money_concepts':
-                render_function = 'renderSmartMoneyConcepts' if data else None
-            elif ind_id == 'mirror_candle':
-                # 镜像翻转应该始终有渲染函数，即使数据为空也要设置
-                render_function = 'renderMirrorSubchart'
-                if not data or len(data) == 0:
-                    logger.warning(f"镜像翻转数据为空！ind_id={ind_id}, data={data}")
-            
-            config[ind_id] = {
+            if data:
+                render_function = _RENDER_FUNCTION_MAP.get(ind_id)
+            elif ind_id in _ALWAYS_RENDER:
+                render_function = _RENDER_FUNCTION_MAP[ind_id]
+                logger.warning(f"镜像翻转数据为空！ind_id={ind_id}, data={data}")
+            
+            # 复制骨架后只填充数据相关字段（键顺序与骨架一致）
+            entry = dict(base_entry)
+            entry['data'] = data if data else []
+            entry['renderFunction'] = render_function
+            config[ind_id] = entry
+        
+        return f"const INDICATOR_POOL = {dumps_str(config)};"
+    
+    @classmethod
+    def _legacy_indicator_config_base(cls) -> Dict[str, Dict[str, Any]]:
+        """
+        旧版指标配置中只由注册表决定的部分（名称、分类、颜色等），按注册表版本缓存
+        
+        Returns:
+            {指标ID: 配置字典}，data、renderFunction 为占位值，调用方需复制后再填充
+        """
+        from app.trading.indicators.indicator_registry import IndicatorRegistry
+        
+        version = IndicatorRegistry.get_version()
+        cached = IndicatorPoolMixin._legacy_config_base_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        base_config = {}
+        for ind_id, ind_def in IndicatorRegistry.get_all().items():
+            # 分类、渲染类型、颜色在各指标间大量重复，驻留后共享同一字符串对象
+            base_config[ind_id] = {
                 'name': str(ind_def.name),
-                'category': str(ind_def.category),
+                'category': sys.intern(str(ind_def.category)),
                 'description': str(ind_def.description),
-                'color': str(ind_def.color) if ind_def.color else None,
+                'color': sys.intern(str(ind_def.color)) if ind_def.color else None,
                 'enabled': bool(ind_def.enabled_by_default),
-                'data': data if data else [],
-                'renderType': str(ind_def.render_type),
+                'data': None,
+                'renderType': sys.intern(str(ind_def.render_type)),
                 'isComposite': bool(ind_def.is_composite),
                 'subIndicators': list(ind_def.sub_indicators) if ind_def.sub_indicators else [],
-                'renderFunction': render_function
+                'renderFunction': None
             }
         
-        return f"const INDICATOR_POOL = {json.dumps(config, ensure_ascii=False)};"
+        IndicatorPoolMixin._legacy_config_base_cache = (version, base_config)
+        return base_config
     
     @classmethod
     def _generate_volume_profile_render_function(cls, volume_profile_data) -> str:
@@ -274,9 +375,126 @@ class IndicatorPoolMixin:
     
     @classmethod
     def _generate_indicator_pool_logic_js(cls) -> str:
-        """生成指标池JavaScript逻辑 - 使用普通字符串，不需要转义大括号"""
+        """
+        生成指标池JavaScript逻辑
+        
+        模板内容固定不变，去除源码缩进（约减少五分之一体积）后缓存，每次请求直接复用。
+        模板中的模板字符串均为单行，去缩进不影响运行结果。
+        """
+        cached = IndicatorPoolMixin._logic_js_cache
+        if cached is None:
+            cached = textwrap.dedent(cls._indicator_pool_logic_js_template())
+            IndicatorPoolMixin._logic_js_cache = cached
+        return cached
+    
+    @classmethod
+    def _indicator_pool_logic_js_template(cls) -> str:
+        """指标池JavaScript逻辑模板 - 使用普通字符串，不需要转义大括号"""
         # 注意：这里返回的是普通字符串，所以JavaScript中的 { 和 } 不需要转义
         return """
+        // 叠加层线条系列的公共选项（不显示最新值标签、价格线和十字光标标记）
+        const OVERLAY_LINE_OPTS = Object.freeze({
+            lastValueVisible: false,
+            priceLineVisible: false,
+            crosshairMarkerVisible: false,
+            title: '',
+        });
+        
+        // 装饰性系列（矩形填充、边框、成交量柱）不参与价格轴自动缩放：
+        // 缩放/平移时价格轴只按K线等主要系列计算范围，不再逐个遍历这些系列
+        const DECORATIVE_SERIES_OPTS = Object.freeze({
+            autoscaleInfoProvider: () => null,
+        });
+        
+        // 背离颜色映射（优化白底对比度）
+        const DIVERGENCE_LINE_COLORS = Object.freeze({
+            'bullish': 'rgba(156, 39, 176, 0.9)',          // 紫色 - 正背离（看涨）
+            'bearish': 'rgba(0, 51, 153, 0.9)',            // 深蓝 - 负背离（看跌）
+            'bullish_hidden': 'rgba(76, 175, 80, 0.9)',    // 深绿色 - 隐藏正背离（白底清晰）
+            'bearish_hidden': 'rgba(211, 47, 47, 0.9)'     // 深红色 - 隐藏负背离（白底清晰）
+        });
+        
+        const DIVERGENCE_LABEL_COLORS = Object.freeze({
+            'bullish': '#9C27B0',           // 紫色
+            'bearish': '#003399',           // 深蓝
+            'bullish_hidden': '#4CAF50',    // 深绿色（Material Design Green）
+            'bearish_hidden': '#D32F2F'     // 深红色（Material Design Red）
+        });
+        
+        // K线标签批量写入：同一帧内各指标提交的标签按类别暂存，下一帧统一调用一次 setMarkers
+        // （每次 setMarkers 都会让图表重新计算全部标签）
+        const pendingMarkers = new Map();
+        let markerFlushScheduled = false;
+        
+        function queueMarkers(category, markers) {
+            pendingMarkers.set(category, markers);
+            if (markerFlushScheduled) return;
+            markerFlushScheduled = true;
+            requestAnimationFrame(flushMarkers);
+        }
+        
+        // 撤销尚未写入的某类标签（指标在同一帧内被关闭时使用）
+        function cancelQueuedMarkers(category) {
+            pendingMarkers.delete(category);
+        }
+        
+        function flushMarkers() {
+            markerFlushScheduled = false;
+            if (pendingMarkers.size === 0 || !window.candleSeries) {
+                pendingMarkers.clear();
+                return;
+            }
+            // 策略买卖点 + 本帧提交的各类指标标签
+            let allMarkers = window.initialMarkers || [];
+            for (const markers of pendingMarkers.values()) {
+                allMarkers = allMarkers.concat(markers);
+            }
+            pendingMarkers.clear();
+            try {
+                window.candleSeries.setMarkers(allMarkers);
+            } catch (e) {
+                console.error('❌ 设置K线标签失败:', e);
+            }
+        }
+        
+        // 替换 rgba 颜色的透明度（填充色、辅助线色）。各指标只用少数几种颜色，结果按颜色+透明度缓存，
+        // 避免每个矩形、每条辅助线都重新做一次正则替换
+        const alphaColorCache = new Map();
+        
+        function withAlpha(color, alpha) {
+            const key = color + '|' + alpha;
+            let result = alphaColorCache.get(key);
+            if (result === undefined) {
+                result = color.replace(/[\\d\\.]+\\)$/, alpha + ')');
+                alphaColorCache.set(key, result);
+            }
+            return result;
+        }
+        
+        // 价格区间填充：基线系列在上沿价格与基准价（下沿）之间着色，一个系列画出一个矩形区域
+        // （代替多条半透明横线叠加模拟填充），不参与价格轴自动缩放
+        // topBorder 可选 { color, width, style }：由基线系列自身的线条画出上边框，省去单独的边框系列
+        function addPriceBand(chart, startTime, endTime, priceHigh, priceLow, fillColor, topBorder) {
+            const band = chart.addBaselineSeries({
+                ...OVERLAY_LINE_OPTS,
+                ...DECORATIVE_SERIES_OPTS,
+                baseValue: { type: 'price', price: priceLow },
+                topFillColor1: fillColor,
+                topFillColor2: fillColor,
+                topLineColor: topBorder ? topBorder.color : 'rgba(0, 0, 0, 0)',
+                bottomFillColor1: 'rgba(0, 0, 0, 0)',
+                bottomFillColor2: 'rgba(0, 0, 0, 0)',
+                bottomLineColor: 'rgba(0, 0, 0, 0)',
+                lineWidth: topBorder ? topBorder.width : 1,
+                lineStyle: topBorder && topBorder.style ? topBorder.style : 0,
+            });
+            band.setData([
+                { time: startTime, value: priceHigh },
+                { time: endTime, value: priceHigh }
+            ]);
+            return band;
+        }
+        
         // Volume Profile Pivot Anchored 渲染函数
         function renderVolumeProfilePivot(vpData, chart) {
             if (!vpData || !Array.isArray(vpData) || vpData.length === 0) {
@@ -286,11 +504,9 @@ class IndicatorPoolMixin:
             
             const seriesList = [];
             
-            // 获取所有时间点，用于计算相对位置
-            const allTimes = chart.data ? chart.data.map(d => d.time) : [];
-            
             // 为每个 Volume Profile 区间绘制
-            vpData.forEach((profile, profileIdx) => {
+            for (let profileIdx = 0, profileCount = vpData.length; profileIdx < profileCount; profileIdx++) {
+                const profile = vpData[profileIdx];
                 const profileData = profile.profile_data;
                 const startTime = profile.start_time;
                 const endTime = profile.end_time;
@@ -306,79 +522,73 @@ class IndicatorPoolMixin:
                 const profileLength = endIdx - startIdx;
                 
                 // 绘制成交量柱（使用横向线条模拟，长度根据成交量百分比）
-                profileData.forEach((level, levelIdx) => {
-                    if (level.volume <= 0) return;
-                    
-                    const volumePercent = level.volume_percent;
-                    const priceMid = level.price_mid;
+                // profileData 为列式数组，按级别下标读取
+                // 第一遍：把需要绘制的级别累积到类型化数组（价格、柱长、级别），第二遍统一创建系列
+                const levelCount = profileData.volume.length;
+                const barPrices = new Float64Array(levelCount);
+                const barLengths = new Uint32Array(levelCount);
+                const barLevels = new Uint32Array(levelCount);
+                let barCount = 0;
+                for (let level = 0; level < levelCount; level++) {
+                    if (profileData.volume[level] <= 0) continue;
                     
                     // 计算柱的长度（基于成交量百分比和 profileWidth）
                     // volumePercent 已经是相对于最大成交量的比例（0-1）
-                    const barLengthFloat = profileLength * profileWidth * volumePercent;
+                    const barLengthFloat = profileLength * profileWidth * profileData.volume_percent[level];
                     
                     // 如果柱长度小于0.3个K线，不绘制（避免视觉混乱）
-                    if (barLengthFloat < 0.3) return;
-                    
-                    const barLength = Math.max(1, Math.round(barLengthFloat));
-                    
-                    // 计算柱的起止时间索引（从左侧向右延伸）
-                    const barStartIdx = startIdx;
-                    const barEndIdx = startIdx + barLength;
-                    
-                    // 获取对应的时间
-                    let barStartTime = startTime;
-                    let barEndTime = endTime;
+                    if (barLengthFloat < 0.3) continue;
                     
-                    try {
-                        // 尝试从原始数据中获取准确的时间
-                        if (typeof chartData !== 'undefined' && chartData.length > 0) {
-                            if (barStartIdx >= 0 && barStartIdx < chartData.length) {
-                                barStartTime = chartData[barStartIdx].time;
-                            }
-                            if (barEndIdx >= 0 && barEndIdx < chartData.length) {
-                                barEndTime = chartData[barEndIdx].time;
-                            }
-                        }
-                    } catch (e) {
-                        // 如果获取失败，使用默认值
-                        console.warn('无法获取图表数据时间:', e);
-                    }
+                    barPrices[barCount] = profile.price_low + (level + 0.5) * profile.price_step;
+                    barLengths[barCount] = Math.max(1, Math.round(barLengthFloat));
+                    barLevels[barCount] = level;
+                    barCount++;
+                }
+                
+                // 柱均从 startIdx 向右延伸，起始时间对所有级别相同
+                const hasChartData = typeof chartData !== 'undefined' && chartData && chartData.length > 0;
+                const barStartTime = hasChartData && startIdx >= 0 && startIdx < chartData.length
+                    ? chartData[startIdx].time
+                    : startTime;
+                
+                for (let i = 0; i < barCount; i++) {
+                    const level = barLevels[i];
+                    const barEndIdx = startIdx + barLengths[i];
+                    const barEndTime = hasChartData && barEndIdx >= 0 && barEndIdx < chartData.length
+                        ? chartData[barEndIdx].time
+                        : endTime;
                     
                     // 颜色：Value Area 内用灰色，外面用黄色
-                    const barColor = level.in_value_area 
+                    const inValueArea = profileData.value_area_low_level <= level && level <= profileData.value_area_high_level;
+                    const barColor = inValueArea 
                         ? 'rgba(67, 70, 81, 0.6)' 
                         : 'rgba(251, 192, 45, 0.6)';
                     
                     // 绘制成交量柱（横向线条）- POC 位置用粗一点的线
-                    const lineWidth = level.is_poc ? 5 : 4;
+                    const lineWidth = level === profileData.poc_level ? 5 : 4;
                     
                     const barSeries = chart.addLineSeries({
+                        ...OVERLAY_LINE_OPTS,
+                        ...DECORATIVE_SERIES_OPTS,
                         color: barColor,
                         lineWidth: lineWidth,
                         lineStyle: 0,
-                        lastValueVisible: false,
-                        priceLineVisible: false,
-                        crosshairMarkerVisible: false,
-                        title: '',
                     });
                     
                     barSeries.setData([
-                        { time: barStartTime, value: priceMid },
-                        { time: barEndTime, value: priceMid }
+                        { time: barStartTime, value: barPrices[i] },
+                        { time: barEndTime, value: barPrices[i] }
                     ]);
                     
                     seriesList.push(barSeries);
-                });
+                }
                 
                 // 绘制 POC 线（红色实线）
                 const pocSeries = chart.addLineSeries({
+                    ...OVERLAY_LINE_OPTS,
                     color: 'rgba(255, 0, 0, 0.9)',
                     lineWidth: 3,
                     lineStyle: 0,
-                    lastValueVisible: false,
-                    priceLineVisible: false,
-                    crosshairMarkerVisible: false,
-                    title: '',
                 });
                 pocSeries.setData([
                     { time: startTime, value: pocPrice },
@@ -388,13 +598,10 @@ class IndicatorPoolMixin:
                 
                 // 绘制 VAH 线（蓝色实线）
                 const vahSeries = chart.addLineSeries({
+                    ...OVERLAY_LINE_OPTS,
                     color: 'rgba(41, 98, 255, 0.9)',
                     lineWidth: 2,
                     lineStyle: 0,
-                    lastValueVisible: false,
-                    priceLineVisible: false,
-                    crosshairMarkerVisible: false,
-                    title: '',
                 });
                 vahSeries.setData([
                     { time: startTime, value: vahPrice },
@@ -404,13 +611,10 @@ class IndicatorPoolMixin:
                 
                 // 绘制 VAL 线（蓝色实线）
                 const valSeries = chart.addLineSeries({
+                    ...OVERLAY_LINE_OPTS,
                     color: 'rgba(41, 98, 255, 0.9)',
                     lineWidth: 2,
                     lineStyle: 0,
-                    lastValueVisible: false,
-                    priceLineVisible: false,
-                    crosshairMarkerVisible: false,
-                    title: '',
                 });
                 valSeries.setData([
                     { time: startTime, value: valPrice },
@@ -418,109 +622,87 @@ class IndicatorPoolMixin:
                 ]);
                 seriesList.push(valSeries);
                 
-                // 绘制背景区域填充（使用多条半透明线模拟）
-                const fillLines = 15;
-                for (let i = 0; i < fillLines; i++) {
-                    const fillPrice = profile.price_low + (profile.price_high - profile.price_low) * (i / fillLines);
-                    const fillSeries = chart.addLineSeries({
-                        color: 'rgba(41, 98, 255, 0.03)',
-                        lineWidth: 3,
-                        lineStyle: 0,
-                        lastValueVisible: false,
-                        priceLineVisible: false,
-                        crosshairMarkerVisible: false,
-                        title: '',
-                    });
-                    fillSeries.setData([
-                        { time: startTime, value: fillPrice },
-                        { time: endTime, value: fillPrice }
-                    ]);
-                    seriesList.push(fillSeries);
-                }
-            });
+                // 绘制背景区域填充（单个基线系列填充整个价格区间）
+                seriesList.push(addPriceBand(chart, startTime, endTime, profile.price_high, profile.price_low, 'rgba(41, 98, 255, 0.03)'));
+            }
             
             console.log('✅ Volume Profile Pivot 已渲染:', vpData.length, '个Profile，共', seriesList.length, '条系列');
             return seriesList;
         }
         
+        // 线条数据（服务端为按列存储的 {time: [], value: []}，前端计算结果为 [{time, value}]）
+        function lineSeriesData(lineData) {
+            if (!lineData) return [];
+            if (Array.isArray(lineData)) return lineData;
+            const times = lineData.time || [];
+            const values = lineData.value || [];
+            const pointCount = Math.min(times.length, values.length);
+            const points = new Array(pointCount);
+            for (let i = 0; i < pointCount; i++) {
+                points[i] = { time: times[i], value: values[i] };
+            }
+            return points;
+        }
+        
+        // 指标是否有可绘制的数据（线条数据按列存储为 {time, value}，空列视为无数据）
+        function hasIndicatorData(data) {
+            if (!data) return false;
+            if (Array.isArray(data)) return data.length > 0;
+            if (Array.isArray(data.time)) return data.time.length > 0;
+            return true;
+        }
+        
+        // Pivot Order Blocks 数量（服务端为按列存储的对象，前端计算结果为对象数组）
+        function pivotOrderBlockCount(pobData) {
+            if (!pobData) return 0;
+            if (Array.isArray(pobData)) return pobData.length;
+            return Array.isArray(pobData.price_high) ? pobData.price_high.length : 0;
+        }
+        
         // Pivot Order Blocks 渲染函数 - 使用图表系列绘制
         function renderPivotOrderBlocks(pobData, chart) {
-            if (!pobData || !Array.isArray(pobData) || pobData.length === 0) {
+            const blockCount = pivotOrderBlockCount(pobData);
+            if (blockCount === 0) {
                 console.warn('Pivot Order Blocks 数据无效');
                 return [];
             }
             
             const seriesList = [];
+            const columnar = !Array.isArray(pobData);
             
             // 为每个订单块创建系列
-            pobData.forEach((block, blockIdx) => {
-                const isResistance = block.type === 'resistance';
-                const priceHigh = block.price_high;
-                const priceLow = block.price_low;
-                const priceRange = priceHigh - priceLow;
-                const startTime = block.start_time;
-                const endTime = block.end_time;
+            for (let blockIdx = 0; blockIdx < blockCount; blockIdx++) {
+                const block = columnar ? null : pobData[blockIdx];
+                const isResistance = (columnar ? pobData.type[blockIdx] : block.type) === 'resistance';
+                const priceHigh = columnar ? pobData.price_high[blockIdx] : block.price_high;
+                const priceLow = columnar ? pobData.price_low[blockIdx] : block.price_low;
+                const startTime = columnar ? pobData.start_time[blockIdx] : block.start_time;
+                const endTime = columnar ? pobData.end_time[blockIdx] : block.end_time;
                 
                 // 设置颜色
                 const bgColor = isResistance ? 'rgba(100, 140, 210, 0.18)' : 'rgba(220, 130, 70, 0.18)';
                 const lineColor = isResistance ? 'rgba(100, 140, 210, 0.8)' : 'rgba(220, 130, 70, 0.8)';
                 
-                // 创建15条填充线
-                const NUM_FILL_LINES = 15;
-                for (let i = 0; i < NUM_FILL_LINES; i++) {
-                    const priceLevel = priceLow + (priceRange * (i + 0.5) / NUM_FILL_LINES);
-                    
-                    const fillSeries = chart.addLineSeries({
-                        color: bgColor,
-                        lineWidth: 5,
-                        lineStyle: 0,
-                        lastValueVisible: false,
-                        priceLineVisible: false,
-                        crosshairMarkerVisible: false,
-                        title: '',
-                    });
-                    
-                    fillSeries.setData([
-                        { time: startTime, value: priceLevel },
-                        { time: endTime, value: priceLevel }
-                    ]);
-                    
-                    seriesList.push(fillSeries);
-                }
-                
-                // 创建上下边界虚线
-                const topBorderSeries = chart.addLineSeries({
-                    color: lineColor,
-                    lineWidth: 2,
-                    lineStyle: 2,
-                    lastValueVisible: false,
-                    priceLineVisible: false,
-                    crosshairMarkerVisible: false,
-                    title: '',
-                });
-                topBorderSeries.setData([
-                    { time: startTime, value: priceHigh },
-                    { time: endTime, value: priceHigh }
-                ]);
-                seriesList.push(topBorderSeries);
+                // 区域填充（单个基线系列填充整个价格区间，同时画出上边界虚线）
+                seriesList.push(addPriceBand(chart, startTime, endTime, priceHigh, priceLow, bgColor,
+                    { color: lineColor, width: 2, style: 2 }));
                 
+                // 下边界虚线
                 const bottomBorderSeries = chart.addLineSeries({
+                    ...OVERLAY_LINE_OPTS,
+                    ...DECORATIVE_SERIES_OPTS,
                     color: lineColor,
                     lineWidth: 2,
                     lineStyle: 2,
-                    lastValueVisible: false,
-                    priceLineVisible: false,
-                    crosshairMarkerVisible: false,
-                    title: '',
                 });
                 bottomBorderSeries.setData([
                     { time: startTime, value: priceLow },
                     { time: endTime, value: priceLow }
                 ]);
                 seriesList.push(bottomBorderSeries);
-            });
+            }
             
-            console.log('✅ Pivot Order Blocks 已渲染:', pobData.length, '个订单块，共', seriesList.length, '条系列');
+            console.log('✅ Pivot Order Blocks 已渲染:', blockCount, '个订单块，共', seriesList.length, '条系列');
             return seriesList;
         }
         
@@ -536,41 +718,30 @@ class IndicatorPoolMixin:
             const seriesList = [];
             const markers = [];
             
-            // 颜色映射（优化白底对比度）
-            const colorMap = {
-                'bullish': 'rgba(156, 39, 176, 0.9)',          // 紫色 - 正背离（看涨）
-                'bearish': 'rgba(0, 51, 153, 0.9)',            // 深蓝 - 负背离（看跌）
-                'bullish_hidden': 'rgba(76, 175, 80, 0.9)',    // 深绿色 - 隐藏正背离（白底清晰）
-                'bearish_hidden': 'rgba(211, 47, 47, 0.9)'     // 深红色 - 隐藏负背离（白底清晰）
-            };
-            
-            const labelColorMap = {
-                'bullish': '#9C27B0',           // 紫色
-                'bearish': '#003399',           // 深蓝
-                'bullish_hidden': '#4CAF50',    // 深绿色（Material Design Green）
-                'bearish_hidden': '#D32F2F'     // 深红色（Material Design Red）
-            };
+            // 背离连线系列（只有颜色和线型不同）
+            const makeDivLine = (lineColor, lineStyle) => chart.addLineSeries({
+                ...OVERLAY_LINE_OPTS,
+                color: lineColor,
+                lineWidth: 2,
+                lineStyle: lineStyle,
+            });
             
             // 为每个背离组绘制连线和标签
             divData.forEach((divGroup, idx) => {
                 console.log('渲染背离组 #' + (idx + 1) + ':', divGroup);
                 
-                const color = colorMap[divGroup.color] || 'rgba(128, 128, 128, 0.8)';
-                const labelColor = labelColorMap[divGroup.color] || '#888888';
+                const color = DIVERGENCE_LINE_COLORS[divGroup.color] || 'rgba(128, 128, 128, 0.8)';
+                const labelColor = DIVERGENCE_LABEL_COLORS[divGroup.color] || '#888888';
                 
                 try {
+                    // 隐藏背离用虚线（isHidden/isBullish 由计算引擎预先给出，缺失时按类型名判断）
+                    const isHidden = divGroup.isHidden ?? divGroup.type.includes('hidden');
+                    const lineStyle = isHidden ? 2 : 0;
+                    
                     // 绘制所有背离线（如果有多个指标检测到）
                     if (divGroup.lines && Array.isArray(divGroup.lines)) {
                         divGroup.lines.forEach((line) => {
-                            const divLine = chart.addLineSeries({
-                                color: color,
-                                lineWidth: 2,
-                                lineStyle: divGroup.type.includes('hidden') ? 2 : 0,
-                                lastValueVisible: false,
-                                priceLineVisible: false,
-                                crosshairMarkerVisible: false,
-                                title: '',
-                            });
+                            const divLine = makeDivLine(color, lineStyle);
                             
                             divLine.setData([
                                 { time: line.start_time, value: line.start_price },
@@ -581,15 +752,7 @@ class IndicatorPoolMixin:
                         });
                     } else {
                         // 兼容旧格式
-                        const divLine = chart.addLineSeries({
-                            color: color,
-                            lineWidth: 2,
-                            lineStyle: divGroup.type.includes('hidden') ? 2 : 0,
-                            lastValueVisible: false,
-                            priceLineVisible: false,
-                            crosshairMarkerVisible: false,
-                            title: '',
-                        });
+                        const divLine = makeDivLine(color, lineStyle);
                         
                         divLine.setData([
                             { time: divGroup.start_time, value: divGroup.start_price },
@@ -601,7 +764,7 @@ class IndicatorPoolMixin:
                     
                     // 添加标签标记（使用与买卖信号相同的箭头样式）
                     if (divGroup.label_text) {
-                        const isBullish = divGroup.type.includes('bullish');
+                        const isBullish = divGroup.isBullish ?? divGroup.type.includes('bullish');
                         // LightweightCharts不支持多行文本，将换行符替换为逗号+空格，更紧凑易读
                         const singleLineText = divGroup.label_text.replace(/\\n/g, ', ');
                         markers.push({
@@ -734,6 +897,7 @@ class IndicatorPoolMixin:
                             price: structure.price,
                             color: color,
                             lineWidth: 0,
+                            lineVisible: false,  // 只显示价格轴标签，不画横贯图表的价格线
                             lineStyle: 2,
                             axisLabelVisible: true,
                             title: tag
@@ -806,6 +970,7 @@ class IndicatorPoolMixin:
                             price: structure.price,
                             color: color,
                             lineWidth: 0,
+                            lineVisible: false,  // 只显示价格轴标签，不画横贯图表的价格线
                             lineStyle: 2,
                             axisLabelVisible: true,
                             title: tag
@@ -853,21 +1018,9 @@ class IndicatorPoolMixin:
                         'rgba(242, 54, 69, 0.8)' :  // 看涨：红色（A股习惯）
                         'rgba(8, 153, 129, 0.8)';   // 看跌：绿色（A股习惯）
                     
-                    // 上边框（加粗）
-                    const topLine = chart.addLineSeries({
-                        color: borderColor,
-                        lineWidth: 2,
-                        lastValueVisible: false,
-                        priceLineVisible: false
-                    });
-                    topLine.setData([
-                        { time: block.time, value: block.top },
-                        { time: endTime, value: block.top }
-                    ]);
-                    seriesList.push(topLine);
-                    
                     // 下边框（加粗）
                     const bottomLine = chart.addLineSeries({
+                        ...DECORATIVE_SERIES_OPTS,
                         color: borderColor,
                         lineWidth: 2,
                         lastValueVisible: false,
@@ -879,25 +1032,12 @@ class IndicatorPoolMixin:
                     ]);
                     seriesList.push(bottomLine);
                     
-                    // 中间填充线
+                    // 中间填充 + 上边框（加粗），单个基线系列
                     const fillColor = block.bias === 1 ? 
                         'rgba(242, 54, 69, 0.2)' :  // 看涨：红色
                         'rgba(8, 153, 129, 0.2)';   // 看跌：绿色
-                    const step = (block.top - block.bottom) / 10;
-                    for (let i = 1; i < 10; i++) {
-                        const price = block.bottom + step * i;
-                        const fillLine = chart.addLineSeries({
-                            color: fillColor,
-                            lineWidth: 1,
-                            lastValueVisible: false,
-                            priceLineVisible: false
-                        });
-                        fillLine.setData([
-                            { time: block.time, value: price },
-                            { time: endTime, value: price }
-                        ]);
-                        seriesList.push(fillLine);
-                    }
+                    seriesList.push(addPriceBand(chart, block.time, endTime, block.top, block.bottom, fillColor,
+                        { color: borderColor, width: 2 }));
                     
                     console.log(`     ✅ 摆动订单块渲染完成`);
                 });
@@ -913,21 +1053,9 @@ class IndicatorPoolMixin:
                         'rgba(247, 124, 128, 0.6)' :  // 看涨：亮红色（A股习惯）
                         'rgba(49, 121, 245, 0.6)';    // 看跌：亮绿蓝色（A股习惯）
                     
-                    // 上边框
-                    const topLine = chart.addLineSeries({
-                        color: borderColor,
-                        lineWidth: 1,
-                        lastValueVisible: false,
-                        priceLineVisible: false
-                    });
-                    topLine.setData([
-                        { time: block.time, value: block.top },
-                        { time: endTime, value: block.top }
-                    ]);
-                    seriesList.push(topLine);
-                    
                     // 下边框
                     const bottomLine = chart.addLineSeries({
+                        ...DECORATIVE_SERIES_OPTS,
                         color: borderColor,
                         lineWidth: 1,
                         lastValueVisible: false,
@@ -939,25 +1067,12 @@ class IndicatorPoolMixin:
                     ]);
                     seriesList.push(bottomLine);
                     
-                    // 中间填充线（多条半透明线模拟填充）
+                    // 中间填充 + 上边框，单个基线系列
                     const fillColor = block.bias === 1 ? 
                         'rgba(247, 124, 128, 0.15)' :  // 看涨：亮红色
                         'rgba(49, 121, 245, 0.15)';    // 看跌：亮绿蓝色
-                    const step = (block.top - block.bottom) / 10;  // 画10条线填充
-                    for (let i = 1; i < 10; i++) {
-                        const price = block.bottom + step * i;
-                        const fillLine = chart.addLineSeries({
-                            color: fillColor,
-                            lineWidth: 1,
-                            lastValueVisible: false,
-                            priceLineVisible: false
-                        });
-                        fillLine.setData([
-                            { time: block.time, value: price },
-                            { time: endTime, value: price }
-                        ]);
-                        seriesList.push(fillLine);
-                    }
+                    seriesList.push(addPriceBand(chart, block.time, endTime, block.top, block.bottom, fillColor,
+                        { color: borderColor, width: 1 }));
                     
                     console.log(`     ✅ 内部订单块渲染完成`);
                 });
@@ -991,6 +1106,7 @@ class IndicatorPoolMixin:
                             price: ehl.price,
                             color: color,
                             lineWidth: 0,
+                            lineVisible: false,  // 只显示价格轴标签，不画横贯图表的价格线
                             lineStyle: 2,
                             axisLabelVisible: true,
                             title: label
@@ -1040,21 +1156,9 @@ class IndicatorPoolMixin:
                         'rgba(255, 0, 8, 0.1)' :     // 看涨：红色
                         'rgba(0, 255, 104, 0.1)';    // 看跌：绿色
                     
-                    // 上边框
-                    const topLine = chart.addLineSeries({
-                        color: borderColor,
-                        lineWidth: 1,
-                        lastValueVisible: false,
-                        priceLineVisible: false
-                    });
-                    topLine.setData([
-                        { time: fvg.time, value: fvg.top },
-                        { time: fvg.endTime, value: fvg.top }
-                    ]);
-                    seriesList.push(topLine);
-                    
                     // 下边框
                     const bottomLine = chart.addLineSeries({
+                        ...DECORATIVE_SERIES_OPTS,
                         color: borderColor,
                         lineWidth: 1,
                         lastValueVisible: false,
@@ -1066,40 +1170,19 @@ class IndicatorPoolMixin:
                     ]);
                     seriesList.push(bottomLine);
                     
-                    // 中间填充线
-                    const step = (fvg.top - fvg.bottom) / 5;  // 画5条线填充
-                    for (let i = 1; i < 5; i++) {
-                        const price = fvg.bottom + step * i;
-                        const fillLine = chart.addLineSeries({
-                            color: fillColor,
-                            lineWidth: 1,
-                            lastValueVisible: false,
-                            priceLineVisible: false
-                        });
-                        fillLine.setData([
-                            { time: fvg.time, value: price },
-                            { time: fvg.endTime, value: price }
-                        ]);
-                        seriesList.push(fillLine);
-                    }
+                    // 中间填充 + 上边框，单个基线系列
+                    const band = addPriceBand(chart, fvg.time, fvg.endTime, fvg.top, fvg.bottom, fillColor,
+                        { color: borderColor, width: 1 });
+                    seriesList.push(band);
                     
-                    // 添加FVG标签在价格轴上
+                    // 添加FVG标签在价格轴上（挂在填充系列上，不再单独建标签系列）
                     const midPrice = (fvg.top + fvg.bottom) / 2;
-                    const labelLine = chart.addLineSeries({
-                        color: 'rgba(0,0,0,0)',
-                        lineWidth: 0,
-                        lastValueVisible: false,
-                        priceLineVisible: false
-                    });
-                    labelLine.setData([
-                        { time: fvg.time, value: midPrice }
-                    ]);
-                    
                     try {
-                        labelLine.createPriceLine({
+                        band.createPriceLine({
                             price: midPrice,
                             color: borderColor,
                             lineWidth: 0,
+                            lineVisible: false,  // 只显示价格轴标签，不画横贯图表的价格线
                             lineStyle: 2,
                             axisLabelVisible: true,
                             title: 'FVG'
@@ -1107,8 +1190,6 @@ class IndicatorPoolMixin:
                     } catch (e) {
                         console.warn('   - 无法添加FVG标签');
                     }
-                    
-                    seriesList.push(labelLine);
                 });
                 console.log(`   ✅ FVG渲染完成: ${smcData.fairValueGaps.length} 个`);
             }
@@ -1131,19 +1212,13 @@ class IndicatorPoolMixin:
                     ];
                     
                     if (smcMarkersArray.length > 0) {
-                        // 获取现有的策略标签（买卖点）
-                        const existingMarkers = window.initialMarkers || [];
-                        
-                        // 合并：策略标签 + SMC标签
-                        const allMarkers = [...existingMarkers, ...smcMarkersArray];
-                        window.candleSeries.setMarkers(allMarkers);
+                        // 合并：策略标签 + SMC标签（下一帧统一写入）
+                        queueMarkers('smc', smcMarkersArray);
                         
                         console.log(`✅ [SMC标签] 已添加 ${smcMarkersArray.length} 个SMC标签`);
                         console.log(`   - 摆动结构: ${window.smcMarkers.structure?.length || 0}`);
                         console.log(`   - 内部结构: ${window.smcMarkers.internal?.length || 0}`);
                         console.log(`   - 等高等低: ${window.smcMarkers.equal?.length || 0}`);
-                        console.log(`   - 策略买卖点: ${existingMarkers.length}`);
-                        console.log(`   - 总计: ${allMarkers.length}`);
                     }
                 } catch (e) {
                     console.error('❌ [SMC标签] 添加标签失败:', e);
@@ -1165,7 +1240,8 @@ class IndicatorPoolMixin:
                 console.log('⚙️ [SR Channels] 数据为空，开始前端计算...');
                 const config = INDICATOR_POOL['support_resistance_channels'] || {};
                 const params = config.params || {};
-                srData = calculateSupportResistanceChannels(chartData, params);
+                const bars = chartBars();
+                srData = restoreBarIndices(calculateSupportResistanceChannels(bars.bars, params), bars.indices);
                 
                 if (!srData || !srData.channels || srData.channels.length === 0) {
                     console.error('❌ [SR Channels] 计算失败或无通道');
@@ -1199,24 +1275,11 @@ class IndicatorPoolMixin:
                 // 边框颜色（更明显）
                 const borderColor = color;
                 // 填充颜色（更柔和）
-                const fillColor = color.replace(/[\d\.]+\)$/, '0.12)');
-                
-                // 上边框
-                const topLine = chart.addLineSeries({
-                    color: borderColor,
-                    lineWidth: 1,
-                    lastValueVisible: false,
-                    priceLineVisible: false
-                });
-                
-                topLine.setData([
-                    { time: chartData[0].time, value: channel.high },
-                    { time: currentBarTime, value: channel.high }
-                ]);
-                seriesList.push(topLine);
+                const fillColor = withAlpha(color, '0.12');
                 
                 // 下边框
                 const bottomLine = chart.addLineSeries({
+                    ...DECORATIVE_SERIES_OPTS,
                     color: borderColor,
                     lineWidth: 1,
                     lastValueVisible: false,
@@ -1229,42 +1292,20 @@ class IndicatorPoolMixin:
                 ]);
                 seriesList.push(bottomLine);
                 
-                // 填充通道（用更密集但更透明的线，创造渐变效果）
-                const fillLines = 12;  // 增加填充线数量
-                const step = (channel.high - channel.low) / (fillLines + 1);
-                for (let i = 1; i <= fillLines; i++) {
-                    const price = channel.low + step * i;
-                    const fillLine = chart.addLineSeries({
-                        color: fillColor,
-                        lineWidth: 1,
-                        lastValueVisible: false,
-                        priceLineVisible: false
-                    });
-                    
-                    fillLine.setData([
-                        { time: chartData[0].time, value: price },
-                        { time: currentBarTime, value: price }
-                    ]);
-                    seriesList.push(fillLine);
-                }
+                // 填充通道 + 上边框，单个基线系列
+                const band = addPriceBand(chart, chartData[0].time, currentBarTime, channel.high, channel.low, fillColor,
+                    { color: borderColor, width: 1 });
+                seriesList.push(band);
                 
-                // 在价格轴上添加标签
+                // 在价格轴上添加标签（挂在填充系列上，不再单独建标签系列）
                 const midPrice = (channel.high + channel.low) / 2;
-                const labelLine = chart.addLineSeries({
-                    color: 'rgba(0,0,0,0)',
-                    lineWidth: 0,
-                    lastValueVisible: false,
-                    priceLineVisible: false
-                });
-                
-                labelLine.setData([{ time: currentBarTime, value: midPrice }]);
-                
                 try {
                     const label = channel.type === 'support' ? 'S' : channel.type === 'resistance' ? 'R' : '—';
-                    labelLine.createPriceLine({
+                    band.createPriceLine({
                         price: midPrice,
                         color: color,
                         lineWidth: 0,
+                        lineVisible: false,  // 只显示价格轴标签，不画横贯图表的价格线
                         lineStyle: 2,
                         axisLabelVisible: true,
                         title: label
@@ -1272,8 +1313,6 @@ class IndicatorPoolMixin:
                 } catch (e) {
                     console.warn('   - 无法添加通道标签');
                 }
-                
-                seriesList.push(labelLine);
             });
             
             // 渲染Pivot点（如果启用）
@@ -1291,13 +1330,8 @@ class IndicatorPoolMixin:
                 });
                 
                 if (window.candleSeries && pivotMarkers.length > 0) {
-                    try {
-                        const existingMarkers = window.initialMarkers || [];
-                        window.candleSeries.setMarkers([...existingMarkers, ...pivotMarkers]);
-                        console.log(`   - 已添加 ${pivotMarkers.length} 个Pivot点标记`);
-                    } catch (e) {
-                        console.error('   - 添加Pivot标记失败:', e);
-                    }
+                    queueMarkers('sr_pivots', pivotMarkers);
+                    console.log(`   - 已添加 ${pivotMarkers.length} 个Pivot点标记`);
                 }
             }
             
@@ -1314,7 +1348,8 @@ class IndicatorPoolMixin:
                 console.log('⚙️ [ZigZag++] 数据为空，开始前端计算...');
                 const config = INDICATOR_POOL['zigzag'] || {};
                 const params = config.params || {};
-                zzData = calculateZigZag(chartData, params);
+                const bars = chartBars();
+                zzData = restoreBarIndices(calculateZigZag(bars.bars, params), bars.indices);
                 
                 if (!zzData || !zzData.pivots || zzData.pivots.length === 0) {
                     console.error('❌ [ZigZag++] 计算失败或无转折点');
@@ -1373,8 +1408,8 @@ class IndicatorPoolMixin:
                 try {
                     const bgTransparency = params.background_transparency || 85;
                     const bgColor = zzData.direction > 0 ? 
-                        bullColor.replace(/[\\d\\.]+\\)$/, (bgTransparency / 100) + ')') :
-                        bearColor.replace(/[\\d\\.]+\\)$/, (bgTransparency / 100) + ')');
+                        withAlpha(bullColor, bgTransparency / 100) :
+                        withAlpha(bearColor, bgTransparency / 100);
                     
                     // 使用Histogram series创建背景色
                     const bgSeries = chart.addHistogramSeries({
@@ -1551,7 +1586,7 @@ class IndicatorPoolMixin:
                     
                     auxiliaryLines.forEach(line => {
                         const auxLine = chart.addLineSeries({
-                            color: color.replace(/[\\d\\.]+\\)$/, '0.25)'),
+                            color: withAlpha(color, '0.25'),
                             lineWidth: 1,
                             lastValueVisible: false,
                             priceLineVisible: false
@@ -1579,7 +1614,7 @@ class IndicatorPoolMixin:
                             allHarmonicMarkers.push({
                                 time: point.time,
                                 position: point.type === 'high' ? 'aboveBar' : 'belowBar',
-                                color: color.replace(/[\\d\\.]+\\)$/, '0.6)'),
+                                color: withAlpha(color, '0.6'),
                                 shape: 'circle',
                                 text: label,
                                 size: 0.7
@@ -1800,6 +1835,192 @@ class IndicatorPoolMixin:
         const indicatorSeries = new Map();
         let userPreferences = {};
         
+        // 绘制开销大的叠加层指标（SMC、支撑阻力、价格轨迹）推迟到下一帧渲染，
+        // 同一帧内对同一指标的重复请求只执行最后一次，帧内被关闭的指标不再绘制
+        const pendingRenders = new Map();  // 指标ID -> 渲染函数
+        let renderFlushScheduled = false;
+        
+        function scheduleRender(id, render) {
+            pendingRenders.set(id, render);
+            if (renderFlushScheduled) return;
+            renderFlushScheduled = true;
+            requestAnimationFrame(flushRenders);
+        }
+        
+        function cancelScheduledRender(id) {
+            pendingRenders.delete(id);
+            pendingCalculations.delete(id);
+        }
+        
+        function flushRenders() {
+            renderFlushScheduled = false;
+            const renders = Array.from(pendingRenders);
+            pendingRenders.clear();
+            for (const [id, render] of renders) {
+                try {
+                    indicatorSeries.set(id, render());
+                } catch (e) {
+                    console.error('❌ 渲染指标失败:', id, e);
+                }
+            }
+        }
+
+        // K线数量远超图表像素宽度时，先按 M4 聚合（每个桶保留首、尾、最高、最低四根K线，保持时间顺序）
+        // 再交给支撑阻力通道/价格轨迹计算，极值点不会丢失；结果中的 barIndex 映射回原始K线下标
+        const M4_BUCKETS_PER_PIXEL = 2;
+        let m4Cache = null;
+
+        function m4Downsample(bars, buckets) {
+            if (!bars || !(buckets > 0) || bars.length <= buckets * 4) {
+                return { bars: bars, indices: null };
+            }
+            if (m4Cache && m4Cache.source === bars && m4Cache.buckets === buckets) return m4Cache;
+            
+            const n = bars.length;
+            const size = Math.ceil(n / buckets);
+            const indices = [];
+            for (let start = 0; start < n; start += size) {
+                const end = Math.min(start + size, n);
+                let minIndex = start, maxIndex = start;
+                for (let i = start + 1; i < end; i++) {
+                    if (bars[i].low < bars[minIndex].low) minIndex = i;
+                    if (bars[i].high > bars[maxIndex].high) maxIndex = i;
+                }
+                const picked = [start, minIndex, maxIndex, end - 1].sort((a, b) => a - b);
+                for (let k = 0; k < picked.length; k++) {
+                    if (k === 0 || picked[k] !== picked[k - 1]) indices.push(picked[k]);
+                }
+            }
+            m4Cache = { source: bars, buckets: buckets, bars: indices.map(i => bars[i]), indices: indices };
+            return m4Cache;
+        }
+
+        function chartBars() {
+            let width = 0;
+            try {
+                width = chart.timeScale().width();
+            } catch (e) {
+                // 图表尚未布局时不降采样
+            }
+            return m4Downsample(chartData, Math.round(width * M4_BUCKETS_PER_PIXEL));
+        }
+
+        function restoreBarIndices(result, indices) {
+            if (!indices || !result || !Array.isArray(result.pivots)) return result;
+            result.pivots.forEach(pivot => {
+                if (pivot.barIndex !== undefined) pivot.barIndex = indices[pivot.barIndex];
+            });
+            return result;
+        }
+
+        // 支撑阻力通道、价格轨迹的前端计算放到 Web Worker 中执行，避免大数据量时阻塞滚动/缩放。
+        // 两个计算函数不依赖DOM和其他函数，直接用函数源码生成 Worker 脚本；
+        // K线数据不变时只发送一次，由 Worker 缓存
+        const WORKER_CALCULATORS = {
+            support_resistance_channels: 'calculateSupportResistanceChannels',
+            zigzag: 'calculateZigZag'
+        };
+        const pendingCalculations = new Map();  // 指标ID -> 本次计算标记
+        const workerCallbacks = new Map();      // 请求ID -> {resolve, reject}
+        let calculatorWorker = null;            // null: 未创建, false: 不可用
+        let workerRequestId = 0;
+        let workerCandles = null;
+
+        function getCalculatorWorker() {
+            if (calculatorWorker !== null) return calculatorWorker;
+            calculatorWorker = false;
+            if (typeof Worker === 'undefined' || typeof Blob === 'undefined' || typeof URL === 'undefined') {
+                return calculatorWorker;
+            }
+            try {
+                if (typeof calculateSupportResistanceChannels !== 'function' || typeof calculateZigZag !== 'function') {
+                    return calculatorWorker;
+                }
+                const functions = [calculateSupportResistanceChannels, calculateZigZag];
+                const source = functions.map(fn => fn.toString()).concat([
+                    'const CALCULATORS = {' + Object.keys(WORKER_CALCULATORS)
+                        .map(id => JSON.stringify(id) + ': ' + WORKER_CALCULATORS[id]).join(', ') + '};',
+                    'let candles = [];',
+                    'self.onmessage = function (e) {',
+                    '    const msg = e.data;',
+                    '    if (msg.candles) candles = msg.candles;',
+                    '    try {',
+                    '        self.postMessage({ requestId: msg.requestId, result: CALCULATORS[msg.indicatorId](candles, msg.params) });',
+                    '    } catch (err) {',
+                    '        self.postMessage({ requestId: msg.requestId, error: String(err) });',
+                    '    }',
+                    '};'
+                ]).join('\\n');
+                const url = URL.createObjectURL(new Blob([source], { type: 'application/javascript' }));
+                const worker = new Worker(url);
+                URL.revokeObjectURL(url);
+                worker.onmessage = (e) => {
+                    const callback = workerCallbacks.get(e.data.requestId);
+                    if (!callback) return;
+                    workerCallbacks.delete(e.data.requestId);
+                    if (e.data.error) callback.reject(new Error(e.data.error));
+                    else callback.resolve(e.data.result);
+                };
+                worker.onerror = (e) => {
+                    // Worker 整体失败：后续改回主线程计算，已挂起的请求全部失败
+                    console.error('❌ [Worker] 计算线程出错:', e.message || e);
+                    calculatorWorker = false;
+                    worker.terminate();
+                    const callbacks = Array.from(workerCallbacks.values());
+                    workerCallbacks.clear();
+                    callbacks.forEach(callback => callback.reject(new Error('worker failed')));
+                };
+                calculatorWorker = worker;
+            } catch (e) {
+                console.warn('⚠️ [Worker] 创建失败，使用主线程计算:', e);
+                calculatorWorker = false;
+            }
+            return calculatorWorker;
+        }
+
+        function usesCalculatorWorker(id) {
+            return id in WORKER_CALCULATORS && !!getCalculatorWorker();
+        }
+
+        function calculateInWorker(id, candles, params) {
+            const worker = getCalculatorWorker();
+            if (!worker) return Promise.reject(new Error('worker unavailable'));
+            const requestId = ++workerRequestId;
+            const message = { requestId, indicatorId: id, params };
+            if (workerCandles !== candles) {
+                message.candles = candles;
+                workerCandles = candles;
+            }
+            return new Promise((resolve, reject) => {
+                workerCallbacks.set(requestId, { resolve, reject });
+                worker.postMessage(message);
+            });
+        }
+
+        // 数据缺失时先在 Worker 中计算，结果返回后再排队渲染；
+        // 计算期间指标被关闭或重新开启，旧结果直接丢弃。Worker 失败时由渲染函数在主线程计算
+        function scheduleRenderAfterCalculation(id, config, render) {
+            if (config.data || !usesCalculatorWorker(id)) {
+                scheduleRender(id, render);
+                return;
+            }
+            const token = {};
+            pendingCalculations.set(id, token);
+            const bars = chartBars();
+            console.log('⚡ [Worker计算] 指标:', config.name, 'K线:', bars.bars.length);
+            calculateInWorker(id, bars.bars, config.params || {}).then(result => {
+                if (pendingCalculations.get(id) !== token) return;
+                pendingCalculations.delete(id);
+                if (result) config.data = restoreBarIndices(result, bars.indices);
+                scheduleRender(id, render);
+            }, error => {
+                if (pendingCalculations.get(id) !== token) return;
+                pendingCalculations.delete(id);
+                console.warn('⚠️ [Worker计算] 失败，改为主线程计算:', config.name, error);
+                scheduleRender(id, render);
+            });
+        }
+
         // 初始化指标池
         function initIndicatorPool() {
             console.log('🎬 [初始化] 指标池');
@@ -1890,8 +2111,8 @@ class IndicatorPoolMixin:
                 return;
             }
             
-            // ⚡ 如果data为null，则前端动态计算
-            if (!config.data && window.IndicatorCalculator) {
+            // ⚡ 如果data为null，则前端动态计算（支撑阻力通道、价格轨迹在下方渲染分支中降采样后计算）
+            if (!config.data && window.IndicatorCalculator && !(id in WORKER_CALCULATORS)) {
                 console.log('⚡ [动态计算] 指标:', config.name, '参数:', config.params);
                 try {
                     const calculatedData = window.IndicatorCalculator.calculate(id, window.candleData, config.params || {});
@@ -1914,13 +2135,14 @@ class IndicatorPoolMixin:
                 // overlay类型指标需要自定义渲染
                 console.log('渲染覆盖层指标:', config.name);
                 if (config.renderFunction === 'renderPivotOrderBlocks') {
-                    if (!config.data || config.data.length === 0) {
+                    const blockCount = pivotOrderBlockCount(config.data);
+                    if (blockCount === 0) {
                         console.warn('⚠️ 支撑和阻力区域：当前股票数据未生成订单块（可能走势较平缓，缺少明显的高低点转折）');
                         indicatorSeries.set(id, []);
                     } else {
                         const elements = renderPivotOrderBlocks(config.data, chart);
                         indicatorSeries.set(id, elements);
-                        console.log('✅ 覆盖层指标已渲染:', config.name, '- 生成', config.data.length, '个区域');
+                        console.log('✅ 覆盖层指标已渲染:', config.name, '- 生成', blockCount, '个区域');
                     }
                 } else if (config.renderFunction === 'renderVolumeProfilePivot') {
                     if (!config.data || (config.data.profiles && config.data.profiles.length === 0)) {
@@ -1938,19 +2160,17 @@ class IndicatorPoolMixin:
                     console.log('✅ [启用指标] 背离检测渲染完成');
                 } else if (config.renderFunction === 'renderSmartMoneyConcepts') {
                     console.log('🎯 [启用指标] 聪明钱概念');
-                    const elements = renderSmartMoneyConcepts(config.data, chart);
-                    indicatorSeries.set(id, elements);
-                    console.log('✅ [启用指标] 聪明钱概念渲染完成');
+                    // 先占位（防止重复启用），下一帧渲染后替换为实际系列
+                    indicatorSeries.set(id, []);
+                    scheduleRender(id, () => renderSmartMoneyConcepts(config.data, chart));
                 } else if (config.renderFunction === 'renderSupportResistanceChannels') {
                     console.log('🎯 [启用指标] 支撑阻力通道');
-                    const elements = renderSupportResistanceChannels(config.data, chart);
-                    indicatorSeries.set(id, elements);
-                    console.log('✅ [启用指标] 支撑阻力通道渲染完成');
+                    indicatorSeries.set(id, []);
+                    scheduleRenderAfterCalculation(id, config, () => renderSupportResistanceChannels(config.data, chart));
                 } else if (config.renderFunction === 'renderZigZag') {
                     console.log('🎯 [启用指标] 价格轨迹');
-                    const elements = renderZigZag(config.data, chart);
-                    indicatorSeries.set(id, elements);
-                    console.log('✅ [启用指标] 价格轨迹渲染完成');
+                    indicatorSeries.set(id, []);
+                    scheduleRenderAfterCalculation(id, config, () => renderZigZag(config.data, chart));
                 } else if (config.renderFunction === 'renderHarmonicPatterns') {
                     console.log('🎯 [启用指标] 谐波形态识别');
                     const elements = renderHarmonicPatterns(config.data, chart);
@@ -1970,9 +2190,10 @@ class IndicatorPoolMixin:
                 // overlay类型指标没有渲染函数，仅标记为已启用
                 console.log('⚠️ 覆盖层指标无渲染函数:', config.name);
                 indicatorSeries.set(id, 'overlay');
-            } else if (config.data && (Array.isArray(config.data) ? config.data.length > 0 : true)) {
+            } else if (hasIndicatorData(config.data)) {
                 if (config.renderType === 'line') {
-                    console.log('添加线条指标:', config.name, '颜色:', config.color, '数据点:', config.data.length);
+                    const lineData = lineSeriesData(config.data);
+                    console.log('添加线条指标:', config.name, '颜色:', config.color, '数据点:', lineData.length);
                     const series = chart.addLineSeries({
                         color: config.color || '#888888',
                         lineWidth: 2,
@@ -1980,7 +2201,7 @@ class IndicatorPoolMixin:
                         priceLineVisible: false,
                         lastValueVisible: false,
                     });
-                    series.setData(config.data);
+                    series.setData(lineData);
                     indicatorSeries.set(id, series);
                     console.log('✅ 指标已添加到图表:', config.name);
                 }
@@ -2007,6 +2228,9 @@ class IndicatorPoolMixin:
                 console.log('禁用复合指标:', config.name);
                 config.subIndicators.forEach(subId => disableIndicator(subId, false));
             } else if (config.renderType === 'overlay') {
+                // 尚未执行的延迟渲染直接取消
+                cancelScheduledRender(id);
+                
                 // overlay类型指标需要移除DOM元素或系列
                 const elements = indicatorSeries.get(id);
                 if (elements && Array.isArray(elements)) {
@@ -2051,7 +2275,8 @@ class IndicatorPoolMixin:
                         const zzMarkers = window.zzMarkers || [];
                         const harmonicMarkers = window.harmonicMarkers || [];
                         
-                        // 清除SMC标签数据
+                        // 清除SMC标签数据（包括尚未写入的）
+                        cancelQueuedMarkers('smc');
                         window.smcMarkers = {
                             structure: [],
                             internal: [],
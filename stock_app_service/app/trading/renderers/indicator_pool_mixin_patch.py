@@ -47,7 +47,7 @@ def _generate_indicator_metadata_only(cls, df: pd.DataFrame = None) -> Dict[str,
             'renderType': indicator_def.render_type,
             'enabled': indicator_def.enabled_by_default,
             'color': indicator_def.color,
-            'params': indicator_def.default_params
+            'params': dict(indicator_def.default_params)
         }
         
         # 智能选择计算方式
@@ -63,7 +63,7 @@ def _generate_indicator_metadata_only(cls, df: pd.DataFrame = None) -> Dict[str,
                 
                 # 转换为JS格式
                 js_data = IndicatorAutoRenderer.prepare_indicator_data_for_js(
-                    indicator_id, calculated_data, df
+                    indicator_id, calculated_data, df, indicator_def
                 )
                 config['data'] = js_data
                 
@@ -79,11 +79,11 @@ def _generate_indicator_metadata_only(cls, df: pd.DataFrame = None) -> Dict[str,
         # 如果是复合指标
         if indicator_def.is_composite:
             config['isComposite'] = True
-            config['subIndicators'] = indicator_def.sub_indicators
+            config['subIndicators'] = list(indicator_def.sub_indicators)
         
         # 如果有render_config
         if indicator_def.render_config:
-            config['renderConfig'] = indicator_def.render_config
+            config['renderConfig'] = dict(indicator_def.render_config)
             if 'render_function' in indicator_def.render_config:
                 config['renderFunction'] = indicator_def.render_config['render_function']
         
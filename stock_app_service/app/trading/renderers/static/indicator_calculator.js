@@ -62,6 +62,36 @@ function calculateSMA(data, period) {
     return result;
 }
 
+/**
+ * 按左右窗口极值查找Pivot点（单调队列求滑动极值，O(n)）
+ * 
+ * 中心点严格大于（小于）左侧 leftBars 根和右侧 rightBars 根K线时为Pivot：
+ * 左侧窗口 [i-leftBars, i-1] 的极值为 leftExt[i - leftBars]，
+ * 右侧窗口 [i+1, i+rightBars] 的极值为 rightExt[i + 1]
+ * 
+ * @param {Array<number>} values - 最高价或最低价序列
+ * @param {number} leftBars - 左侧K线数量
+ * @param {number} rightBars - 右侧K线数量
+ * @param {boolean} isHigh - true找高点，false找低点
+ * @returns {Array<{index: number, price: number}>}
+ */
+function findPivotsLeftRight(values, leftBars, rightBars, isHigh) {
+    const pivots = [];
+    const n = values.length;
+    const leftExt = leftBars > 0 ? slidingWindowExtreme(values, leftBars, isHigh) : null;
+    const rightExt = rightBars > 0 ? slidingWindowExtreme(values, rightBars, isHigh) : null;
+    
+    for (let i = leftBars; i < n - rightBars; i++) {
+        const center = values[i];
+        // 与逐根比较一致：任一侧存在 >=（<=）中心点的K线则不是Pivot
+        if (leftExt !== null && !(isHigh ? leftExt[i - leftBars] < center : leftExt[i - leftBars] > center)) continue;
+        if (rightExt !== null && !(isHigh ? rightExt[i + 1] < center : rightExt[i + 1] > center)) continue;
+        pivots.push({ index: i, price: center });
+    }
+    
+    return pivots;
+}
+
 /**
  * 找到Pivot High点
  * @param {Array} candleData - K线数据
@@ -70,36 +100,7 @@ function calculateSMA(data, period) {
  * @returns {Array<{index: number, price: number}>} Pivot High点数组
  */
 function findPivotHighs(candleData, leftBars, rightBars) {
-    const pivotHighs = [];
-    
-    for (let i = leftBars; i < candleData.length - rightBars; i++) {
-        const centerHigh = candleData[i].high;
-        let isPivot = true;
-        
-        // 检查左侧
-        for (let j = i - leftBars; j < i; j++) {
-            if (candleData[j].high >= centerHigh) {
-                isPivot = false;
-                break;
-            }
-        }
-        
-        if (!isPivot) continue;
-        
-        // 检查右侧
-        for (let j = i + 1; j <= i + rightBars; j++) {
-            if (candleData[j].high >= centerHigh) {
-                isPivot = false;
-                break;
-            }
-        }
-        
-        if (isPivot) {
-            pivotHighs.push({ index: i, price: centerHigh });
-        }
-    }
-    
-    return pivotHighs;
+    return findPivotsLeftRight(candleData.map(d => d.high), leftBars, rightBars, true);
 }
 
 /**
@@ -110,36 +111,36 @@ function findPivotHighs(candleData, leftBars, rightBars) {
  * @returns {Array<{index: number, price: number}>} Pivot Low点数组
  */
 function findPivotLows(candleData, leftBars, rightBars) {
-    const pivotLows = [];
-    
-    for (let i = leftBars; i < candleData.length - rightBars; i++) {
-        const centerLow = candleData[i].low;
-        let isPivot = true;
-        
-        // 检查左侧
-        for (let j = i - leftBars; j < i; j++) {
-            if (candleData[j].low <= centerLow) {
-                isPivot = false;
-                break;
-            }
-        }
-        
-        if (!isPivot) continue;
-        
-        // 检查右侧
-        for (let j = i + 1; j <= i + rightBars; j++) {
-            if (candleData[j].low <= centerLow) {
-                isPivot = false;
-                break;
-            }
-        }
-        
-        if (isPivot) {
-            pivotLows.push({ index: i, price: centerLow });
+    return findPivotsLeftRight(candleData.map(d => d.low), leftBars, rightBars, false);
+}
+
+/**
+ * 按下标归并高点和低点Pivot（两组输入均按下标升序）
+ * 
+ * 下标相同时高点在前（与稳定排序的结果一致）。
+ * @returns {Array<{index: number, price: number, type: string}>}
+ */
+function mergePivots(pivotHighs, pivotLows) {
+    const merged = new Array(pivotHighs.length + pivotLows.length);
+    let h = 0;
+    let l = 0;
+    let k = 0;
+    while (h < pivotHighs.length && l < pivotLows.length) {
+        if (pivotHighs[h].index <= pivotLows[l].index) {
+            merged[k++] = { index: pivotHighs[h].index, price: pivotHighs[h].price, type: 'high' };
+            h++;
+        } else {
+            merged[k++] = { index: pivotLows[l].index, price: pivotLows[l].price, type: 'low' };
+            l++;
         }
     }
-    
-    return pivotLows;
+    for (; h < pivotHighs.length; h++) {
+        merged[k++] = { index: pivotHighs[h].index, price: pivotHighs[h].price, type: 'high' };
+    }
+    for (; l < pivotLows.length; l++) {
+        merged[k++] = { index: pivotLows[l].index, price: pivotLows[l].price, type: 'low' };
+    }
+    return merged;
 }
 
 // ============================================================================
@@ -256,11 +257,8 @@ function calculatePivotOrderBlocks(candleData, params = {}) {
     const pivotHighs = findPivotHighs(candleData, left, right);
     const pivotLows = findPivotLows(candleData, left, right);
     
-    // 合并并排序
-    const allPivots = [
-        ...pivotHighs.map(p => ({ ...p, type: 'high' })),
-        ...pivotLows.map(p => ({ ...p, type: 'low' }))
-    ].sort((a, b) => a.index - b.index);
+    // 合并（两组pivot均已按下标有序，线性归并即可）
+    const allPivots = mergePivots(pivotHighs, pivotLows);
     
     if (allPivots.length < 2) {
         return [];
@@ -349,6 +347,25 @@ function findSupportBlock(candleData, pivotIdx) {
     return [candle.high, candle.low];
 }
 
+/**
+ * 一次性提取K线的最高价、最低价和成交量数组
+ * @param {Array} candleData - K线数据
+ * @returns {{highs: Float64Array, lows: Float64Array, volumes: Float64Array}}
+ */
+function extractPriceArrays(candleData) {
+    const n = candleData.length;
+    const highs = new Float64Array(n);
+    const lows = new Float64Array(n);
+    const volumes = new Float64Array(n);
+    for (let i = 0; i < n; i++) {
+        const candle = candleData[i];
+        highs[i] = candle.high;
+        lows[i] = candle.low;
+        volumes[i] = candle.volume;
+    }
+    return { highs, lows, volumes };
+}
+
 /**
  * 计算成交量分布（Volume Profile Pivot Anchored）
  * @param {Array} candleData - K线数据
@@ -367,15 +384,15 @@ function calculateVolumeProfile(candleData, params = {}) {
         return [];
     }
     
+    // 价格/成交量数组只提取一次，pivot检测和各区间profile共用
+    const bars = extractPriceArrays(candleData);
+    
     // 找到Pivot点
-    const pivotHighs = findPivotHighs(candleData, pivot_length, pivot_length);
-    const pivotLows = findPivotLows(candleData, pivot_length, pivot_length);
+    const pivotHighs = findPivotsLeftRight(bars.highs, pivot_length, pivot_length, true);
+    const pivotLows = findPivotsLeftRight(bars.lows, pivot_length, pivot_length, false);
     
-    // 合并并排序
-    const allPivots = [
-        ...pivotHighs.map(p => ({ ...p, type: 'high' })),
-        ...pivotLows.map(p => ({ ...p, type: 'low' }))
-    ].sort((a, b) => a.index - b.index);
+    // 合并（两组pivot均已按下标有序，线性归并即可）
+    const allPivots = mergePivots(pivotHighs, pivotLows);
     
     if (allPivots.length < 2) {
         return [];
@@ -390,8 +407,9 @@ function calculateVolumeProfile(candleData, params = {}) {
         
         if (startIdx < 0 || endIdx >= candleData.length) continue;
         
+        // 已完成的区间在新K线到来时不会变化，走缓存
         const profile = calculateProfileForRange(
-            candleData, startIdx, endIdx, profile_levels, value_area_percent, profile_width
+            candleData, bars, startIdx, endIdx, profile_levels, value_area_percent, profile_width, true
         );
         
         if (profile) {
@@ -406,7 +424,7 @@ function calculateVolumeProfile(candleData, params = {}) {
         
         if (startIdx >= 0 && endIdx - startIdx > 0) {
             const profile = calculateProfileForRange(
-                candleData, startIdx, endIdx, profile_levels, value_area_percent, profile_width
+                candleData, bars, startIdx, endIdx, profile_levels, value_area_percent, profile_width
             );
             if (profile) {
                 profile.is_developing = true;
@@ -419,104 +437,184 @@ function calculateVolumeProfile(candleData, params = {}) {
 }
 
 /**
- * 为指定区间计算Volume Profile
+ * 成交量分布内核：将区间 [startIdx, endIdx] 内各K线的成交量分配到价格级别
+ * 
+ * 只接收 Float64Array，保持函数单态以便JS引擎优化为紧凑的数值循环。
+ * 
+ * @returns {Float64Array} 长度为 profileLevels + 1 的各级别成交量
  */
-function calculateProfileForRange(candleData, startIdx, endIdx, profileLevels, valueAreaPercent, profileWidth) {
-    if (startIdx < 0 || endIdx >= candleData.length || startIdx >= endIdx) {
-        return null;
-    }
-    
-    const rangeData = candleData.slice(startIdx, endIdx + 1);
+function accumulateProfileVolumes(highs, lows, volumes, startIdx, endIdx, priceLow, priceStep, profileLevels) {
+    const volumeStorage = new Float64Array(profileLevels + 1);
+    // 级别定位用乘法估算，随后的精确比较会修正舍入误差
+    const invStep = 1 / priceStep;
     
-    // 获取价格范围
-    const priceHigh = Math.max(...rangeData.map(d => d.high));
-    const priceLow = Math.min(...rangeData.map(d => d.low));
-    const totalVolume = rangeData.reduce((sum, d) => sum + d.volume, 0);
-    
-    if (priceHigh <= priceLow) return null;
-    
-    const priceStep = (priceHigh - priceLow) / profileLevels;
-    if (priceStep <= 0) return null;
-    
-    // 初始化成交量数组
-    const volumeStorage = new Array(profileLevels + 1).fill(0);
-    
-    // 分配成交量到各价格级别
-    for (const candle of rangeData) {
-        const barHigh = candle.high;
-        const barLow = candle.low;
-        const barVolume = candle.volume;
+    for (let i = startIdx; i <= endIdx; i++) {
+        const barHigh = highs[i];
+        const barLow = lows[i];
+        const barVolume = volumes[i];
         
         if (!barVolume || barVolume <= 0) continue;
         
-        for (let level = 0; level < profileLevels; level++) {
-            const levelLow = priceLow + level * priceStep;
-            const levelHigh = priceLow + (level + 1) * priceStep;
-            
-            // K线与该级别有交集
-            if (barHigh >= levelLow && barLow < levelHigh) {
-                const volumePortion = barHigh > barLow 
-                    ? barVolume * priceStep / (barHigh - barLow)
-                    : barVolume;
-                volumeStorage[level] += volumePortion;
-            }
+        // K线与某级别有交集的条件（barHigh >= levelLow && barLow < levelHigh）对级别单调，
+        // 有交集的级别是连续区间，直接定位区间首尾，不再逐级别判断
+        let first = Math.max(0, Math.floor((barLow - priceLow) * invStep));
+        while (first > 0 && barLow < priceLow + first * priceStep) first--;
+        while (first < profileLevels && !(barLow < priceLow + (first + 1) * priceStep)) first++;
+        
+        let last = Math.min(profileLevels - 1, Math.floor((barHigh - priceLow) * invStep));
+        while (last < profileLevels - 1 && barHigh >= priceLow + (last + 1) * priceStep) last++;
+        while (last >= 0 && !(barHigh >= priceLow + last * priceStep)) last--;
+        
+        if (first > last) continue;
+        
+        const volumePortion = barHigh > barLow 
+            ? barVolume * priceStep / (barHigh - barLow)
+            : barVolume;
+        
+        // 快速路径：K线落在单个级别内（窄幅K线的常见情况）
+        if (first === last) {
+            volumeStorage[first] += volumePortion;
+            continue;
+        }
+        for (let level = first; level <= last; level++) {
+            volumeStorage[level] += volumePortion;
         }
     }
     
-    // 找到POC
-    const pocLevel = volumeStorage.indexOf(Math.max(...volumeStorage));
-    const pocPrice = priceLow + (pocLevel + 0.5) * priceStep;
-    
-    // 计算Value Area
-    const targetVolume = volumeStorage.reduce((a, b) => a + b, 0) * (valueAreaPercent / 100);
+    return volumeStorage;
+}
+
+/**
+ * 从POC向两侧扩展Value Area（双指针，每步取相邻两侧中成交量较大的一侧）
+ * 
+ * @returns {[number, number]} [Value Area下沿级别, Value Area上沿级别]
+ */
+function expandValueArea(volumeStorage, pocLevel, profileLevels, targetVolume) {
     let valueAreaVolume = volumeStorage[pocLevel];
-    let levelAbovePoc = pocLevel;
-    let levelBelowPoc = pocLevel;
+    let above = pocLevel;
+    let below = pocLevel;
+    const topLevel = profileLevels - 1;
     
-    while (valueAreaVolume < targetVolume && (levelAbovePoc < profileLevels - 1 || levelBelowPoc > 0)) {
-        const volumeAbove = levelAbovePoc < profileLevels - 1 ? volumeStorage[levelAbovePoc + 1] : 0;
-        const volumeBelow = levelBelowPoc > 0 ? volumeStorage[levelBelowPoc - 1] : 0;
+    while (valueAreaVolume < targetVolume && (above < topLevel || below > 0)) {
+        const volumeAbove = above < topLevel ? volumeStorage[above + 1] : 0;
+        const volumeBelow = below > 0 ? volumeStorage[below - 1] : 0;
         
         if (volumeAbove === 0 && volumeBelow === 0) break;
         
         if (volumeAbove >= volumeBelow) {
             valueAreaVolume += volumeAbove;
-            levelAbovePoc++;
+            above++;
         } else {
             valueAreaVolume += volumeBelow;
-            levelBelowPoc--;
+            below--;
+        }
+    }
+    
+    return [below, above];
+}
+
+// 已完成区间的profile缓存（LRU，Map按插入顺序淘汰最旧项）
+// 新K线到来时只有最后一个（发展中的）区间需要重新计算
+const PROFILE_SEGMENT_CACHE_SIZE = 256;
+const PROFILE_SEGMENT_CACHE = new Map();
+
+/**
+ * 为指定区间计算Volume Profile
+ * 
+ * @param {Array} candleData - K线数据（用于取时间）
+ * @param {{highs: Float64Array, lows: Float64Array, volumes: Float64Array}} bars - extractPriceArrays 的结果
+ * @param {boolean} useCache - 是否使用区间缓存（仅用于已完成的区间，结果对象会被复用，调用方不应修改）
+ */
+function calculateProfileForRange(candleData, bars, startIdx, endIdx, profileLevels, valueAreaPercent, profileWidth, useCache = false) {
+    if (startIdx < 0 || endIdx >= candleData.length || startIdx >= endIdx) {
+        return null;
+    }
+    
+    const { highs, lows, volumes } = bars;
+    
+    // 获取价格范围和总成交量
+    let priceHigh = -Infinity;
+    let priceLow = Infinity;
+    let totalVolume = 0;
+    for (let i = startIdx; i <= endIdx; i++) {
+        priceHigh = Math.max(priceHigh, highs[i]);
+        priceLow = Math.min(priceLow, lows[i]);
+        totalVolume += volumes[i];
+    }
+    
+    if (priceHigh <= priceLow) return null;
+    
+    const priceStep = (priceHigh - priceLow) / profileLevels;
+    if (priceStep <= 0) return null;
+    
+    // 区间位置、起止时间、价格范围和总成交量相同即视为同一区间（数据指纹），参数也需一致
+    let cacheKey = null;
+    if (useCache) {
+        cacheKey = `${startIdx}|${endIdx}|${candleData[startIdx].time}|${candleData[endIdx].time}|` +
+                   `${priceHigh}|${priceLow}|${totalVolume}|${profileLevels}|${valueAreaPercent}|${profileWidth}`;
+        const cached = PROFILE_SEGMENT_CACHE.get(cacheKey);
+        if (cached !== undefined) {
+            // 移到末尾，保持LRU顺序
+            PROFILE_SEGMENT_CACHE.delete(cacheKey);
+            PROFILE_SEGMENT_CACHE.set(cacheKey, cached);
+            return cached;
         }
     }
     
+    // 分配成交量到各价格级别
+    const volumeStorage = accumulateProfileVolumes(
+        highs, lows, volumes, startIdx, endIdx, priceLow, priceStep, profileLevels
+    );
+    
+    // 一次遍历同时得到POC（首个最大值位置）、最大成交量和总成交量
+    let pocLevel = 0;
+    let maxVolume = volumeStorage[0];
+    let storedVolume = 0;
+    for (let level = 0; level < volumeStorage.length; level++) {
+        const v = volumeStorage[level];
+        if (v > maxVolume) {
+            maxVolume = v;
+            pocLevel = level;
+        }
+        storedVolume += v;
+    }
+    const pocPrice = priceLow + (pocLevel + 0.5) * priceStep;
+    
+    // 计算Value Area
+    const targetVolume = storedVolume * (valueAreaPercent / 100);
+    const [levelBelowPoc, levelAbovePoc] = expandValueArea(volumeStorage, pocLevel, profileLevels, targetVolume);
+    
     const vahPrice = priceLow + (levelAbovePoc + 1.0) * priceStep;
     const valPrice = priceLow + levelBelowPoc * priceStep;
     
-    // 构建profile数据
-    const maxVolume = Math.max(...volumeStorage);
-    const profileData = [];
-    
-    for (let level = 0; level < profileLevels; level++) {
-        const volumePercent = maxVolume > 0 ? volumeStorage[level] / maxVolume : 0;
-        
-        profileData.push({
-            level: level,
-            price_low: priceLow + level * priceStep,
-            price_high: priceLow + (level + 1) * priceStep,
-            price_mid: priceLow + (level + 0.5) * priceStep,
-            volume: volumeStorage[level],
-            volume_percent: volumePercent,
-            in_value_area: levelBelowPoc <= level && level <= levelAbovePoc,
-            is_poc: level === pocLevel
-        });
+    // 构建profile数据（列式存储：每个字段一个定长数组，按级别下标访问）
+    // 各级别价格由 price_low + level * price_step 确定，不再逐级别存储价格
+    const levelVolumes = volumeStorage.subarray(0, profileLevels);
+    const volumePercents = new Float64Array(profileLevels);
+    
+    if (maxVolume > 0) {
+        for (let level = 0; level < profileLevels; level++) {
+            volumePercents[level] = volumeStorage[level] / maxVolume;
+        }
     }
     
-    return {
+    // Value Area 为 [value_area_low_level, value_area_high_level] 闭区间，POC为 poc_level
+    const profileData = {
+        volume: levelVolumes,
+        volume_percent: volumePercents,
+        poc_level: pocLevel,
+        value_area_low_level: levelBelowPoc,
+        value_area_high_level: levelAbovePoc
+    };
+    
+    const profile = {
         start_time: candleData[startIdx].time,
         end_time: candleData[endIdx].time,
         start_index: startIdx,
         end_index: endIdx,
         price_high: priceHigh,
         price_low: priceLow,
+        price_step: priceStep,
         poc_price: pocPrice,
         vah_price: vahPrice,
         val_price: valPrice,
@@ -526,6 +624,15 @@ function calculateProfileForRange(candleData, startIdx, endIdx, profileLevels, v
         profile_data: profileData,
         is_developing: false
     };
+    
+    if (cacheKey !== null) {
+        PROFILE_SEGMENT_CACHE.set(cacheKey, profile);
+        if (PROFILE_SEGMENT_CACHE.size > PROFILE_SEGMENT_CACHE_SIZE) {
+            PROFILE_SEGMENT_CACHE.delete(PROFILE_SEGMENT_CACHE.keys().next().value);
+        }
+    }
+    
+    return profile;
 }
 
 // ============================================================================
@@ -728,21 +835,32 @@ function calculateStochastic(candleData, period = 14) {
  * 计算CCI (Commodity Channel Index)
  */
 function calculateCCI(candleData, period = 10) {
-    const cci = new Array(candleData.length).fill(NaN);
+    const n = candleData.length;
+    const cci = new Array(n).fill(NaN);
     
-    for (let i = period - 1; i < candleData.length; i++) {
-        // Calculate typical price
-        const tpValues = [];
-        for (let j = i - period + 1; j <= i; j++) {
-            const tp = (candleData[j].high + candleData[j].low + candleData[j].close) / 3;
-            tpValues.push(tp);
-        }
+    // Typical price只计算一次，窗口内直接按下标读取，不再为每个窗口分配数组
+    const tp = new Float64Array(n);
+    for (let i = 0; i < n; i++) {
+        const bar = candleData[i];
+        tp[i] = (bar.high + bar.low + bar.close) / 3;
+    }
+    
+    for (let i = period - 1; i < n; i++) {
+        const start = i - period + 1;
         
-        const smaTp = tpValues.reduce((a, b) => a + b, 0) / period;
-        const currentTp = tpValues[tpValues.length - 1];
+        let sum = 0;
+        for (let j = start; j <= i; j++) {
+            sum += tp[j];
+        }
+        const smaTp = sum / period;
+        const currentTp = tp[i];
         
         // Calculate mean absolute deviation
-        const mad = tpValues.reduce((sum, val) => sum + Math.abs(val - smaTp), 0) / period;
+        let deviation = 0;
+        for (let j = start; j <= i; j++) {
+            deviation += Math.abs(tp[j] - smaTp);
+        }
+        const mad = deviation / period;
         
         if (mad !== 0) {
             cci[i] = (currentTp - smaTp) / (0.015 * mad);
@@ -769,17 +887,24 @@ function calculateMomentum(closes, period = 10) {
  * 计算OBV (On-Balance Volume)
  */
 function calculateOBV(candleData) {
-    const obv = new Array(candleData.length);
-    obv[0] = candleData[0].volume;
+    const n = candleData.length;
+    const obv = new Float64Array(n);
+    if (n === 0) return obv;
     
-    for (let i = 1; i < candleData.length; i++) {
-        if (candleData[i].close > candleData[i - 1].close) {
-            obv[i] = obv[i - 1] + candleData[i].volume;
-        } else if (candleData[i].close < candleData[i - 1].close) {
-            obv[i] = obv[i - 1] - candleData[i].volume;
-        } else {
-            obv[i] = obv[i - 1];
+    let prevClose = candleData[0].close;
+    let acc = candleData[0].volume;
+    obv[0] = acc;
+    
+    for (let i = 1; i < n; i++) {
+        const bar = candleData[i];
+        const close = bar.close;
+        if (close > prevClose) {
+            acc += bar.volume;
+        } else if (close < prevClose) {
+            acc -= bar.volume;
         }
+        obv[i] = acc;
+        prevClose = close;
     }
     
     return obv;
@@ -820,21 +945,44 @@ function calculateCMF(candleData, period = 21) {
  * 计算MFI (Money Flow Index)
  */
 function calculateMFI(candleData, period = 14) {
-    const mfi = new Array(candleData.length).fill(NaN);
-    const typicalPrice = candleData.map(d => (d.high + d.low + d.close) / 3);
-    const moneyFlow = candleData.map((d, i) => typicalPrice[i] * d.volume);
+    const n = candleData.length;
+    const mfi = new Array(n).fill(NaN);
     
-    for (let i = period; i < candleData.length; i++) {
-        let positiveFlow = 0;
-        let negativeFlow = 0;
+    // 一次遍历把每根K线的资金流归入正向或负向
+    const positive = new Float64Array(n);
+    const negative = new Float64Array(n);
+    let prevTp = n > 0 ? (candleData[0].high + candleData[0].low + candleData[0].close) / 3 : 0;
+    for (let i = 1; i < n; i++) {
+        const bar = candleData[i];
+        const tp = (bar.high + bar.low + bar.close) / 3;
+        if (tp > prevTp) {
+            positive[i] = tp * bar.volume;
+        } else if (tp < prevTp) {
+            negative[i] = tp * bar.volume;
+        }
+        prevTp = tp;
+    }
+    
+    // 滑动窗口累加：每根K线只进出窗口各一次
+    // 同时统计窗口内非零项个数，个数为0时直接置0，避免浮点残差影响 === 0 判断
+    let positiveFlow = 0;
+    let negativeFlow = 0;
+    let positiveCount = 0;
+    let negativeCount = 0;
+    
+    for (let i = 1; i < n; i++) {
+        if (positive[i] !== 0) { positiveFlow += positive[i]; positiveCount++; }
+        if (negative[i] !== 0) { negativeFlow += negative[i]; negativeCount++; }
         
-        for (let j = i - period + 1; j <= i; j++) {
-            if (typicalPrice[j] > typicalPrice[j - 1]) {
-                positiveFlow += moneyFlow[j];
-            } else if (typicalPrice[j] < typicalPrice[j - 1]) {
-                negativeFlow += moneyFlow[j];
-            }
+        const out = i - period;
+        if (out >= 1) {
+            if (positive[out] !== 0) { positiveFlow -= positive[out]; positiveCount--; }
+            if (negative[out] !== 0) { negativeFlow -= negative[out]; negativeCount--; }
         }
+        if (positiveCount === 0) positiveFlow = 0;
+        if (negativeCount === 0) negativeFlow = 0;
+        
+        if (i < period) continue;
         
         if (negativeFlow === 0) {
             mfi[i] = 100;
@@ -883,72 +1031,55 @@ function calculateVWMACD(candleData) {
 // ============================================================================
 
 /**
- * 找到价格Pivot High点（✅ 修复版 - 与Python一致）
+ * 滑动窗口最大/最小值（单调队列，O(n)）
+ * 
+ * @param {Array<number>} values - 数据
+ * @param {number} size - 窗口大小
+ * @param {boolean} isMax - true取最大值，false取最小值
+ * @returns {Float64Array} 长度为 n - size + 1，第k项为 values[k..k+size-1] 的极值
  */
-function findPricePivotHighs(candleData, period) {
-    const pivots = [];
+function slidingWindowExtreme(values, size, isMax) {
+    const n = values.length;
+    const out = new Float64Array(Math.max(0, n - size + 1));
+    const deque = new Int32Array(n);
+    let head = 0;
+    let tail = 0;
     
-    for (let i = period; i < candleData.length - period; i++) {
-        const currentHigh = candleData[i].high;
-        let isPivot = true;
-        
-        // ✅ 修复：检查左边（从1开始，不包括中心点）
-        for (let j = 1; j <= period; j++) {
-            if (candleData[i - j].high >= currentHigh) {
-                isPivot = false;
-                break;
-            }
+    for (let i = 0; i < n; i++) {
+        const v = values[i];
+        // 弹出不可能再成为极值的元素
+        while (tail > head && (isMax ? values[deque[tail - 1]] <= v : values[deque[tail - 1]] >= v)) {
+            tail--;
         }
-        
-        if (!isPivot) continue;
-        
-        // ✅ 修复：检查右边（从1开始，不包括中心点）
-        for (let j = 1; j <= period; j++) {
-            if (candleData[i + j].high >= currentHigh) {
-                isPivot = false;
-                break;
-            }
+        deque[tail++] = i;
+        // 移出窗口左侧的元素
+        if (deque[head] <= i - size) {
+            head++;
         }
-        
-        if (isPivot) {
-            pivots.push({ index: i, price: currentHigh });
+        if (i >= size - 1) {
+            out[i - size + 1] = values[deque[head]];
         }
     }
     
-    // ✅ 修复：只保留最近20个
-    return pivots.slice(-20);
+    return out;
 }
 
 /**
- * 找到价格Pivot Low点（✅ 修复版 - 与Python一致）
+ * 按左右两侧窗口极值查找Pivot点
+ * 
+ * 中心点严格大于（小于）左右各 period 根K线时为Pivot，
+ * 左侧极值为 extreme[i - period]，右侧极值为 extreme[i + 1]
  */
-function findPricePivotLows(candleData, period) {
+function findPricePivots(values, period, isHigh) {
     const pivots = [];
+    const extreme = slidingWindowExtreme(values, period, isHigh);
     
-    for (let i = period; i < candleData.length - period; i++) {
-        const currentLow = candleData[i].low;
-        let isPivot = true;
-        
-        // ✅ 修复：检查左边（从1开始，不包括中心点）
-        for (let j = 1; j <= period; j++) {
-            if (candleData[i - j].low <= currentLow) {
-                isPivot = false;
-                break;
-            }
-        }
-        
-        if (!isPivot) continue;
-        
-        // ✅ 修复：检查右边（从1开始，不包括中心点）
-        for (let j = 1; j <= period; j++) {
-            if (candleData[i + j].low <= currentLow) {
-                isPivot = false;
-                break;
-            }
-        }
-        
-        if (isPivot) {
-            pivots.push({ index: i, price: currentLow });
+    for (let i = period; i < values.length - period; i++) {
+        const current = values[i];
+        if (isHigh
+            ? (extreme[i - period] < current && extreme[i + 1] < current)
+            : (extreme[i - period] > current && extreme[i + 1] > current)) {
+            pivots.push({ index: i, price: current });
         }
     }
     
@@ -956,146 +1087,132 @@ function findPricePivotLows(candleData, period) {
     return pivots.slice(-20);
 }
 
+/**
+ * 找到价格Pivot High点（✅ 修复版 - 与Python一致）
+ */
+function findPricePivotHighs(candleData, period) {
+    return findPricePivots(candleData.map(d => d.high), period, true);
+}
+
+/**
+ * 找到价格Pivot Low点（✅ 修复版 - 与Python一致）
+ */
+function findPricePivotLows(candleData, period) {
+    return findPricePivots(candleData.map(d => d.low), period, false);
+}
+
 // ============================================================================
 // 背离检测（✅ 修复版 - 与Python完全一致）
 // ============================================================================
 
 /**
- * 检测正常背离（✅ 修复版）
+ * 取出pivot点对应的指标值（每个指标只做一次下标查找）
+ */
+function pivotIndicatorValues(indicatorValues, pivots) {
+    const values = new Float64Array(pivots.length);
+    for (let k = 0; k < pivots.length; k++) {
+        const v = indicatorValues[pivots[k].index];
+        values[k] = (v === undefined || v === null) ? NaN : v;
+    }
+    return values;
+}
+
+/**
+ * 在同一侧pivot上一次遍历同时检测正常背离和隐藏背离
  * 
- * 关键修复：
+ * 与分开检测的结果一致：
  * 1. ✅ 从最近的pivot往前查找（与Python一致）
- * 2. ✅ 每个方向只取最近的一个背离（break）
+ * 2. ✅ 每种背离只取最近的一个
  * 3. ✅ 直接使用价格pivot点对应的指标值（不单独检测指标pivot）
+ * 
+ * isLow=true 时检测看涨（价格新低、指标未新低）和隐藏看涨（价格未新低、指标新低），
+ * isLow=false 时检测看跌和隐藏看跌。
+ * 
+ * @returns {{regular: object|null, hidden: object|null}}
  */
-function detectRegularDivergences(candleData, indicatorValues, pricePivotHighs, pricePivotLows, 
-                                 maxPivotPoints, maxBars, indicatorName) {
-    const divergences = [];
-    const currentIdx = candleData.length - 1;
-    
-    // ✅ 检测看涨背离（Bullish）- 从最近往前找
-    if (pricePivotLows.length >= 2) {
-        for (let i = 0; i < Math.min(maxPivotPoints, pricePivotLows.length - 1); i++) {
-            // ✅ 修复：从最近往前取（pivot_lows[-(i+1)]）
-            const pivot1 = pricePivotLows[pricePivotLows.length - 1 - i];      // 最近的
-            const pivot2 = pricePivotLows[pricePivotLows.length - 1 - i - 1];  // 次近的
-            
-            if (currentIdx - pivot1.index > maxBars) {
-                break;
-            }
-            
-            // ✅ 价格创新低，但指标未创新低
-            const ind1 = indicatorValues[pivot1.index];
-            const ind2 = indicatorValues[pivot2.index];
-            
-            if (!isNaN(ind1) && !isNaN(ind2) && pivot1.price < pivot2.price && ind1 > ind2) {
-                divergences.push({
-                    type: 'bullish',
-                    indicator: indicatorName,
-                    start_index: pivot2.index,
-                    end_index: pivot1.index,
-                    start_price: pivot2.price,
-                    end_price: pivot1.price,
-                    start_ind_value: ind2,
-                    end_ind_value: ind1
-                });
-                break;  // ✅ 修复：每个方向只取最近的一个
-            }
-        }
-    }
-    
-    // ✅ 检测看跌背离（Bearish）- 从最近往前找
-    if (pricePivotHighs.length >= 2) {
-        for (let i = 0; i < Math.min(maxPivotPoints, pricePivotHighs.length - 1); i++) {
-            // ✅ 修复：从最近往前取（pivot_highs[-(i+1)]）
-            const pivot1 = pricePivotHighs[pricePivotHighs.length - 1 - i];      // 最近的
-            const pivot2 = pricePivotHighs[pricePivotHighs.length - 1 - i - 1];  // 次近的
-            
-            if (currentIdx - pivot1.index > maxBars) {
-                break;
-            }
-            
-            // ✅ 价格创新高，但指标未创新高
-            const ind1 = indicatorValues[pivot1.index];
-            const ind2 = indicatorValues[pivot2.index];
-            
-            if (!isNaN(ind1) && !isNaN(ind2) && pivot1.price > pivot2.price && ind1 < ind2) {
-                divergences.push({
-                    type: 'bearish',
-                    indicator: indicatorName,
-                    start_index: pivot2.index,
-                    end_index: pivot1.index,
-                    start_price: pivot2.price,
-                    end_price: pivot1.price,
-                    start_ind_value: ind2,
-                    end_ind_value: ind1
-                });
-                break;  // ✅ 修复：每个方向只取最近的一个
-            }
-        }
-    }
-    
-    return divergences;
+function scanPivotDivergences(pivots, pivotInd, isLow, currentIdx, maxPivotPoints, maxBars, indicatorName) {
+    let regular = null;
+    let hidden = null;
+    const last = pivots.length - 1;
+    const limit = Math.min(maxPivotPoints, last);
+    
+    for (let i = 0; i < limit; i++) {
+        const k1 = last - i;      // 最近的
+        const k2 = k1 - 1;        // 次近的
+        const pivot1 = pivots[k1];
+        const pivot2 = pivots[k2];
+        
+        if (currentIdx - pivot1.index > maxBars) break;
+        
+        const ind1 = pivotInd[k1];
+        const ind2 = pivotInd[k2];
+        if (isNaN(ind1) || isNaN(ind2)) continue;
+        
+        // 看涨：价格更低、指标更高；看跌：价格更高、指标更低
+        const priceLower = pivot1.price < pivot2.price;
+        const priceHigher = pivot1.price > pivot2.price;
+        const isRegular = isLow ? (priceLower && ind1 > ind2) : (priceHigher && ind1 < ind2);
+        const isHidden = isLow ? (priceHigher && ind1 < ind2) : (priceLower && ind1 > ind2);
+        
+        if (regular === null && isRegular) {
+            regular = {
+                type: isLow ? 'bullish' : 'bearish',
+                indicator: indicatorName,
+                start_index: pivot2.index,
+                end_index: pivot1.index,
+                start_price: pivot2.price,
+                end_price: pivot1.price,
+                start_ind_value: ind2,
+                end_ind_value: ind1
+            };
+        } else if (hidden === null && isHidden) {
+            hidden = {
+                type: isLow ? 'bullish_hidden' : 'bearish_hidden',
+                indicator: indicatorName,
+                start_index: pivot2.index,
+                end_index: pivot1.index,
+                start_price: pivot2.price,
+                end_price: pivot1.price
+            };
+        }
+        
+        if (regular !== null && hidden !== null) break;
+    }
+    
+    return { regular, hidden };
 }
 
 /**
- * 检测隐藏背离（✅ 修复版）
+ * 检测单个指标的正常背离和隐藏背离
+ * 
+ * 输出顺序与原先分开检测一致：看涨、看跌、隐藏看涨、隐藏看跌
  */
-function detectHiddenDivergences(candleData, indicatorValues, pricePivotHighs, pricePivotLows, 
-                                maxPivotPoints, maxBars, indicatorName) {
+function detectDivergences(candleData, indicatorValues, pricePivotHighs, pricePivotLows,
+                           maxPivotPoints, maxBars, indicatorName) {
     const divergences = [];
     const currentIdx = candleData.length - 1;
     
-    // 隐藏看涨背离 - 价格未创新低，但指标创新低
+    let lows = { regular: null, hidden: null };
+    let highs = { regular: null, hidden: null };
+    
     if (pricePivotLows.length >= 2) {
-        for (let i = 0; i < Math.min(maxPivotPoints, pricePivotLows.length - 1); i++) {
-            const pivot1 = pricePivotLows[pricePivotLows.length - 1 - i];
-            const pivot2 = pricePivotLows[pricePivotLows.length - 1 - i - 1];
-            
-            if (currentIdx - pivot1.index > maxBars) break;
-            
-            const ind1 = indicatorValues[pivot1.index];
-            const ind2 = indicatorValues[pivot2.index];
-            
-            if (!isNaN(ind1) && !isNaN(ind2) && pivot1.price > pivot2.price && ind1 < ind2) {
-                divergences.push({
-                    type: 'bullish_hidden',
-                    indicator: indicatorName,
-                    start_index: pivot2.index,
-                    end_index: pivot1.index,
-                    start_price: pivot2.price,
-                    end_price: pivot1.price
-                });
-                break;
-            }
-        }
+        lows = scanPivotDivergences(
+            pricePivotLows, pivotIndicatorValues(indicatorValues, pricePivotLows), true,
+            currentIdx, maxPivotPoints, maxBars, indicatorName
+        );
     }
-    
-    // 隐藏看跌背离 - 价格未创新高，但指标创新高
     if (pricePivotHighs.length >= 2) {
-        for (let i = 0; i < Math.min(maxPivotPoints, pricePivotHighs.length - 1); i++) {
-            const pivot1 = pricePivotHighs[pricePivotHighs.length - 1 - i];
-            const pivot2 = pricePivotHighs[pricePivotHighs.length - 1 - i - 1];
-            
-            if (currentIdx - pivot1.index > maxBars) break;
-            
-            const ind1 = indicatorValues[pivot1.index];
-            const ind2 = indicatorValues[pivot2.index];
-            
-            if (!isNaN(ind1) && !isNaN(ind2) && pivot1.price < pivot2.price && ind1 > ind2) {
-                divergences.push({
-                    type: 'bearish_hidden',
-                    indicator: indicatorName,
-                    start_index: pivot2.index,
-                    end_index: pivot1.index,
-                    start_price: pivot2.price,
-                    end_price: pivot1.price
-                });
-                break;
-            }
-        }
+        highs = scanPivotDivergences(
+            pricePivotHighs, pivotIndicatorValues(indicatorValues, pricePivotHighs), false,
+            currentIdx, maxPivotPoints, maxBars, indicatorName
+        );
     }
     
+    if (lows.regular) divergences.push(lows.regular);
+    if (highs.regular) divergences.push(highs.regular);
+    if (lows.hidden) divergences.push(lows.hidden);
+    if (highs.hidden) divergences.push(highs.hidden);
+    
     return divergences;
 }
 
@@ -1128,19 +1245,27 @@ function groupDivergences(divergences, candleData) {
                           firstDiv.type === 'bearish' ? '看跌' :
                           firstDiv.type === 'bullish_hidden' ? '隐藏看涨' : '隐藏看跌'}背离: ${indicators}`;
         
-        // 创建背离线
-        const lines = divs.map(d => ({
-            start_time: candleData[d.start_index].time,
-            end_time: candleData[d.end_index].time,
-            start_price: d.start_price,
-            end_price: d.end_price
-        }));
+        // 创建背离线（同组背离的end_index相同，结束时间只取一次）
+        const endTime = candleData[firstDiv.end_index].time;
+        const lines = new Array(divs.length);
+        for (let k = 0; k < divs.length; k++) {
+            const d = divs[k];
+            lines[k] = {
+                start_time: candleData[d.start_index].time,
+                end_time: endTime,
+                start_price: d.start_price,
+                end_price: d.end_price
+            };
+        }
         
+        // 隐藏/看涨标志在计算时确定一次，渲染时直接读取布尔值
         result.push({
             type: firstDiv.type,
+            isHidden: firstDiv.type.includes('hidden'),
+            isBullish: firstDiv.type.includes('bullish'),
             color: firstDiv.type,
-            start_time: candleData[firstDiv.start_index].time,
-            end_time: candleData[firstDiv.end_index].time,
+            start_time: lines[0].start_time,
+            end_time: endTime,
             start_price: firstDiv.start_price,
             end_price: firstDiv.end_price,
             label_text: labelText,
@@ -1170,7 +1295,11 @@ function calculateDivergenceDetector(candleData, params = {}) {
         check_rsi = true,
         check_stoch = true,
         check_cci = true,
-        check_momentum = true
+        check_momentum = true,
+        check_obv = true,
+        check_vwmacd = true,
+        check_cmf = true,
+        check_mfi = true
     } = params;
     
     console.log('🔍 [背离检测] 开始计算，K线数量:', candleData.length);
@@ -1207,10 +1336,21 @@ function calculateDivergenceDetector(candleData, params = {}) {
     }
     
     // 额外指标
-    indicators['OBV'] = calculateOBV(candleData);
-    indicators['VWMACD'] = calculateVWMACD(candleData);  // ✅ 添加VWMACD
-    indicators['CMF'] = calculateCMF(candleData, 21);
-    indicators['MFI'] = calculateMFI(candleData, 14);
+    if (check_obv) {
+        indicators['OBV'] = calculateOBV(candleData);
+    }
+    
+    if (check_vwmacd) {
+        indicators['VWMACD'] = calculateVWMACD(candleData);  // ✅ 添加VWMACD
+    }
+    
+    if (check_cmf) {
+        indicators['CMF'] = calculateCMF(candleData, 21);
+    }
+    
+    if (check_mfi) {
+        indicators['MFI'] = calculateMFI(candleData, 14);
+    }
     
     console.log('✅ [背离检测] 指标计算完成，共', Object.keys(indicators).length, '个');
     
@@ -1224,20 +1364,8 @@ function calculateDivergenceDetector(candleData, params = {}) {
     const allDivergences = [];
     
     for (const [indicatorName, indicatorValues] of Object.entries(indicators)) {
-        // 正常背离
-        const regularDivs = detectRegularDivergences(
-            candleData, 
-            indicatorValues, 
-            pricePivotHighs, 
-            pricePivotLows,
-            max_pivot_points, 
-            max_bars, 
-            indicatorName
-        );
-        allDivergences.push(...regularDivs);
-        
-        // ✅ 隐藏背离
-        const hiddenDivs = detectHiddenDivergences(
+        // 正常背离与隐藏背离在同一次pivot遍历中检测
+        const divs = detectDivergences(
             candleData, 
             indicatorValues, 
             pricePivotHighs, 
@@ -1246,7 +1374,7 @@ function calculateDivergenceDetector(candleData, params = {}) {
             max_bars, 
             indicatorName
         );
-        allDivergences.push(...hiddenDivs);
+        allDivergences.push(...divs);
     }
     
     console.log('✅ [背离检测] 原始背离数量:', allDivergences.length);
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""JSON序列化工具（orjson为可选依赖，未安装时退化为标准库json）"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    序列化为UTF-8编码的紧凑JSON字节串
+    
+    Args:
+        obj: 待序列化对象
+        
+    Returns:
+        JSON字节串
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson不支持的类型，交给标准库处理
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dumps_str(obj: Any, indent: bool = False) -> str:
+    """
+    序列化为JSON字符串（保留非ASCII字符）
+    
+    Args:
+        obj: 待序列化对象
+        indent: 是否以2空格缩进格式化输出
+        
+    Returns:
+        JSON字符串
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option).decode('utf-8')
+        except TypeError:
+            # orjson不支持的类型，交给标准库处理
+            pass
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""Numba工具（可选依赖，未安装时退化为普通Python函数）"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba未安装时的替代装饰器，原样返回函数"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func